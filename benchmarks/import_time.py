@@ -0,0 +1,58 @@
+"""Check the CLI import time stays within budget.
+
+Runs ``python -X importtime`` on the CLI module and on click alone several
+times and reports the best cumulative import time of each. Exits with an
+error if the CLI takes longer than click by more than the budget::
+
+    python benchmarks/import_time.py [BUDGET_MS]
+"""
+
+import subprocess  # noqa: S404
+import sys
+from typing import Dict
+
+
+MODULE = "rfc_lookup.command"
+# Milliseconds the package may add on top of importing click
+DEFAULT_BUDGET_MS = 15.0
+RUNS = 7
+
+
+def import_times(module: str) -> Dict[str, float]:
+    """Get the cumulative import time of every module imported, in ms."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def best_import_time(module: str) -> float:
+    """Get the best cumulative import time of a module over several runs."""
+    return min(import_times(module)[module] for _ in range(RUNS))
+
+
+def main(budget_ms: float) -> None:
+    """Measure the CLI import time and enforce the budget."""
+    total = best_import_time(MODULE)
+    own = total - best_import_time("click")
+
+    print(f"import {MODULE}: {total:.1f} ms, {own:.1f} ms more than click")
+    if own > budget_ms:
+        raise SystemExit(
+            f"Import time over click {own:.1f} ms exceeds the budget of "
+            f"{budget_ms:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS)
@@ -0,0 +1,78 @@
+"""Compare loading the RFC index from text, JSON state and a snapshot.
+
+Builds a synthetic RFC index and times getting the latest RFC number by
+parsing the text, by reading the JSON list of IDs kept in the index cache
+and by memory-mapping a compiled snapshot. Exits with an error if parsing
+the text takes longer than the budget, scaled to the number of RFCs::
+
+    python benchmarks/index_snapshot.py [RFCS]
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from rfc_lookup.index import parse_rfc_index
+from rfc_lookup.snapshot import IndexSnapshot, build_snapshot
+
+
+# Milliseconds parsing an index of about today's size may take. Every
+# synthetic entry carries all the fields, so it parses slower than the real
+# index, and the budget still catches a return to parsing entry by entry,
+# which took 165-190 ms
+PARSE_BUDGET_MS = 150.0
+PARSE_BUDGET_RFCS = 9600
+
+ENTRY = """\
+{id:04d} Transmission Control Protocol Extension {id}. W. Eddy, Ed., J.
+     Postel. August 2022. (Format: HTML, TXT, PDF, XML) (Obsoletes
+     RFC0793, RFC0879) (Updates RFC1011) (Also STD0007) (Status: INTERNET
+     STANDARD) (Stream: IETF) (DOI: 10.17487/RFC{id:04d})
+
+"""
+
+
+def best_time(func: Callable[[], int], repeat: int = 20) -> float:
+    """Get the best run time of a function, in ms."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(count: int) -> None:
+    """Run the benchmark and print a comparison."""
+    text = "".join(ENTRY.format(id=n) for n in range(1, count + 1))
+    records = parse_rfc_index(text)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state = Path(tmp) / "state.json"
+        state.write_text(json.dumps({"ids": [r.number for r in records]}))
+        snapshot = Path(tmp) / "index.snap"
+        snapshot.write_bytes(build_snapshot(records))
+
+        print(f"{count} RFCs")
+        times = {}
+        for name, func in (
+            ("parse text", lambda: parse_rfc_index(text)[-1].number),
+            ("json state", lambda: json.loads(state.read_text())["ids"][-1]),
+            ("snapshot", lambda: IndexSnapshot.open(snapshot).latest_id),
+        ):
+            times[name] = best_time(func)
+            print(f"  {name:<12} {times[name]:9.3f} ms")
+
+    budget = PARSE_BUDGET_MS * count / PARSE_BUDGET_RFCS
+    if times["parse text"] > budget:
+        raise SystemExit(
+            f"Parsing took {times['parse text']:.1f} ms, over the budget of "
+            f"{budget:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else PARSE_BUDGET_RFCS)
@@ -0,0 +1,122 @@
+"""Compare the streaming search result extractor with BeautifulSoup.
+
+Builds a synthetic RFC editor result page and times parsing it with
+:func:`rfc_lookup.utilities.parse_search_results` and with the BeautifulSoup
+tree it replaced, reporting the best time and peak memory of each::
+
+    python benchmarks/search_results.py [ROWS]
+"""
+
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from bs4 import BeautifulSoup, Tag
+
+from rfc_lookup.utilities import (
+    clean_chars,
+    extract_authors,
+    parse_search_results,
+)
+
+
+ROW = """<tr>
+<td><a href="https://www.rfc-editor.org/info/rfc{id}">RFC&nbsp;{id}</a></td>
+<td><a href="https://www.rfc-editor.org/rfc/rfc{id}.html">HTML</a>,
+<a href="https://www.rfc-editor.org/rfc/rfc{id}.txt">TXT</a>,
+<a href="https://www.rfc-editor.org/rfc/rfc{id}.pdf">PDF</a></td>
+<td class="title">Transmission Control Protocol (TCP) Extension {id}</td>
+<td>W. Eddy, Ed., J. Postel</td>
+<td>August 2022</td>
+<td>Obsoletes RFC 793, RFC 879, RFC 2873<br>Updates RFC 1011</td>
+<td>Internet Standard (STD 7)</td>
+</tr>
+"""
+
+Parser = Callable[[str], List[Dict[str, Any]]]
+
+
+def make_page(rows: int) -> str:
+    """Build a result page with the given number of rows."""
+    body = "".join(ROW.format(id=n) for n in range(1, rows + 1))
+    return (
+        "<html><head><title>RFC Search</title></head><body>"
+        '<table class="gridtable"><tr><th>Number</th><th>Files</th>'
+        "<th>Title</th><th>Authors</th><th>Date</th><th>More Info</th>"
+        f"<th>Status</th></tr>{body}</table></body></html>"
+    )
+
+
+def soup_search_results(html: str) -> List[Dict[str, Any]]:
+    """Parse a result page with the previous BeautifulSoup implementation."""
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table", class_="gridtable")
+    results: List[Dict[str, Any]] = []
+    if not isinstance(table, Tag):
+        return results
+
+    for row in table.find_all("tr")[1:]:
+        cells = row.find_all("td")
+        if len(cells) != 7:
+            continue
+        anchor = cells[0].find("a")
+        if not isinstance(anchor, Tag):
+            continue
+        results.append(
+            {
+                "id": int(clean_chars(anchor.text.strip()).split(" ")[1]),
+                "link": anchor.get("href"),
+                "files": {
+                    clean_chars(a.text.strip()): a.get("href")
+                    for a in cells[1].find_all("a")
+                    if isinstance(a, Tag)
+                },
+                "title": clean_chars(cells[2].text.strip()),
+                "authors": extract_authors(clean_chars(cells[3].text.strip())),
+                "publication_date": clean_chars(cells[4].text.strip()),
+                "more_info": clean_chars(cells[5].text.strip()),
+                "status": clean_chars(cells[6].text.strip()).split(" (")[0],
+            }
+        )
+    return results
+
+
+def measure(parser: Parser, html: str, repeat: int = 5) -> Tuple[float, int]:
+    """Get the best run time and the peak memory of a parser."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser(html)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    parser(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main(rows: int) -> None:
+    """Run the benchmark and print a comparison."""
+    html = make_page(rows)
+    if parse_search_results(html) != soup_search_results(html):
+        raise SystemExit("Parsers disagree on the results")
+
+    print(f"{rows} rows, {len(html) / 1024:.0f} KiB of HTML")
+    timings = {}
+    for name, parser in (
+        ("beautifulsoup", soup_search_results),
+        ("streaming", parse_search_results),
+    ):
+        best, peak = measure(parser, html)
+        timings[name] = best
+        print(
+            f"  {name:<14} {best * 1000:8.1f} ms  {peak / 2**20:7.1f} MiB peak"
+        )
+    speedup = timings["beautifulsoup"] / timings["streaming"]
+    print(f"  speedup        {speedup:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -19,7 +19,7 @@ PYTHON_VERSIONS = [
     "3.12",
 ]
 PYTHON_VERSION_MAIN = PYTHON_VERSIONS[0]
-LOCATIONS = ("src", "tests", "noxfile.py", "docs/conf.py")
+LOCATIONS = ("src", "tests", "benchmarks", "noxfile.py", "docs/conf.py")
 nox.needs_version = ">= 2021.6.6"
 nox.options.sessions = (
     "pre-commit",
@@ -94,7 +94,7 @@ def mypy(session: nox.Session) -> None:
     args: List[str] = session.posargs or list(
         filter(lambda a: a != "noxfile.py", LOCATIONS)
     )
-    _uv_install(session, ".", "mypy", "pytest")
+    _uv_install(session, ".", "beautifulsoup4", "mypy", "pytest")
     session.run("mypy", *args)
 
     if not session.posargs and session.python == PYTHON_VERSION_MAIN:
@@ -109,6 +109,7 @@ def tests(session: nox.Session) -> None:
     _uv_install(
         session,
         ".",
+        "beautifulsoup4",
         "coverage[toml]",
         "pytest",
         "pygments",
@@ -145,10 +146,20 @@ def coverage(session: nox.Session) -> None:
     session.run("coverage", *args)
 
 
+@nox.session(python=PYTHON_VERSION_MAIN)
+def benchmarks(session: nox.Session) -> None:
+    """Run the benchmarks."""
+    _uv_install(session, ".", "beautifulsoup4")
+    for script in sorted(Path("benchmarks").glob("*.py")):
+        session.run("python", str(script), *session.posargs)
+
+
 @nox.session(python=PYTHON_VERSIONS)
 def typeguard(session: nox.Session) -> None:
     """Runtime type checking using Typeguard."""
-    _uv_install(session, ".", "pytest", "typeguard", "pygments")
+    _uv_install(
+        session, ".", "beautifulsoup4", "pytest", "typeguard", "pygments"
+    )
     session.run("pytest", f"--typeguard-packages={PACKAGE}", *session.posargs)
 
 
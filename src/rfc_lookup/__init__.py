@@ -1,9 +1,31 @@
 """Init file for the rfc_lookup package."""
 
-from importlib.metadata import PackageNotFoundError, version
+from typing import Any
 
 
-try:
-    __version__ = version(__name__)
-except PackageNotFoundError:  # pragma: no cover
-    __version__ = "unknown"
+def __getattr__(name: str) -> Any:
+    """Look the package version up only when it is first asked for.
+
+    Importing ``importlib.metadata`` takes longer than the rest of the CLI
+    startup, so it is deferred until ``__version__`` is used.
+
+    Args:
+        name (str): The attribute name.
+
+    Returns:
+        Any: The attribute value.
+
+    Raises:
+        AttributeError: If the attribute does not exist.
+    """
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        value = version(__name__)
+    except PackageNotFoundError:  # pragma: no cover
+        value = "unknown"
+    globals()["__version__"] = value
+    return value
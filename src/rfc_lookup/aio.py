@@ -0,0 +1,351 @@
+"""Module for asyncio versions of the package utility functions.
+
+The HTTP client here is built on :mod:`asyncio` streams, so embedding
+``rfc_lookup`` in an event loop needs no extra dependencies and never blocks
+the loop on network I/O. Connecting and reading use the same timeouts as
+the blocking client, and cache and index files are read and written on the
+loop's default executor. The number of requests in flight on a loop is
+bounded by :func:`set_concurrency_limit`.
+"""
+
+import asyncio
+import contextlib
+import functools
+import ssl
+import urllib.parse
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from rfc_lookup.cache import (
+    DiskCache,
+    IndexCache,
+    get_default_cache,
+    get_default_index_cache,
+)
+from rfc_lookup.constants import (
+    DEFAULT_HEADERS,
+    DEFAULT_MAX_WORKERS,
+    MAX_REDIRECTS,
+    REDIRECT_STATUSES,
+    RFC_INDEX_URL,
+    RFC_SEARCH_URL,
+    RFC_TEXT_URL,
+)
+from rfc_lookup.decoding import accept_encoding, decode_body
+from rfc_lookup.errors import NetworkError
+from rfc_lookup.filters import SearchFilters
+from rfc_lookup.mirror import get_default_mirror
+from rfc_lookup.pool import default_timeouts
+from rfc_lookup.resultcache import get_default_search_cache
+from rfc_lookup.utilities import (
+    HttpResponse,
+    build_url,
+    index_report_id_bitset,
+    index_request_headers,
+    iter_search_results,
+    search_cache_key,
+    search_params,
+    store_index_response,
+)
+
+
+T = TypeVar("T")
+
+_concurrency_limit = DEFAULT_MAX_WORKERS
+_semaphores: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+) = weakref.WeakKeyDictionary()
+
+
+def set_concurrency_limit(limit: int) -> None:
+    """Set the maximum number of concurrent requests per event loop.
+
+    Args:
+        limit (int): The maximum number of requests in flight.
+
+    Raises:
+        ValueError: If the limit is less than one.
+    """
+    global _concurrency_limit
+
+    if limit < 1:
+        raise ValueError("Concurrency limit must be at least 1.")
+    _concurrency_limit = limit
+    _semaphores.clear()
+
+
+async def _run_blocking(func: Callable[..., T], *args: Any) -> T:
+    # asyncio.to_thread is only available from Python 3.9
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args))
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_concurrency_limit)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def _read_chunked(
+    reader: asyncio.StreamReader, timeout: Optional[float]
+) -> bytes:
+    chunks: List[bytes] = []
+    while True:
+        size_line = await asyncio.wait_for(reader.readline(), timeout)
+        size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            # Skip any trailer headers
+            while (await asyncio.wait_for(reader.readline(), timeout)) not in (
+                b"\r\n",
+                b"\n",
+                b"",
+            ):
+                pass
+            return b"".join(chunks)
+        chunks.append(await asyncio.wait_for(reader.readexactly(size), timeout))
+        await asyncio.wait_for(reader.readline(), timeout)
+
+
+async def _read_response(
+    reader: asyncio.StreamReader, timeout: Optional[float]
+) -> Tuple[int, Dict[str, str], bytes]:
+    # Like the blocking client's socket timeout, the timeout applies to each
+    # read rather than to the whole response
+    status_line = (await asyncio.wait_for(reader.readline(), timeout)).decode(
+        "iso-8859-1"
+    )
+    parts = status_line.split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise NetworkError(f"Malformed status line {status_line!r}")
+    status = int(parts[1])
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("iso-8859-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if status in (204, 304) or 100 <= status < 200:
+        body = b""
+    elif headers.get("transfer-encoding", "").lower() == "chunked":
+        body = await _read_chunked(reader, timeout)
+    elif "content-length" in headers:
+        body = await asyncio.wait_for(
+            reader.readexactly(int(headers["content-length"])), timeout
+        )
+    else:
+        body = await asyncio.wait_for(reader.read(), timeout)
+    return status, headers, body
+
+
+async def _fetch(
+    url: str, headers: Dict[str, str]
+) -> Tuple[int, Dict[str, str], bytes]:
+    parsed = urllib.parse.urlsplit(url)
+    is_https = parsed.scheme == "https"
+    host = parsed.hostname or ""
+    port = parsed.port or (443 if is_https else 80)
+    path = parsed.path or "/"
+    if parsed.query:
+        path = f"{path}?{parsed.query}"
+
+    request_headers = {
+        "Host": parsed.netloc,
+        **DEFAULT_HEADERS,
+        "Accept-Encoding": accept_encoding(),
+        **headers,
+        "Connection": "close",
+    }
+    request = f"GET {path} HTTP/1.1\r\n" + "".join(
+        f"{name}: {value}\r\n" for name, value in request_headers.items()
+    )
+
+    connect_timeout, read_timeout = default_timeouts()
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(
+            host, port, ssl=ssl.create_default_context() if is_https else None
+        ),
+        connect_timeout,
+    )
+    try:
+        writer.write(request.encode("iso-8859-1") + b"\r\n")
+        await asyncio.wait_for(writer.drain(), read_timeout)
+        return await _read_response(reader, read_timeout)
+    finally:
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+
+
+async def async_get_response(
+    url: str,
+    params: Optional[Dict[str, str]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> HttpResponse:
+    """Get a web page along with its status and response headers.
+
+    Redirects are followed, and a ``304 Not Modified`` answer to a
+    conditional request is returned rather than raised.
+
+    Args:
+        url (str): The URL to request.
+        params (dict, optional): Query parameters to append to the URL.
+        headers (dict, optional): Extra request headers.
+
+    Returns:
+        HttpResponse: The response status, body and lower-cased headers.
+
+    Raises:
+        NetworkError: If the request fails due to a network or HTTP error.
+    """
+    full_url = build_url(url, params)
+    current_url = full_url
+
+    async with _get_semaphore():
+        for _ in range(MAX_REDIRECTS + 1):
+            try:
+                status, res_headers, body = await _fetch(
+                    current_url, headers or {}
+                )
+            except (
+                OSError,
+                asyncio.IncompleteReadError,
+                asyncio.TimeoutError,
+                ValueError,
+            ) as exc:
+                raise NetworkError(
+                    f"Request to {full_url!r} failed: {exc}"
+                ) from exc
+
+            if status in REDIRECT_STATUSES and "location" in res_headers:
+                current_url = build_url(
+                    urllib.parse.urljoin(current_url, res_headers["location"])
+                )
+                continue
+            if status >= 400:
+                raise NetworkError(
+                    f"Request to {full_url!r} failed: HTTP Error {status}"
+                )
+            body = decode_body(body, res_headers.get("content-encoding"))
+            return HttpResponse(status=status, body=body, headers=res_headers)
+
+    raise NetworkError(f"Request to {full_url!r} failed: too many redirects")
+
+
+async def async_get_request(
+    url: str,
+    params: Optional[Dict[str, str]] = None,
+) -> bytes:
+    """Get the content of a web page.
+
+    Args:
+        url (str): The URL to request.
+        params (dict, optional): Query parameters to append to the URL.
+
+    Returns:
+        bytes: The raw response body.
+    """
+    return (await async_get_response(url, params)).body
+
+
+async def async_search_rfc_editor(
+    value: str, filters: Optional[SearchFilters] = None
+) -> List[Dict[str, Any]]:
+    """Search the RFC editor for RFCs by title.
+
+    Args:
+        value (str): The title or keyword to search for.
+        filters (SearchFilters, optional): The filters to send along.
+
+    Returns:
+        list: A list of dicts, each representing a matching RFC, as returned
+            by :func:`rfc_lookup.utilities.search_rfc_editor`.
+    """
+    filters = filters or SearchFilters()
+    cache = get_default_search_cache()
+    key = search_cache_key(value, filters)
+    results = await _run_blocking(cache.get, key)
+    if results is not None:
+        return results
+
+    params = search_params(value, filters)
+    body = await async_get_request(RFC_SEARCH_URL, params)
+    html = body.decode("utf-8")
+    results = list(filters.truncate(iter_search_results([html])))
+    await _run_blocking(cache.set, key, results)
+    return results
+
+
+async def async_get_latest_report_ids(
+    cache: Optional[IndexCache] = None,
+) -> List[int]:
+    """Get and parse the IETF latest reports.
+
+    Uses the same local index cache and revalidation as
+    :func:`rfc_lookup.utilities.get_latest_report_ids`.
+
+    Args:
+        cache (IndexCache, optional): The index cache to use. Defaults to the
+            cache configured from the environment.
+
+    Returns:
+        list: A sorted list of known RFC IDs as integers.
+    """
+    if cache is None:
+        cache = get_default_index_cache()
+
+    state = await _run_blocking(cache.load)
+    if state is not None and state.ids and cache.is_fresh(state):
+        return state.ids
+
+    res = await async_get_response(
+        RFC_INDEX_URL, headers=index_request_headers(state)
+    )
+    return await _run_blocking(store_index_response, cache, state, res)
+
+
+async def async_get_rfc_report(
+    report_id: int, cache: Optional[DiskCache] = None
+) -> str:
+    """Get the RFC report for a given RFC ID.
+
+    Uses the same mirror and on-disk cache as
+    :func:`rfc_lookup.utilities.get_rfc_report`.
+
+    Args:
+        report_id (int): The RFC number to retrieve.
+        cache (DiskCache, optional): The cache to use. Defaults to the cache
+            configured from the environment.
+
+    Returns:
+        str: The plain-text content of the RFC document.
+    """
+    mirror = get_default_mirror()
+    if mirror is not None:
+        mirrored = await _run_blocking(mirror.read, report_id)
+        if mirrored is not None:
+            return mirrored
+
+    if cache is None:
+        cache = get_default_cache()
+
+    url = RFC_TEXT_URL.format(id=report_id)
+    cached = await _run_blocking(cache.get, url)
+    if cached is not None:
+        return cached.decode("utf-8")
+
+    index_cache = get_default_index_cache()
+    latest_ids = await async_get_latest_report_ids(index_cache)
+    issued = await _run_blocking(
+        index_report_id_bitset, index_cache, latest_ids
+    )
+    issued.check(report_id)
+
+    res = await async_get_request(url)
+    await _run_blocking(cache.set, url, res)
+    return res.decode("utf-8")
@@ -0,0 +1,614 @@
+"""Module for the on-disk cache of RFC content."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Dict, List, Optional, Tuple, Type
+
+from rfc_lookup.constants import (
+    CACHE_DIR_ENV,
+    CACHE_SIZE_ENV,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_INDEX_TTL,
+    INDEX_TTL_ENV,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> Path:
+    """Get the cache directory for the current user.
+
+    The ``RFC_LOOKUP_CACHE_DIR`` environment variable takes precedence,
+    followed by ``$XDG_CACHE_HOME/rfc-lookup`` and ``~/.cache/rfc-lookup``.
+
+    Returns:
+        Path: The cache directory path.
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache_home:
+        return Path(xdg_cache_home).expanduser() / "rfc-lookup"
+    return Path.home() / ".cache" / "rfc-lookup"
+
+
+def default_cache_size() -> int:
+    """Get the cache size limit in bytes.
+
+    Reads ``RFC_LOOKUP_CACHE_SIZE``, falling back to the default limit when
+    the variable is unset or not a valid integer. A limit of ``0`` disables
+    the cache.
+
+    Returns:
+        int: The maximum cache size in bytes.
+    """
+    value = os.environ.get(CACHE_SIZE_ENV)
+    if not value:
+        return DEFAULT_CACHE_SIZE
+
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        logger.debug("Ignoring invalid %s value %r", CACHE_SIZE_ENV, value)
+        return DEFAULT_CACHE_SIZE
+
+
+def default_index_ttl() -> float:
+    """Get the number of seconds a cached RFC index is considered fresh.
+
+    Reads ``RFC_LOOKUP_INDEX_TTL``, falling back to the default when the
+    variable is unset or not a valid number.
+
+    Returns:
+        float: The time to live in seconds.
+    """
+    value = os.environ.get(INDEX_TTL_ENV)
+    if not value:
+        return DEFAULT_INDEX_TTL
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        logger.debug("Ignoring invalid %s value %r", INDEX_TTL_ENV, value)
+        return DEFAULT_INDEX_TTL
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+# The total size of each cache directory, kept up to date by the writes of
+# this process once the directory has been scanned
+_totals: Dict[Path, int] = {}
+_totals_lock = threading.Lock()
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+class DiskCache:
+    """Content store for immutable documents with LRU eviction.
+
+    Entries are stored under the SHA-256 digest of their key, so any string
+    (typically a URL) can be used as a key. Reads refresh an entry's
+    modification time and the least recently used entries are removed once
+    the total size exceeds ``max_size``.
+
+    The directory is scanned for its total size on the first write of the
+    process only. Later writes keep the total up to date, and the directory
+    is scanned again only to evict entries once the total goes over the
+    limit.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_size: Optional[int] = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            path (Path, optional): The cache directory. Defaults to
+                :func:`default_cache_dir`.
+            max_size (int, optional): The size limit in bytes. Defaults to
+                :func:`default_cache_size`.
+        """
+        self.path = Path(path) if path is not None else default_cache_dir()
+        self.max_size = (
+            max_size if max_size is not None else default_cache_size()
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything at all."""
+        return self.max_size > 0
+
+    @property
+    def objects_dir(self) -> Path:
+        """The directory holding cached entries."""
+        return self.path / "objects"
+
+    def _entry_path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.objects_dir / digest[:2] / digest
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a cached entry.
+
+        Args:
+            key (str): The entry key.
+
+        Returns:
+            bytes: The cached content, or None if the key is not cached.
+        """
+        if not self.enabled:
+            return None
+
+        entry = self._entry_path(key)
+        try:
+            data = entry.read_bytes()
+        except OSError:
+            return None
+
+        try:
+            os.utime(entry)
+        except OSError:  # pragma: no cover
+            pass
+        return data
+
+    def contains(self, key: str) -> bool:
+        """Check whether an entry is cached.
+
+        Args:
+            key (str): The entry key.
+
+        Returns:
+            bool: True if the key is cached.
+        """
+        return self.enabled and self._entry_path(key).is_file()
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """Open a cached entry for streaming reads.
+
+        Args:
+            key (str): The entry key.
+
+        Returns:
+            BinaryIO: The open entry, or None if the key is not cached. The
+                caller must close it.
+        """
+        if not self.enabled:
+            return None
+
+        entry = self._entry_path(key)
+        try:
+            f = entry.open("rb")
+        except OSError:
+            return None
+
+        try:
+            os.utime(entry)
+        except OSError:  # pragma: no cover
+            pass
+        return f
+
+    def writer(self, key: str) -> "CacheWriter":
+        """Create a writer that stores an entry as it is streamed.
+
+        Args:
+            key (str): The entry key.
+
+        Returns:
+            CacheWriter: A context manager committing the entry on success.
+        """
+        return CacheWriter(self, key)
+
+    def set(self, key: str, data: bytes) -> None:
+        """Store an entry, evicting old entries if over the size limit.
+
+        Failures to write are logged and otherwise ignored, so a read-only
+        or full cache directory never breaks a lookup.
+
+        Args:
+            key (str): The entry key.
+            data (bytes): The content to store.
+        """
+        if not self.enabled or len(data) > self.max_size:
+            return
+
+        entry = self._entry_path(key)
+        replaced = _file_size(entry)
+        try:
+            _atomic_write(entry, data)
+        except OSError as exc:
+            logger.debug("Unable to write cache entry %s: %s", entry, exc)
+            return
+
+        self._added(len(data) - replaced)
+
+    def _added(self, delta: int) -> None:
+        with _totals_lock:
+            total = _totals.get(self.objects_dir)
+            if total is None:
+                total = sum(size for _, size, _ in self._entries())
+            else:
+                total += delta
+            _totals[self.objects_dir] = total
+            if total <= self.max_size:
+                return
+        self.evict()
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for entry in self.objects_dir.glob("*/*"):
+            if entry.suffix == ".tmp":
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:  # pragma: no cover
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        return entries
+
+    def size(self) -> int:
+        """Get the total size of all cached entries.
+
+        Returns:
+            int: The size in bytes.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        """Remove least recently used entries until under the size limit."""
+        with _totals_lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total > self.max_size:
+                for _, size, entry in sorted(entries, key=lambda e: e[0]):
+                    try:
+                        entry.unlink()
+                    except OSError:  # pragma: no cover
+                        continue
+                    total -= size
+                    if total <= self.max_size:
+                        break
+            _totals[self.objects_dir] = total
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with _totals_lock:
+            for _, _, entry in self._entries():
+                try:
+                    entry.unlink()
+                except OSError:  # pragma: no cover
+                    continue
+            _totals.pop(self.objects_dir, None)
+
+
+class CacheWriter:
+    """Write a cache entry incrementally without holding it in memory.
+
+    Data goes to a temporary file that replaces the entry only when the
+    context exits without an error, so a reader never sees a partial entry.
+    Write failures and oversized entries silently disable the writer.
+    """
+
+    def __init__(self, cache: DiskCache, key: str) -> None:
+        """Initialize the writer.
+
+        Args:
+            cache (DiskCache): The cache to write to.
+            key (str): The entry key.
+        """
+        self.cache = cache
+        self.entry = cache._entry_path(key)
+        self._file: Optional[BinaryIO] = None
+        self._tmp_name: Optional[str] = None
+        self._size = 0
+
+    def __enter__(self) -> "CacheWriter":
+        """Open the temporary file.
+
+        Returns:
+            CacheWriter: This writer.
+        """
+        if not self.cache.enabled:
+            return self
+
+        try:
+            self.entry.parent.mkdir(parents=True, exist_ok=True)
+            fd, self._tmp_name = tempfile.mkstemp(
+                dir=self.entry.parent, suffix=".tmp"
+            )
+            self._file = os.fdopen(fd, "wb")
+        except OSError as exc:
+            logger.debug("Unable to write cache entry %s: %s", self.entry, exc)
+        return self
+
+    def write(self, data: bytes) -> None:
+        """Append data to the entry.
+
+        Args:
+            data (bytes): The data to append.
+        """
+        if self._file is None:
+            return
+
+        self._size += len(data)
+        try:
+            if self._size > self.cache.max_size:
+                raise OSError("entry exceeds the cache size limit")
+            self._file.write(data)
+        except OSError as exc:
+            logger.debug("Unable to write cache entry %s: %s", self.entry, exc)
+            self._discard()
+
+    def _discard(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._tmp_name is not None:
+            try:
+                os.unlink(self._tmp_name)
+            except OSError:  # pragma: no cover
+                pass
+            self._tmp_name = None
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        """Commit the entry, or discard it if the body was not completed."""
+        if exc_type is not None or self._file is None or not self._tmp_name:
+            self._discard()
+            return
+
+        self._file.close()
+        self._file = None
+        replaced = _file_size(self.entry)
+        try:
+            os.replace(self._tmp_name, self.entry)
+        except OSError as err:  # pragma: no cover
+            logger.debug("Unable to write cache entry %s: %s", self.entry, err)
+            self._discard()
+            return
+        self._tmp_name = None
+        self.cache._added(self._size - replaced)
+
+
+@dataclass
+class IndexState:
+    """Metadata about the locally stored copy of the RFC index.
+
+    When a refresh only added RFCs, ``delta`` holds the text of their
+    entries and ``delta_source`` the version of the index text they were
+    added to, so structures built from that version can be brought up to
+    date without re-parsing the whole index.
+    """
+
+    ids: List[int] = field(default_factory=list)
+    not_issued: List[int] = field(default_factory=list)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+    delta: Optional[str] = None
+    delta_source: Optional[str] = None
+
+
+class IndexCache:
+    """Local copy of the RFC index with the headers needed to revalidate it.
+
+    The raw index text is kept alongside a small JSON state file holding the
+    parsed RFC IDs, so a fresh or revalidated copy never needs re-parsing.
+    """
+
+    name = "rfc-index-latest"
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Initialize the index cache.
+
+        Args:
+            path (Path, optional): The cache directory. Defaults to
+                :func:`default_cache_dir`.
+            ttl (float, optional): Seconds before the copy must be
+                revalidated. Defaults to :func:`default_index_ttl`.
+        """
+        self.path = Path(path) if path is not None else default_cache_dir()
+        self.ttl = ttl if ttl is not None else default_index_ttl()
+
+    @property
+    def state_path(self) -> Path:
+        """The path of the JSON state file."""
+        return self.path / "index" / f"{self.name}.json"
+
+    @property
+    def content_path(self) -> Path:
+        """The path of the raw index text."""
+        return self.path / "index" / f"{self.name}.txt"
+
+    @property
+    def search_path(self) -> Path:
+        """The path of the offline search index built from the text."""
+        return self.path / "index" / f"{self.name}.search"
+
+    @property
+    def snapshot_path(self) -> Path:
+        """The path of the compiled snapshot of the index records."""
+        return self.path / "index" / f"{self.name}.snap"
+
+    @property
+    def store_path(self) -> Path:
+        """The path of the SQLite metadata store built from the text."""
+        return self.path / "index" / f"{self.name}.sqlite"
+
+    def load(self) -> Optional[IndexState]:
+        """Load the stored index state.
+
+        Returns:
+            IndexState: The stored state, or None if missing or unreadable.
+        """
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            return IndexState(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def load_content(self) -> Optional[str]:
+        """Load the stored raw index text.
+
+        Returns:
+            str: The index text, or None if missing or unreadable.
+        """
+        try:
+            return self.content_path.read_text(encoding="utf-8")
+        except (OSError, ValueError):
+            return None
+
+    def content_version(self) -> Optional[str]:
+        """Identify the stored index text without reading it.
+
+        Returns:
+            str: A token that changes whenever the text is rewritten, or None
+                if there is no stored text.
+        """
+        try:
+            stat = self.content_path.stat()
+        except OSError:
+            return None
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def load_search(self) -> Optional[bytes]:
+        """Load the stored search index.
+
+        Returns:
+            bytes: The serialized search index, or None if missing.
+        """
+        try:
+            return self.search_path.read_bytes()
+        except OSError:
+            return None
+
+    def save_search(self, data: bytes) -> None:
+        """Store the search index.
+
+        Write failures are logged and otherwise ignored.
+
+        Args:
+            data (bytes): The serialized search index.
+        """
+        try:
+            _atomic_write(self.search_path, data)
+        except OSError as exc:
+            logger.debug("Unable to write search index %s: %s", self.path, exc)
+
+    def save_snapshot(self, data: bytes) -> None:
+        """Store the compiled index snapshot.
+
+        Write failures are logged and otherwise ignored.
+
+        Args:
+            data (bytes): The compiled snapshot.
+        """
+        try:
+            _atomic_write(self.snapshot_path, data)
+        except OSError as exc:
+            logger.debug("Unable to write snapshot %s: %s", self.path, exc)
+
+    def clear(self) -> None:
+        """Remove the stored index state, text and everything built from it."""
+        for path in (
+            self.state_path,
+            self.content_path,
+            self.search_path,
+            self.snapshot_path,
+            self.store_path,
+        ):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def is_fresh(self, state: IndexState) -> bool:
+        """Check whether a state can be used without revalidation.
+
+        Args:
+            state (IndexState): The stored state.
+
+        Returns:
+            bool: True if the state is younger than the TTL.
+        """
+        return time.time() - state.fetched_at < self.ttl
+
+    def save(self, state: IndexState, content: Optional[bytes] = None) -> None:
+        """Store the index state and, optionally, the raw index text.
+
+        Write failures are logged and otherwise ignored.
+
+        Args:
+            state (IndexState): The state to store.
+            content (bytes, optional): The raw index text.
+        """
+        try:
+            if content is not None:
+                _atomic_write(self.content_path, content)
+            _atomic_write(
+                self.state_path, json.dumps(asdict(state)).encode("utf-8")
+            )
+        except OSError as exc:
+            logger.debug("Unable to write index cache %s: %s", self.path, exc)
+
+    def touch(self, state: IndexState) -> None:
+        """Mark a state as freshly validated and store it.
+
+        Args:
+            state (IndexState): The revalidated state.
+        """
+        state.fetched_at = time.time()
+        self.save(state)
+
+
+def get_default_cache() -> DiskCache:
+    """Get a cache configured from the environment.
+
+    Returns:
+        DiskCache: The cache instance.
+    """
+    return DiskCache()
+
+
+def get_default_index_cache() -> IndexCache:
+    """Get an index cache configured from the environment.
+
+    Returns:
+        IndexCache: The index cache instance.
+    """
+    return IndexCache()
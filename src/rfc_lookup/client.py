@@ -0,0 +1,174 @@
+"""Module for talking to a running ``rfc serve`` process.
+
+The CLI uses the server transparently whenever one is running, so that the
+parsed index and recently used RFCs are already in memory. This module is
+kept light because it is imported on every CLI call.
+"""
+
+import http.client
+import json
+import os
+import urllib.parse
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from rfc_lookup.cache import default_cache_dir
+from rfc_lookup.constants import SERVER_FILE, SERVER_TIMEOUT, SERVER_URL_ENV
+from rfc_lookup.errors import (
+    InvalidRfcIdError,
+    NetworkError,
+    ServerUnavailableError,
+)
+from rfc_lookup.filters import SearchFilters
+
+
+def server_file_path() -> Path:
+    """Get the path of the file announcing the running server.
+
+    Returns:
+        Path: The server file path in the cache directory.
+    """
+    return default_cache_dir() / SERVER_FILE
+
+
+def find_server() -> Optional["ServerClient"]:
+    """Find the running local server.
+
+    The ``RFC_LOOKUP_SERVER`` environment variable takes precedence over the
+    file written by ``rfc serve``.
+
+    Returns:
+        ServerClient: A client for the server, or None if none is running.
+    """
+    url = os.environ.get(SERVER_URL_ENV)
+    if not url:
+        try:
+            data = json.loads(server_file_path().read_text(encoding="utf-8"))
+            url = data["url"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    return ServerClient(url)
+
+
+class ServerClient:
+    """Client for the JSON API of a local server."""
+
+    def __init__(self, url: str, timeout: float = SERVER_TIMEOUT) -> None:
+        """Initialize the client.
+
+        Args:
+            url (str): The base URL of the server.
+            timeout (float): Socket timeout in seconds.
+        """
+        parsed = urllib.parse.urlsplit(url)
+        self.url = url
+        self.host = parsed.hostname or ""
+        self.port = parsed.port or 80
+        self.timeout = timeout
+
+    def request(
+        self, path: str, params: Optional[Dict[str, str]] = None
+    ) -> Any:
+        """Send a GET request and decode the JSON response.
+
+        Args:
+            path (str): The request path.
+            params (dict, optional): Query parameters.
+
+        Returns:
+            Any: The decoded response body.
+
+        Raises:
+            ServerUnavailableError: If the server cannot be reached or
+                cannot handle the request.
+            InvalidRfcIdError: If the server rejected the RFC ID.
+            NetworkError: If the server failed to fetch from upstream.
+        """
+        if params:
+            path = f"{path}?{urllib.parse.urlencode(params)}"
+
+        conn = http.client.HTTPConnection(
+            self.host, self.port, timeout=self.timeout
+        )
+        try:
+            conn.request("GET", path)
+            res = conn.getresponse()
+            status, body = res.status, res.read()
+        except (OSError, http.client.HTTPException) as exc:
+            raise ServerUnavailableError(
+                f"Server at {self.url} is unavailable: {exc}"
+            ) from exc
+        finally:
+            conn.close()
+
+        try:
+            data = json.loads(body)
+        except ValueError as exc:
+            raise ServerUnavailableError(
+                f"Invalid response from server at {self.url}"
+            ) from exc
+
+        if status < 400:
+            return data
+
+        # Only errors about the request itself are raised as is; anything
+        # else makes the caller fall back to working without the server.
+        message = data.get("error", f"Server responded with HTTP {status}")
+        if data.get("type") == "invalid_rfc_id":
+            raise InvalidRfcIdError(message)
+        if data.get("type") == "network_error":
+            raise NetworkError(message)
+        raise ServerUnavailableError(message)
+
+    def get_rfc_report(self, report_id: int) -> str:
+        """Get an RFC document through the server.
+
+        Args:
+            report_id (int): The RFC number to retrieve.
+
+        Returns:
+            str: The plain-text RFC document.
+        """
+        return str(self.request(f"/rfc/{report_id}")["text"])
+
+    def get_latest_report_ids(self) -> List[int]:
+        """Get the RFC IDs of the latest RFC index through the server.
+
+        Returns:
+            list: The RFC IDs, in ascending order.
+        """
+        return [int(i) for i in self.request("/index")["ids"]]
+
+    def validate_report_id(self, report_id: int) -> bool:
+        """Check that an RFC exists through the server.
+
+        Args:
+            report_id (int): The RFC number to check.
+
+        Returns:
+            bool: True, as RFCs that do not exist raise an error.
+        """
+        return bool(self.request(f"/valid/{report_id}")["valid"])
+
+    def search(
+        self,
+        value: str,
+        online: bool = False,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search for RFCs through the server.
+
+        Args:
+            value (str): The words to search for.
+            online (bool): Query the RFC Editor instead of the local index.
+            filters (SearchFilters, optional): The filters of the search.
+
+        Returns:
+            list: The search results.
+        """
+        params = {"q": value}
+        if online:
+            params["online"] = "1"
+        if filters is not None:
+            params.update(filters.query())
+        return list(self.request("/search", params)["results"])
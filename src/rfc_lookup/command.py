@@ -1,19 +1,53 @@
-"""Command-line interface."""
+"""Command-line interface.
 
-import webbrowser
-from typing import Optional
+The CLI is often run many times from scripts, so anything beyond click is
+imported inside the command that needs it, keeping ``rfc --version`` and
+``rfc get --url`` free of the networking, parsing and browser modules.
+"""
+
+import contextlib
+import os
+import sys
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
 import click
+from click.core import ParameterSource
 
-from rfc_lookup import __version__
-from rfc_lookup.errors import InvalidRfcIdError, NetworkError
-from rfc_lookup.utilities import (
-    get_latest_report_ids,
-    get_rfc_report,
-    search_rfc_editor,
+from rfc_lookup.constants import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_SERVER_HOST,
+    MIRROR_DIR_ENV,
+    RFC_FILE_URL,
+    RFC_FORMATS,
+    SEARCH_STATUSES,
+)
+from rfc_lookup.errors import (
+    InvalidRfcIdError,
+    NetworkError,
+    ServerUnavailableError,
+    StoreError,
 )
 
 
+if TYPE_CHECKING:  # pragma: no cover
+    import datetime
+
+    from rfc_lookup.client import ServerClient
+    from rfc_lookup.filters import SearchFilters
+
+T = TypeVar("T")
+
+
 @click.group(  # pragma: no cover
     name="rfc",
     invoke_without_command=True,
@@ -24,12 +58,195 @@ from rfc_lookup.utilities import (
 def cli(ctx: click.Context, version: bool) -> None:
     """Command line interface for the RFC lookup tool."""
     if version is True:
+        from rfc_lookup import __version__
+
         click.echo(f"{ctx.info_name}, version {__version__}")
         ctx.exit()
 
 
+def parse_id_ranges(
+    ctx: click.Context, param: click.Parameter, values: Tuple[str, ...]
+) -> List[int]:
+    """Parse RFC numbers and inclusive ranges such as ``8000-8010``.
+
+    Args:
+        ctx (click.Context): The current context.
+        param (click.Parameter): The parameter being parsed.
+        values (tuple): The raw command-line values.
+
+    Returns:
+        list: The unique RFC numbers, in the order given.
+
+    Raises:
+        BadParameter: If a value is not a number or a valid range.
+    """
+    report_ids: Dict[int, None] = {}
+    for value in values:
+        start, sep, end = value.partition("-")
+        try:
+            first = int(start)
+            last = int(end) if sep else first
+        except ValueError:
+            raise click.BadParameter(
+                f"{value!r} is not a valid integer.", ctx, param
+            ) from None
+
+        if last < first:
+            raise click.BadParameter(
+                f"{value!r} is not a valid range.", ctx, param
+            )
+        for report_id in range(first, last + 1):
+            report_ids.setdefault(report_id, None)
+
+    return list(report_ids)
+
+
+def _parse_search_date(
+    ctx: click.Context, param: click.Parameter, value: str, end: bool
+) -> "datetime.date":
+    from rfc_lookup.filters import parse_search_date
+
+    try:
+        return parse_search_date(value, end)
+    except ValueError as err:
+        raise click.BadParameter(str(err), ctx, param) from None
+
+
+def parse_since(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional["datetime.date"]:
+    """Parse a ``YYYY`` or ``YYYY-MM`` date that starts a range.
+
+    Args:
+        ctx (click.Context): The current context.
+        param (click.Parameter): The parameter being parsed.
+        value (str, optional): The raw command-line value.
+
+    Returns:
+        date: The first day of the month or year, if a value was given.
+    """
+    if value is None:
+        return None
+    return _parse_search_date(ctx, param, value, end=False)
+
+
+def parse_until(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional["datetime.date"]:
+    """Parse a ``YYYY`` or ``YYYY-MM`` date that ends a range.
+
+    Args:
+        ctx (click.Context): The current context.
+        param (click.Parameter): The parameter being parsed.
+        value (str, optional): The raw command-line value.
+
+    Returns:
+        date: The first day of the month, or of the last month of the year,
+            if a value was given.
+    """
+    if value is None:
+        return None
+    return _parse_search_date(ctx, param, value, end=True)
+
+
+def _try_server(call: Callable[["ServerClient"], T]) -> Optional[T]:
+    """Run a lookup on the local server, if one is running.
+
+    Args:
+        call (Callable): The lookup to run with the server client.
+
+    Returns:
+        Any: The result of the lookup, or None if no server could handle it.
+    """
+    from rfc_lookup.client import find_server
+
+    server = find_server()
+    if server is None:
+        return None
+    try:
+        return call(server)
+    except ServerUnavailableError:
+        return None
+
+
+def _validate_report_id(report_id: int) -> None:
+    if _try_server(lambda server: server.validate_report_id(report_id)):
+        return
+
+    from rfc_lookup.utilities import validate_report_id
+
+    validate_report_id(report_id)
+
+
+def _get_rfc_report(report_id: int) -> str:
+    text = _try_server(lambda server: server.get_rfc_report(report_id))
+    if text is None:
+        from rfc_lookup.utilities import get_rfc_report
+
+        text = get_rfc_report(report_id)
+    return text
+
+
+def _echo_report(report_id: int, fmt: str) -> None:
+    if fmt == "txt":
+        click.echo(_get_rfc_report(report_id))
+        return
+
+    from rfc_lookup.utilities import download_rfc_report
+
+    stdout = sys.stdout.buffer
+    download_rfc_report(report_id, stdout, fmt=fmt)
+    stdout.flush()
+
+
+def _download_report(report_id: int, output: str, fmt: str) -> None:
+    from rfc_lookup.utilities import download_rfc_report
+
+    # Write next to the output and move it into place once complete, so a
+    # failed download never truncates or removes an existing file
+    partial = f"{output}.part"
+    try:
+        with open(partial, "wb") as f:
+            download_rfc_report(report_id, f, fmt=fmt)
+        os.replace(partial, output)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(partial)
+        raise
+    click.echo(f"RFC {report_id} saved to {output}")
+
+
+def _save_reports(
+    report_ids: List[int], output_dir: str, jobs: int, fmt: str
+) -> None:
+    from rfc_lookup.utilities import save_rfc_reports
+
+    os.makedirs(output_dir, exist_ok=True)
+    failures: List[int] = []
+    try:
+        results = save_rfc_reports(
+            report_ids, output_dir, max_workers=jobs, fmt=fmt
+        )
+        for report_id, result in results:
+            if isinstance(result, Exception):
+                failures.append(report_id)
+                click.echo(f"RFC {report_id} failed: {result}", err=True)
+                continue
+            click.echo(f"RFC {report_id} saved to {result}")
+    except NetworkError as err:
+        click.echo(f"Network error: {err}", err=True)
+        raise SystemExit(1) from None
+
+    saved = len(report_ids) - len(failures)
+    click.echo(f"Saved {saved} of {len(report_ids)} RFCs to {output_dir}.")
+    if failures:
+        failed = ", ".join(str(report_id) for report_id in sorted(failures))
+        click.echo(f"Failed: {failed}", err=True)
+        raise SystemExit(1)
+
+
 @click.command(name="get")  # pragma: no cover
-@click.argument("id", type=int)
+@click.argument("id", nargs=-1, required=True, callback=parse_id_ranges)
 @click.option("--url", is_flag=True, help="Show the URL for the RFC.")
 @click.option(
     "-o",
@@ -38,10 +255,65 @@ def cli(ctx: click.Context, version: bool) -> None:
     default=None,
     help="Write RFC content to a file instead of stdout.",
 )
-def rfc_get(id: int, url: bool, output: Optional[str]) -> None:
-    """Show details for given RFC numbers."""
+@click.option(
+    "-d",
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Write each RFC to rfc<ID>.<FORMAT> in this directory.",
+)
+@click.option(
+    "-f",
+    "--format",
+    "fmt",
+    type=click.Choice(RFC_FORMATS, case_sensitive=False),
+    default=None,
+    help="Fetch the RFC in this format instead of plain text.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_WORKERS,
+    show_default=True,
+    help="Number of concurrent downloads when fetching several RFCs.",
+)
+def rfc_get(
+    id: List[int],
+    url: bool,
+    output: Optional[str],
+    output_dir: Optional[str],
+    jobs: int,
+    fmt: Optional[str],
+) -> None:
+    """Show details for given RFC numbers.
+
+    IDs may be single numbers or inclusive ranges such as 8000-8010.
+    """
+    report_ids = id
+    if output and output_dir:
+        raise click.UsageError("--output and --output-dir cannot be combined.")
+
+    if url:
+        for report_id in report_ids:
+            ext = (fmt or "html").lower()
+            click.echo(RFC_FILE_URL.format(id=report_id, ext=ext))
+        return
+
+    fmt = (fmt or "txt").lower()
+    if output_dir:
+        _save_reports(report_ids, output_dir, jobs, fmt)
+        return
+
+    if len(report_ids) > 1:
+        raise click.UsageError("Use --output-dir to fetch several RFCs.")
+
+    report_id = report_ids[0]
     try:
-        report = get_rfc_report(id)
+        if output:
+            _download_report(report_id, output, fmt)
+        else:
+            _echo_report(report_id, fmt)
     except InvalidRfcIdError as err:
         click.echo(err, err=True)
         raise SystemExit(1) from None
@@ -49,14 +321,52 @@ def rfc_get(id: int, url: bool, output: Optional[str]) -> None:
         click.echo(f"Network error: {err}", err=True)
         raise SystemExit(1) from None
 
-    if url:
-        click.echo(f"https://www.rfc-editor.org/rfc/rfc{id}.html")
-    elif output:
-        with open(output, "w", encoding="utf-8") as f:
-            f.write(report)
-        click.echo(f"RFC {id} saved to {output}")
-    else:
-        click.echo(report)
+
+def _format_result(result: Dict[str, Any], verbose: bool) -> str:
+    line = f"{result['id']}: {result['title']}"
+    if verbose:
+        authors = ", ".join(result["authors"])
+        line += (
+            f"\n  Authors: {authors}"
+            f"\n  Status: {result['status']}"
+            f"\n  Published: {result['publication_date']}"
+        )
+    return line
+
+
+def _echo_results(results: Iterable[Dict[str, Any]], verbose: bool) -> int:
+    count = 0
+    for result in results:
+        click.echo(_format_result(result, verbose))
+        count += 1
+    return count
+
+
+def _search(
+    value: str,
+    online: bool,
+    local: bool,
+    stream: bool,
+    filters: "SearchFilters",
+) -> Iterable[Dict[str, Any]]:
+    if local:
+        # The store is read straight from disk, so it needs no server
+        from rfc_lookup.store import search_store
+
+        return search_store(value, filters=filters)
+
+    found = _try_server(lambda server: server.search(value, online, filters))
+    if found is not None:
+        return found
+
+    from rfc_lookup.search import search_local
+    from rfc_lookup.utilities import iter_search_rfc_editor, search_rfc_editor
+
+    if not online:
+        return search_local(value, filters=filters)
+    if stream:
+        return iter_search_rfc_editor(value, filters=filters)
+    return search_rfc_editor(value, filters)
 
 
 @click.command(name="search")  # pragma: no cover
@@ -67,25 +377,91 @@ def rfc_get(id: int, url: bool, output: Optional[str]) -> None:
     is_flag=True,
     help="Show authors, status, and publication date.",
 )
-def rfc_search(value: str, verbose: bool) -> None:
-    """Search for RFCs by title."""
+@click.option(
+    "--online/--offline",
+    default=True,
+    help="Query the RFC Editor website, the default, or a local index of"
+    " the RFC index that also works offline.",
+)
+@click.option(
+    "--local",
+    is_flag=True,
+    help="Query the SQLite metadata store, an offline index on disk.",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Print each result as soon as it is found, with the count last.",
+)
+@click.option(
+    "--status",
+    type=click.Choice(list(SEARCH_STATUSES), case_sensitive=False),
+    help="Only show RFCs with this publication status.",
+)
+@click.option(
+    "--since",
+    metavar="YYYY[-MM]",
+    callback=parse_since,
+    help="Only show RFCs published in or after this year or month.",
+)
+@click.option(
+    "--until",
+    metavar="YYYY[-MM]",
+    callback=parse_until,
+    help="Only show RFCs published in or before this year or month.",
+)
+@click.option("--author", help="Only show RFCs with a matching author.")
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    help="Show at most this many results.",
+)
+def rfc_search(
+    value: str,
+    verbose: bool,
+    online: bool,
+    local: bool,
+    stream: bool,
+    status: Optional[str],
+    since: Optional["datetime.date"],
+    until: Optional["datetime.date"],
+    author: Optional[str],
+    limit: Optional[int],
+) -> None:
+    """Search for RFCs by title and keywords.
+
+    Queries the RFC Editor website, which applies the filters so only
+    matching results are downloaded. With --offline, searches a local index
+    of the RFC index instead, which is downloaded once and refreshed when
+    stale, so searches also work without a connection.
+    """
+    source = click.get_current_context().get_parameter_source("online")
+    if local and online and source == ParameterSource.COMMANDLINE:
+        raise click.UsageError("--local and --online cannot be combined.")
+    if since is not None and until is not None and since > until:
+        raise click.UsageError("--since cannot be later than --until.")
+
+    from rfc_lookup.filters import SearchFilters
+
+    filters = SearchFilters(
+        status=status, since=since, until=until, author=author, limit=limit
+    )
     try:
-        results = search_rfc_editor(value)
+        found = _search(value, online, local, stream, filters)
+        if stream:
+            count = _echo_results(found, verbose)
+            click.echo(f"Search {value!r} with {count} results.")
+            return
+
+        results = list(found)
+        click.echo(f"Search {value!r} with {len(results)} results.")
+        _echo_results(results, verbose)
     except NetworkError as err:
         click.echo(f"Network error: {err}", err=True)
         raise SystemExit(1) from None
-
-    click.echo(f"Search {value!r} with {len(results)} results.")
-    for result in results:
-        line = f"{result['id']}: {result['title']}"
-        if verbose:
-            authors = ", ".join(result["authors"])
-            line += (
-                f"\n  Authors: {authors}"
-                f"\n  Status: {result['status']}"
-                f"\n  Published: {result['publication_date']}"
-            )
-        click.echo(line)
+    except StoreError as err:
+        click.echo(f"Store error: {err}", err=True)
+        raise SystemExit(1) from None
 
 
 @click.command(name="open")  # pragma: no cover
@@ -99,35 +475,235 @@ def rfc_search(value: str, verbose: bool) -> None:
 def rfc_open(id: int, text: bool) -> None:
     """Open an RFC in the browser or view it as plain text in the terminal."""
     try:
-        latest_ids = get_latest_report_ids()
+        if text:
+            content = _get_rfc_report(id)
+        else:
+            _validate_report_id(id)
+    except InvalidRfcIdError as err:
+        click.echo(err, err=True)
+        raise SystemExit(1) from None
     except NetworkError as err:
         click.echo(f"Network error: {err}", err=True)
         raise SystemExit(1) from None
 
-    latest_id = latest_ids[-1]
-    if 0 >= id or id > latest_id:
-        click.echo(
-            f"Invalid RFC ID {id}, must be between 0 and {latest_id}",
-            err=True,
-        )
-        raise SystemExit(1)
-
     if text:
-        try:
-            content = get_rfc_report(id)
-        except NetworkError as err:
-            click.echo(f"Network error: {err}", err=True)
-            raise SystemExit(1) from None
         click.echo_via_pager(content)
     else:
+        import webbrowser
+
         url = f"https://www.rfc-editor.org/rfc/rfc{id}.html"
         webbrowser.open(url)
 
 
+@click.command(name="serve")  # pragma: no cover
+@click.option(
+    "--host",
+    default=DEFAULT_SERVER_HOST,
+    show_default=True,
+    help="Address to listen on.",
+)
+@click.option(
+    "-p",
+    "--port",
+    type=click.IntRange(0, 65535),
+    default=0,
+    help="Port to listen on. Defaults to a free port.",
+)
+def rfc_serve(host: str, port: int) -> None:
+    """Run a local server that keeps RFC data warm in memory.
+
+    While it is running, the get, search and open commands send their
+    lookups to it instead of loading the index and RFCs from scratch.
+    """
+    from rfc_lookup.server import RfcServer
+
+    try:
+        server = RfcServer((host, port))
+    except OSError as err:
+        click.echo(f"Unable to listen on {host}:{port}: {err}", err=True)
+        raise SystemExit(1) from None
+
+    click.echo(f"Serving on {server.url}")
+    server.run()
+
+
+RELATION_HEADINGS = {
+    "obsoletes": "obsoletes",
+    "obsoleted_by": "is obsoleted by",
+    "updates": "updates",
+    "updated_by": "is updated by",
+}
+
+
+def _echo_graph(report_id: int, relation: str, depth: Optional[int]) -> None:
+    from rfc_lookup.graph import get_rfc_graph
+
+    graph = get_rfc_graph()
+    if report_id not in graph.titles:
+        click.echo(f"RFC {report_id} is not in the RFC index", err=True)
+        raise SystemExit(1)
+
+    found = graph.walk(report_id, relation, depth)
+    heading = RELATION_HEADINGS[relation]
+    click.echo(f"RFC {report_id} {heading} {len(found)} RFCs.")
+    for number, steps in sorted(found, key=lambda item: (item[1], item[0])):
+        title = graph.titles.get(number, "(not in the index)")
+        click.echo(f"{number}: {title}" + (f" [{steps}]" if steps > 1 else ""))
+    if relation == "obsoleted_by" and found:
+        current = ", ".join(map(str, graph.current(report_id)))
+        click.echo(f"Current: {current}")
+
+
+@click.command(name="graph")  # pragma: no cover
+@click.argument("id", type=int)
+@click.option(
+    "--obsoleted-by",
+    "relation",
+    flag_value="obsoleted_by",
+    default=True,
+    help="Show the RFCs that obsolete the RFC. This is the default.",
+)
+@click.option(
+    "--obsoletes",
+    "relation",
+    flag_value="obsoletes",
+    help="Show the RFCs the RFC obsoletes.",
+)
+@click.option(
+    "--updated-by",
+    "relation",
+    flag_value="updated_by",
+    help="Show the RFCs that update the RFC.",
+)
+@click.option(
+    "--updates",
+    "relation",
+    flag_value="updates",
+    help="Show the RFCs the RFC updates.",
+)
+@click.option(
+    "--depth",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Follow at most this many steps. Defaults to following all.",
+)
+def rfc_graph(id: int, relation: str, depth: Optional[int]) -> None:
+    """Follow the obsoletes and updates relations of an RFC.
+
+    Relations are followed transitively, so --obsoleted-by also lists the
+    RFCs that obsolete the RFCs that obsolete ID, and ends with the RFCs
+    that are current. RFCs more than one step away are marked with their
+    distance.
+    """
+    try:
+        _echo_graph(id, relation, depth)
+    except NetworkError as err:
+        click.echo(f"Network error: {err}", err=True)
+        raise SystemExit(1) from None
+
+
+@click.group(name="index")  # pragma: no cover
+def rfc_index() -> None:
+    """Manage the local copy of the RFC index."""
+
+
+@rfc_index.command(name="build")  # pragma: no cover
+def rfc_index_build() -> None:
+    """Compile the RFC index into a memory-mapped snapshot.
+
+    Once built, RFC numbers are checked against the snapshot instead of
+    loading the index, and the snapshot is recompiled whenever the index
+    changes.
+    """
+    from rfc_lookup.cache import get_default_index_cache
+    from rfc_lookup.snapshot import build_index_snapshot
+
+    cache = get_default_index_cache()
+    try:
+        snapshot = build_index_snapshot(cache)
+    except NetworkError as err:
+        click.echo(f"Network error: {err}", err=True)
+        raise SystemExit(1) from None
+
+    click.echo(f"Compiled {len(snapshot)} RFCs into {cache.snapshot_path}")
+
+
+@click.group(name="mirror")  # pragma: no cover
+def rfc_mirror() -> None:
+    """Manage a local mirror of every RFC."""
+
+
+def _sync_mirror(directory: str, revalidate: bool, jobs: int) -> None:
+    from pathlib import Path
+
+    from rfc_lookup.index import get_rfc_index
+    from rfc_lookup.mirror import Mirror
+
+    fetched = unchanged = 0
+    failures: List[int] = []
+    try:
+        records = get_rfc_index()
+        results = Mirror(Path(directory)).sync(records, revalidate, jobs)
+        for report_id, result in results:
+            if isinstance(result, Exception):
+                failures.append(report_id)
+                click.echo(f"RFC {report_id} failed: {result}", err=True)
+            elif result:
+                fetched += 1
+            else:
+                unchanged += 1
+    except NetworkError as err:
+        click.echo(f"Network error: {err}", err=True)
+        raise SystemExit(1) from None
+
+    issued = sum(1 for record in records if record.issued)
+    click.echo(
+        f"Fetched {fetched} RFCs, {unchanged} unchanged. "
+        f"{issued - len(failures)} of {issued} RFCs mirrored in {directory}."
+    )
+    if failures:
+        failed = ", ".join(str(report_id) for report_id in sorted(failures))
+        click.echo(f"Failed: {failed}", err=True)
+        raise SystemExit(1)
+
+
+@rfc_mirror.command(name="sync")  # pragma: no cover
+@click.argument(
+    "directory", type=click.Path(file_okay=False), envvar=MIRROR_DIR_ENV
+)
+@click.option(
+    "--all",
+    "revalidate",
+    is_flag=True,
+    help="Revalidate every mirrored RFC, not only those whose index entry "
+    "changed.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_WORKERS,
+    show_default=True,
+    help="Number of concurrent downloads.",
+)
+def rfc_mirror_sync(directory: str, revalidate: bool, jobs: int) -> None:
+    """Download every RFC missing from or changed in a local mirror.
+
+    DIRECTORY defaults to $RFC_LOOKUP_MIRROR. An interrupted sync picks up
+    where it stopped. Once RFC_LOOKUP_MIRROR points at the mirror, RFCs are
+    read from it first.
+    """
+    _sync_mirror(directory, revalidate, jobs)
+
+
 # Add subcommands to the main command
 cli.add_command(rfc_get)
 cli.add_command(rfc_search)
 cli.add_command(rfc_open)
+cli.add_command(rfc_graph)
+cli.add_command(rfc_index)
+cli.add_command(rfc_mirror)
+cli.add_command(rfc_serve)
 
 
 def main() -> None:
@@ -8,3 +8,66 @@ DEFAULT_HEADERS = {
     "User-Agent": USER_AGENT,
 }
 ALLOWED_SCHEMES = {"http", "https"}
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_CHUNK_SIZE = 64 * 1024
+SEARCH_CHUNK_SIZE = 8 * 1024
+DEFAULT_POOL_SIZE = DEFAULT_MAX_WORKERS
+DEFAULT_POOL_IDLE_TIMEOUT = 60.0
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Publication statuses accepted by the RFC Editor search, mapped to the
+# values of its "pubstatus[]" and "std_trk" fields
+SEARCH_STATUSES = {
+    "standards track": ("Standards Track", "Any"),
+    "proposed standard": ("Standards Track", "Proposed Standard"),
+    "draft standard": ("Standards Track", "Draft Standard"),
+    "internet standard": ("Standards Track", "Internet Standard"),
+    "best current practice": ("Best Current Practice", "Any"),
+    "informational": ("Informational", "Any"),
+    "experimental": ("Experimental", "Any"),
+    "historic": ("Historic", "Any"),
+    "unknown": ("Unknown", "Any"),
+}
+SEARCH_SORT_KEYS = {"number": "Number", "title": "Title", "date": "Date"}
+SEARCH_PAGE_SIZES = (25, 50, 100)
+FIRST_RFC_YEAR = 1969
+
+RFC_INDEX_URL = "https://www.ietf.org/rfc/rfc-index-latest.txt"
+RFC_SEARCH_URL = "https://www.rfc-editor.org/search/rfc_search_detail.php"
+RFC_TEXT_URL = "https://www.rfc-editor.org/rfc/rfc{id}.txt"
+RFC_FILE_URL = "https://www.rfc-editor.org/rfc/rfc{id}.{ext}"
+RFC_FORMATS = ("txt", "html", "xml", "pdf", "json")
+RFC_INFO_URL = "https://www.rfc-editor.org/info/rfc{id}"
+
+CACHE_DIR_ENV = "RFC_LOOKUP_CACHE_DIR"
+CACHE_SIZE_ENV = "RFC_LOOKUP_CACHE_SIZE"
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+INDEX_TTL_ENV = "RFC_LOOKUP_INDEX_TTL"
+DEFAULT_INDEX_TTL = 60 * 60
+
+CONNECT_TIMEOUT_ENV = "RFC_LOOKUP_CONNECT_TIMEOUT"
+DEFAULT_CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT_ENV = "RFC_LOOKUP_READ_TIMEOUT"
+DEFAULT_READ_TIMEOUT = 30.0
+RETRIES_ENV = "RFC_LOOKUP_RETRIES"
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+RATE_LIMIT_ENV = "RFC_LOOKUP_RATE_LIMIT"
+
+SEARCH_CACHE_TTL_ENV = "RFC_LOOKUP_SEARCH_CACHE_TTL"
+DEFAULT_SEARCH_CACHE_TTL = 5 * 60
+DEFAULT_SEARCH_CACHE_ENTRIES = 256
+SEARCH_CACHE_DB_ENV = "RFC_LOOKUP_SEARCH_CACHE_DB"
+
+MIRROR_DIR_ENV = "RFC_LOOKUP_MIRROR"
+MIRROR_MANIFEST = "mirror.json"
+MIRROR_SAVE_INTERVAL = 100
+
+SERVER_URL_ENV = "RFC_LOOKUP_SERVER"
+SERVER_FILE = "server.json"
+DEFAULT_SERVER_HOST = "127.0.0.1"
+DEFAULT_SERVER_MEMORY_SIZE = 64 * 1024 * 1024
+SERVER_TIMEOUT = 30.0
@@ -0,0 +1,138 @@
+"""Module for decoding compressed HTTP response bodies.
+
+gzip and deflate are always supported. Brotli is used when the optional
+``brotli`` package is installed (``pip install rfc-lookup[brotli]``).
+"""
+
+import zlib
+from typing import Any, Optional, Tuple, Type
+
+from rfc_lookup.errors import NetworkError
+
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+DECODE_ERRORS: Tuple[Type[Exception], ...] = (zlib.error,)
+if brotli is not None:  # pragma: no cover
+    DECODE_ERRORS += (brotli.error,)
+
+
+class Decoder:
+    """Incremental decoder for a single content coding."""
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decode the next piece of the body.
+
+        Args:
+            data (bytes): Encoded data.
+
+        Returns:
+            bytes: The decoded data available so far.
+        """
+        return data
+
+    def flush(self) -> bytes:
+        """Decode anything left once the body has ended.
+
+        Returns:
+            bytes: The remaining decoded data.
+        """
+        return b""
+
+
+class _ZlibDecoder(Decoder):
+    def __init__(self, wbits: int) -> None:
+        self._obj: Any = zlib.decompressobj(wbits)
+
+    def decompress(self, data: bytes) -> bytes:
+        return bytes(self._obj.decompress(data))
+
+    def flush(self) -> bytes:
+        return bytes(self._obj.flush())
+
+
+class _DeflateDecoder(_ZlibDecoder):
+    """Decoder accepting both zlib-wrapped and raw deflate streams.
+
+    RFC 9110 defines "deflate" as the zlib format, but some servers send a
+    raw deflate stream, so fall back to that if the header is invalid.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(zlib.MAX_WBITS)
+        self._first = True
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._first and data:
+            self._first = False
+            try:
+                return super().decompress(data)
+            except zlib.error:
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return super().decompress(data)
+
+
+class _BrotliDecoder(Decoder):
+    def __init__(self) -> None:
+        self._obj = brotli.Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        return bytes(self._obj.process(data))
+
+
+def accept_encoding() -> str:
+    """Get the ``Accept-Encoding`` header value for supported codings.
+
+    Returns:
+        str: The comma-separated content codings.
+    """
+    if brotli is not None:
+        return "gzip, deflate, br"
+    return "gzip, deflate"
+
+
+def get_decoder(content_encoding: Optional[str]) -> Decoder:
+    """Get a decoder for a ``Content-Encoding`` header value.
+
+    Args:
+        content_encoding (str, optional): The response content coding.
+
+    Returns:
+        Decoder: An incremental decoder for the coding.
+
+    Raises:
+        NetworkError: If the coding is not supported.
+    """
+    encoding = (content_encoding or "").strip().lower()
+    if encoding in ("", "identity"):
+        return Decoder()
+    if encoding in ("gzip", "x-gzip"):
+        return _ZlibDecoder(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return _DeflateDecoder()
+    if encoding == "br" and brotli is not None:
+        return _BrotliDecoder()
+    raise NetworkError(f"Unsupported content encoding {content_encoding!r}")
+
+
+def decode_body(body: bytes, content_encoding: Optional[str]) -> bytes:
+    """Decode a complete response body.
+
+    Args:
+        body (bytes): The encoded body.
+        content_encoding (str, optional): The response content coding.
+
+    Returns:
+        bytes: The decoded body.
+
+    Raises:
+        NetworkError: If the body cannot be decoded.
+    """
+    decoder = get_decoder(content_encoding)
+    try:
+        return decoder.decompress(body) + decoder.flush()
+    except DECODE_ERRORS as exc:
+        raise NetworkError(f"Failed to decode response body: {exc}") from exc
@@ -11,3 +11,15 @@ class NetworkError(Exception):
     """Raised when a network request fails."""
 
     pass
+
+
+class ServerUnavailableError(Exception):
+    """Raised when the local server cannot be reached."""
+
+    pass
+
+
+class StoreError(Exception):
+    """Raised when the metadata store cannot be built or read."""
+
+    pass
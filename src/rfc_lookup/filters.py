@@ -0,0 +1,285 @@
+"""Module for narrowing down RFC searches.
+
+:class:`SearchFilters` describes which results of a search are wanted and
+in which order. The same filters are sent to the RFC Editor as search form
+fields, so only the matching rows are transferred, and applied to the
+results of the offline search.
+"""
+
+import calendar
+import datetime
+import itertools
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rfc_lookup.constants import (
+    FIRST_RFC_YEAR,
+    SEARCH_PAGE_SIZES,
+    SEARCH_SORT_KEYS,
+    SEARCH_STATUSES,
+)
+
+
+SEARCH_DATE = re.compile(r"([0-9]{4})(?:-([0-9]{1,2}))?")
+RESULT_DATE = re.compile(r"([A-Za-z]+)\s+([0-9]{4})\s*$")
+MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_name) if i}
+
+Month = Tuple[int, int]
+
+
+def parse_search_date(value: str, end: bool = False) -> datetime.date:
+    """Parse a ``YYYY`` or ``YYYY-MM`` date given to a search.
+
+    Args:
+        value (str): The date.
+        end (bool): Whether the date ends a range, so that a year without a
+            month stands for its last month.
+
+    Returns:
+        date: The first day of the month, or of the first or last month of
+            the year if no month is given.
+
+    Raises:
+        ValueError: If the date is not valid.
+    """
+    match = SEARCH_DATE.fullmatch(value.strip())
+    if match is None:
+        raise ValueError(f"Invalid date {value!r}, expected YYYY or YYYY-MM")
+    month = match.group(2) or (12 if end else 1)
+    return datetime.date(int(match.group(1)), int(month), 1)
+
+
+def parse_month(date: str) -> Optional[Month]:
+    """Get the year and month out of a publication date.
+
+    Args:
+        date (str): A date such as ``August 2018`` or ``1 April 2019``.
+
+    Returns:
+        tuple: The year and month, or None if the date cannot be read.
+    """
+    match = RESULT_DATE.search(date)
+    if match is None:
+        return None
+    month = MONTHS.get(match.group(1).lower())
+    if month is None:
+        return None
+    return int(match.group(2)), month
+
+
+def result_month(result: Dict[str, Any]) -> Optional[Month]:
+    """Get the year and month a search result was published in.
+
+    Args:
+        result (dict): A search result.
+
+    Returns:
+        tuple: The year and month, or None if the publication date cannot
+            be read.
+    """
+    return parse_month(result.get("publication_date") or "")
+
+
+def _month_fields(prefix: str, date: datetime.date) -> Dict[str, str]:
+    return {
+        f"{prefix}_month": calendar.month_name[date.month],
+        f"{prefix}_year": str(date.year),
+    }
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """Filters, order and size of a search.
+
+    Dates only count to the month, as that is all RFCs are dated with.
+    ``until`` includes the whole month it falls in.
+    """
+
+    status: Optional[str] = None
+    since: Optional[datetime.date] = None
+    until: Optional[datetime.date] = None
+    author: Optional[str] = None
+    sort: str = "number"
+    descending: bool = False
+    limit: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        """Check the filters.
+
+        Raises:
+            ValueError: If the status, sort key or limit is not valid.
+        """
+        if self.status is not None:
+            if self.status.lower() not in SEARCH_STATUSES:
+                raise ValueError(f"Unknown status {self.status!r}")
+            object.__setattr__(self, "status", self.status.lower())
+        if self.sort not in SEARCH_SORT_KEYS:
+            raise ValueError(f"Unknown sort key {self.sort!r}")
+        if self.limit is not None and self.limit < 1:
+            raise ValueError(f"Invalid limit {self.limit}, must be positive")
+
+    def params(self) -> Dict[str, str]:
+        """Build the RFC Editor search form fields for the filters.
+
+        Returns:
+            dict: The query parameters, without the searched title.
+        """
+        pubstatus, std_trk = SEARCH_STATUSES.get(
+            self.status or "", ("Any", "Any")
+        )
+        params = {"pubstatus[]": pubstatus, "std_trk": std_trk}
+        if self.since is None and self.until is None:
+            params["pub_date_type"] = "any"
+        else:
+            params["pub_date_type"] = "range"
+            since = self.since or datetime.date(FIRST_RFC_YEAR, 1, 1)
+            until = self.until or datetime.date.today()
+            params.update(_month_fields("from", since))
+            params.update(_month_fields("to", until))
+        if self.author:
+            params["author"] = self.author
+        params["sortkey"] = SEARCH_SORT_KEYS[self.sort]
+        params["sorting"] = "DESC" if self.descending else "ASC"
+        params["page"] = "All"
+        if self.limit is not None:
+            # Ask for the smallest page the wanted results fit on
+            for size in SEARCH_PAGE_SIZES:
+                if self.limit <= size:
+                    params["page"] = str(size)
+                    break
+        return params
+
+    def query(self) -> Dict[str, str]:
+        """Encode the filters as query parameters of ``rfc serve``.
+
+        Returns:
+            dict: The parameters that differ from the defaults.
+        """
+        query = {}
+        if self.status is not None:
+            query["status"] = self.status
+        if self.since is not None:
+            query["since"] = f"{self.since:%Y-%m}"
+        if self.until is not None:
+            query["until"] = f"{self.until:%Y-%m}"
+        if self.author:
+            query["author"] = self.author
+        if self.sort != "number":
+            query["sort"] = self.sort
+        if self.descending:
+            query["desc"] = "1"
+        if self.limit is not None:
+            query["limit"] = str(self.limit)
+        return query
+
+    @classmethod
+    def from_query(cls, query: Dict[str, str]) -> "SearchFilters":
+        """Decode filters encoded by :meth:`query`.
+
+        Args:
+            query (dict): The query parameters.
+
+        Returns:
+            SearchFilters: The filters.
+
+        Raises:
+            ValueError: If a parameter is not valid.
+        """
+        since = query.get("since")
+        until = query.get("until")
+        limit = query.get("limit")
+        return cls(
+            status=query.get("status") or None,
+            since=parse_search_date(since) if since else None,
+            until=parse_search_date(until) if until else None,
+            author=query.get("author") or None,
+            sort=query.get("sort") or "number",
+            descending=query.get("desc") == "1",
+            limit=int(limit) if limit else None,
+        )
+
+    def statuses(self) -> List[str]:
+        """Get the lower-cased statuses of the results the filters match.
+
+        Returns:
+            list: The statuses, or an empty list if any status matches.
+        """
+        if self.status is None:
+            return []
+        pubstatus, std_trk = SEARCH_STATUSES[self.status]
+        if std_trk != "Any":
+            return [std_trk.lower()]
+        return [
+            status
+            for status, (group, track) in SEARCH_STATUSES.items()
+            if group == pubstatus and track != "Any"
+        ] or [self.status]
+
+    def _matches_date(self, result: Dict[str, Any]) -> bool:
+        month = result_month(result)
+        if month is None:
+            return False
+        if self.since is not None and month < (
+            self.since.year,
+            self.since.month,
+        ):
+            return False
+        return self.until is None or month <= (
+            self.until.year,
+            self.until.month,
+        )
+
+    def matches(self, result: Dict[str, Any]) -> bool:
+        """Check whether a search result passes the filters.
+
+        Args:
+            result (dict): A search result.
+
+        Returns:
+            bool: True if the result is wanted.
+        """
+        statuses = self.statuses()
+        if statuses and result.get("status", "").lower() not in statuses:
+            return False
+        if (self.since or self.until) and not self._matches_date(result):
+            return False
+        if self.author:
+            author = self.author.lower()
+            return any(author in a.lower() for a in result.get("authors", ()))
+        return True
+
+    def _sort_key(self, result: Dict[str, Any]) -> Any:
+        if self.sort == "title":
+            return result["title"].lower(), result["id"]
+        if self.sort == "date":
+            return result_month(result) or (0, 0), result["id"]
+        return result["id"]
+
+    def apply(self, results: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Filter, sort and cut down search results.
+
+        This does locally what the RFC Editor does for :meth:`params`.
+
+        Args:
+            results (Iterable[dict]): The search results.
+
+        Returns:
+            list: The wanted results, in order.
+        """
+        wanted = [result for result in results if self.matches(result)]
+        wanted.sort(key=self._sort_key, reverse=self.descending)
+        return list(self.truncate(wanted))
+
+    def truncate(
+        self, results: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Stop search results at the limit.
+
+        Args:
+            results (Iterable[dict]): The search results.
+
+        Returns:
+            iterator: At most ``limit`` results.
+        """
+        return itertools.islice(results, self.limit)
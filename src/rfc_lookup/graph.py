@@ -0,0 +1,250 @@
+"""Module for following obsoletes and updates relations between RFCs.
+
+:class:`RfcGraph` stores the relations of the RFC index as compressed
+sparse rows: for every relation, an array of offsets indexed by RFC number
+points into an array of related RFC numbers. The reverse of each relation
+is stored the same way, so "what obsoletes RFC 2616" is as cheap to answer
+as "what does RFC 9110 obsolete", and transitive queries over the whole
+series only touch the RFCs they reach.
+"""
+
+import itertools
+import logging
+import threading
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from rfc_lookup.cache import IndexCache, get_default_index_cache
+from rfc_lookup.errors import NetworkError
+from rfc_lookup.index import RfcRecord, get_rfc_index, parse_rfc_index
+from rfc_lookup.utilities import get_latest_report_ids
+
+
+logger = logging.getLogger(__name__)
+
+# Each relation and the relation it is the reverse of
+RELATIONS = {
+    "obsoletes": "obsoleted_by",
+    "obsoleted_by": "obsoletes",
+    "updates": "updated_by",
+    "updated_by": "updates",
+}
+
+
+class Adjacency:
+    """Compressed sparse rows of one relation."""
+
+    def __init__(self, offsets: Sequence[int], targets: Sequence[int]) -> None:
+        """Initialize the rows.
+
+        Args:
+            offsets (Sequence[int]): Where the targets of each RFC number
+                start in ``targets``, followed by the number of targets.
+            targets (Sequence[int]): The related RFC numbers, ascending for
+                each RFC.
+        """
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_pairs(
+        cls, pairs: Iterable[Tuple[int, int]], size: int
+    ) -> "Adjacency":
+        """Build rows from ``(number, related number)`` pairs.
+
+        Args:
+            pairs (Iterable[tuple]): The relation, without duplicates.
+            size (int): One more than the highest RFC number.
+
+        Returns:
+            Adjacency: The rows.
+        """
+        ordered = sorted(pairs)
+        counts = [0] * (size + 1)
+        for number, _ in ordered:
+            counts[number + 1] += 1
+        offsets = array("I", itertools.accumulate(counts))
+        targets = array("I", (target for _, target in ordered))
+        return cls(offsets, targets)
+
+    def __getitem__(self, number: int) -> Sequence[int]:
+        """Get the RFCs an RFC is related to.
+
+        Args:
+            number (int): The RFC number.
+
+        Returns:
+            Sequence[int]: The related RFC numbers, in ascending order.
+        """
+        if not 0 <= number < len(self.offsets) - 1:
+            return ()
+        return self.targets[self.offsets[number] : self.offsets[number + 1]]
+
+
+class RfcGraph:
+    """Obsoletes and updates relations of the RFC index, in both directions.
+
+    ``graph.related(2616, "obsoleted_by")`` finds the RFCs that obsolete
+    RFC 2616. Relations are taken from both sides of the index entries, so
+    a relation listed on either RFC is known from the other one as well.
+    The titles of the RFCs in the index are kept alongside, to list the
+    RFCs found without going back to the index.
+    """
+
+    def __init__(
+        self,
+        relations: Dict[str, Adjacency],
+        titles: Optional[Dict[int, str]] = None,
+    ) -> None:
+        """Initialize the graph.
+
+        Args:
+            relations (dict): The rows of each of :data:`RELATIONS`.
+            titles (dict, optional): The title of each RFC in the index, by
+                number.
+        """
+        self.relations = relations
+        self.titles = titles if titles is not None else {}
+
+    @classmethod
+    def build(cls, records: Iterable[RfcRecord]) -> "RfcGraph":
+        """Build the graph from RFC records.
+
+        Args:
+            records (Iterable[RfcRecord]): The records of the RFC index.
+
+        Returns:
+            RfcGraph: The graph.
+        """
+        pairs: Dict[str, Set[Tuple[int, int]]] = {
+            "obsoletes": set(),
+            "updates": set(),
+        }
+        titles = {}
+        for record in records:
+            titles[record.number] = record.title
+            for kind, reverse in (
+                ("obsoletes", record.obsoleted_by),
+                ("updates", record.updated_by),
+            ):
+                pairs[kind].update(
+                    (record.number, n) for n in getattr(record, kind)
+                )
+                pairs[kind].update((n, record.number) for n in reverse)
+
+        size = 1 + max(
+            (max(pair) for edges in pairs.values() for pair in edges),
+            default=0,
+        )
+        relations = {}
+        for kind, edges in pairs.items():
+            relations[kind] = Adjacency.from_pairs(edges, size)
+            relations[RELATIONS[kind]] = Adjacency.from_pairs(
+                ((b, a) for a, b in edges), size
+            )
+        return cls(relations, titles)
+
+    def related(self, number: int, relation: str) -> Sequence[int]:
+        """Get the RFCs directly related to an RFC.
+
+        Args:
+            number (int): The RFC number.
+            relation (str): One of :data:`RELATIONS`.
+
+        Returns:
+            Sequence[int]: The related RFC numbers, in ascending order.
+        """
+        return self.relations[relation][number]
+
+    def walk(
+        self, number: int, relation: str, depth: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        """Follow a relation transitively from an RFC.
+
+        Args:
+            number (int): The RFC to start from.
+            relation (str): One of :data:`RELATIONS`.
+            depth (int, optional): The number of steps to follow at most.
+                Follows the relation to its end if omitted.
+
+        Returns:
+            list: ``(number, steps)`` pairs of each RFC reached, in the
+                order found, nearest first. The start RFC is not included.
+        """
+        rows = self.relations[relation]
+        seen = {number}
+        found: List[Tuple[int, int]] = []
+        queue = deque([(number, 0)])
+        while queue:
+            current, steps = queue.popleft()
+            if depth is not None and steps >= depth:
+                continue
+            for target in rows[current]:
+                if target not in seen:
+                    seen.add(target)
+                    found.append((target, steps + 1))
+                    queue.append((target, steps + 1))
+        return found
+
+    def current(self, number: int) -> List[int]:
+        """Get the RFCs that replace an RFC and are not obsoleted themselves.
+
+        Args:
+            number (int): The RFC number.
+
+        Returns:
+            list: The current RFCs, in ascending order. This is ``[number]``
+                if the RFC is not obsoleted.
+        """
+        rows = self.relations["obsoleted_by"]
+        reached = [number] + [n for n, _ in self.walk(number, "obsoleted_by")]
+        return sorted(n for n in reached if not rows[n])
+
+
+_graphs: Dict[Tuple[Path, Optional[str]], RfcGraph] = {}
+_graphs_lock = threading.Lock()
+
+
+def get_rfc_graph(cache: Optional[IndexCache] = None) -> RfcGraph:
+    """Get the relations graph of the latest RFC index.
+
+    The index is refreshed as for :func:`rfc_lookup.index.get_rfc_index`.
+    If that fails, the stored index text is used instead, so relations can
+    be followed without network access. Graphs are kept for the life of the
+    process and rebuilt when the index changes.
+
+    Args:
+        cache (IndexCache, optional): The index cache to use. Defaults to the
+            cache configured from the environment.
+
+    Returns:
+        RfcGraph: The graph.
+
+    Raises:
+        NetworkError: If the RFC index cannot be fetched and there is no
+            local copy.
+    """
+    if cache is None:
+        cache = get_default_index_cache()
+
+    try:
+        get_latest_report_ids(cache)
+    except NetworkError:
+        if cache.content_version() is None:
+            raise
+        logger.debug("Following relations of the stored index offline")
+
+    with _graphs_lock:
+        graph = _graphs.get((cache.path, cache.content_version()))
+        if graph is None:
+            content = cache.load_content()
+            if content is not None:
+                records = parse_rfc_index(content)
+            else:
+                records = get_rfc_index(cache)
+            _graphs.clear()
+            key = (cache.path, cache.content_version())
+            graph = _graphs[key] = RfcGraph.build(records)
+        return graph
@@ -0,0 +1,294 @@
+"""Module for parsing the RFC index into structured metadata records.
+
+The RFC index (``rfc-index.txt``) lists one entry per RFC, wrapped over
+several indented lines::
+
+    8446 The Transport Layer Security (TLS) Protocol Version 1.3. E.
+         Rescorla. August 2018. (Format: HTML, TXT, PDF, XML) (Obsoletes
+         RFC5077, RFC5246, RFC6961) (Updates RFC5705, RFC6066) (Status:
+         PROPOSED STANDARD) (DOI: 10.17487/RFC8446)
+"""
+
+import functools
+import re
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from rfc_lookup.cache import IndexCache, get_default_index_cache
+from rfc_lookup.utilities import get_latest_report_ids
+
+
+ATTRIBUTE = re.compile(
+    r"\((Format|Obsoletes|Obsoleted by|Updates|Updated by|Also|Status|"
+    r"Stream|DOI)[: ]\s*([^)]*)\)"
+)
+DATE = re.compile(
+    r"\s*((?:\d{1,2} )?(?:January|February|March|April|May|June|July|"
+    r"August|September|October|November|December) \d{4})\.?\s*$"
+)
+# Authors nearly always start with initials, e.g. "J. Postel" or "J-P. Vasseur"
+AUTHORS_START = re.compile(r"\.\s+(?=(?:[A-Z][a-z]{0,2}\.[ -]?)+[A-Z])")
+# A sentence end that is not the period of an initial such as "B."
+SENTENCE_END = re.compile(r"(?<!\b[A-Z])\.\s+")
+# Authors separated by commas, each editor keeping the "Ed." after the name
+AUTHOR = re.compile(r" ?([^,]+(?:, Ed\.)*)")
+RFC_REFERENCE = re.compile(r"RFC0*(\d+)")
+# Format names, e.g. "TXT" in "TXT=21088 bytes", and "Also" identifiers
+FORMAT_NAME = re.compile(r"\b[A-Z]{2,}\b")
+DOCUMENT_ID = re.compile(r"[A-Z]+\d+")
+
+# Dates such as "30 September 2000." end the text, so only its tail is searched
+DATE_MAX_LENGTH = 24
+
+# Only the first line of an entry starts with a digit, so joining the other
+# lines onto it and collapsing runs of spaces puts every entry on one line
+WRAPPED = re.compile(r"\n(?![\n\d])[ \t]*")
+SPACES = re.compile(r"  +")
+MONTHS = (
+    "January|February|March|April|May|June|July|August|September|October|"
+    "November|December"
+)
+# A whole entry as the index nearly always writes it, with the date and the
+# parenthesised fields in their usual order, so the fields of every entry
+# come from a single pass over the text. Anything else, such as a title with
+# parentheses or an entry without a date, ends up in the last group and goes
+# through parse_entry.
+INDEX_ENTRY = re.compile(
+    r"\n\n(\d+) (?:"
+    r"([^(\n]*)(?<!\d) "
+    rf"((?:\d{{1,2}} )?(?:{MONTHS}) \d{{4}})\."
+    r"(?: \(Format: ?([^)\n]*)\))?"
+    r"(?: \(Obsoletes ([^)\n]*)\))?"
+    r"(?: \(Obsoleted by ([^)\n]*)\))?"
+    r"(?: \(Updates ([^)\n]*)\))?"
+    r"(?: \(Updated by ([^)\n]*)\))?"
+    r"(?: \(Also ([^)\n]*)\))?"
+    r"(?: \(Status: ?([^)\n]*)\))?"
+    r"(?: \(Stream: ?([^)\n]*)\))?"
+    r"(?: \(DOI: ?([^)\n]*)\))?"
+    r" ?(?=\n|$)|(.*))"
+)
+NOT_ISSUED = "Not Issued"
+
+
+@dataclass
+class RfcRecord:
+    """Metadata for a single RFC from the RFC index."""
+
+    __slots__ = (
+        "number",
+        "title",
+        "authors",
+        "date",
+        "status",
+        "stream",
+        "formats",
+        "obsoletes",
+        "obsoleted_by",
+        "updates",
+        "updated_by",
+        "also",
+        "doi",
+    )
+
+    number: int
+    title: str
+    authors: Tuple[str, ...]
+    date: str
+    status: str
+    stream: str
+    formats: Tuple[str, ...]
+    obsoletes: Tuple[int, ...]
+    obsoleted_by: Tuple[int, ...]
+    updates: Tuple[int, ...]
+    updated_by: Tuple[int, ...]
+    also: Tuple[str, ...]
+    doi: str
+
+    @property
+    def issued(self) -> bool:
+        """Whether the RFC number was ever issued."""
+        return self.title != NOT_ISSUED
+
+
+def _rfc_numbers(value: Optional[str]) -> Tuple[int, ...]:
+    if not value:
+        return ()
+    try:
+        # Nearly always a plain list such as "RFC0793, RFC0879"
+        return tuple(map(int, value.replace("RFC", "").split(",")))
+    except ValueError:
+        return tuple(map(int, RFC_REFERENCE.findall(value)))
+
+
+@functools.lru_cache(maxsize=256)
+def _formats(value: str) -> Tuple[str, ...]:
+    # Most entries share one of a few format lists
+    return tuple(FORMAT_NAME.findall(value))
+
+
+def _split_authors(text: str) -> Tuple[str, Tuple[str, ...]]:
+    match = AUTHORS_START.search(text)
+    if match is None:
+        # Corporate authors such as "IAB" follow the last sentence
+        ends = list(SENTENCE_END.finditer(text))
+        if not ends:
+            return text, ()
+        match = ends[-1]
+
+    title, authors = text[: match.start()], text[match.end() :]
+    return title, tuple(AUTHOR.findall(authors))
+
+
+def parse_entry(number: int, body: str) -> RfcRecord:
+    """Parse the text of a single RFC index entry.
+
+    Args:
+        number (int): The RFC number at the start of the entry.
+        body (str): The rest of the entry, joined onto a single line.
+
+    Returns:
+        RfcRecord: The parsed record.
+    """
+    attributes = dict(ATTRIBUTE.findall(body))
+    text = ATTRIBUTE.sub("", body).rstrip() if attributes else body.rstrip()
+
+    date = ""
+    date_match = DATE.search(text, max(0, len(text) - DATE_MAX_LENGTH))
+    if date_match is not None:
+        date = date_match.group(1)
+        text = text[: date_match.start()]
+    if text.endswith("."):
+        text = text[:-1]
+
+    authors: Tuple[str, ...] = ()
+    if text == NOT_ISSUED:
+        title = NOT_ISSUED
+    else:
+        title, authors = _split_authors(text)
+
+    get = attributes.get
+    return RfcRecord(
+        number=number,
+        title=title.strip(),
+        authors=authors,
+        date=date,
+        status=get("Status", "").strip(),
+        stream=get("Stream", "").strip(),
+        formats=_formats(get("Format", "")),
+        obsoletes=_rfc_numbers(get("Obsoletes")),
+        obsoleted_by=_rfc_numbers(get("Obsoleted by")),
+        updates=_rfc_numbers(get("Updates")),
+        updated_by=_rfc_numbers(get("Updated by")),
+        also=tuple(DOCUMENT_ID.findall(get("Also", ""))),
+        doi=get("DOI", "").strip(),
+    )
+
+
+def parse_rfc_index(content: str) -> List[RfcRecord]:
+    """Parse RFC index text into metadata records.
+
+    Args:
+        content (str): The RFC index text.
+
+    Returns:
+        list: The records, sorted by RFC number.
+    """
+    records = []
+    joined = SPACES.sub(" ", WRAPPED.sub(" ", "\n\n" + content))
+    for (
+        number,
+        text,
+        date,
+        formats,
+        obsoletes,
+        obsoleted_by,
+        updates,
+        updated_by,
+        also,
+        status,
+        stream,
+        doi,
+        entry,
+    ) in INDEX_ENTRY.findall(joined):
+        if entry:
+            records.append(parse_entry(int(number), " ".join(entry.split())))
+            continue
+        title, authors = _split_authors(
+            text[:-1] if text.endswith(".") else text
+        )
+        records.append(
+            RfcRecord(
+                int(number),
+                title.strip(),
+                authors,
+                date,
+                status.strip(),
+                stream.strip(),
+                _formats(formats),
+                _rfc_numbers(obsoletes),
+                _rfc_numbers(obsoleted_by),
+                _rfc_numbers(updates),
+                _rfc_numbers(updated_by),
+                tuple(DOCUMENT_ID.findall(also)) if also else (),
+                doi.strip(),
+            )
+        )
+    records.sort(key=lambda r: r.number)
+    return records
+
+
+def merge_records(
+    records: Dict[int, RfcRecord], new_records: Iterable[RfcRecord]
+) -> None:
+    """Add newly published RFCs to a set of records.
+
+    The records of the RFCs a new RFC obsoletes or updates are replaced with
+    copies listing it in their ``obsoleted_by`` or ``updated_by`` fields, as
+    a re-parsed index would show them.
+
+    Args:
+        records (dict): The records by RFC number, updated in place.
+        new_records (Iterable[RfcRecord]): The records to add.
+    """
+    for record in new_records:
+        records[record.number] = record
+        for number in record.obsoletes:
+            old = records.get(number)
+            if old is not None and record.number not in old.obsoleted_by:
+                records[number] = replace(
+                    old, obsoleted_by=old.obsoleted_by + (record.number,)
+                )
+        for number in record.updates:
+            old = records.get(number)
+            if old is not None and record.number not in old.updated_by:
+                records[number] = replace(
+                    old, updated_by=old.updated_by + (record.number,)
+                )
+
+
+def get_rfc_index(cache: Optional[IndexCache] = None) -> List[RfcRecord]:
+    """Get metadata records for every RFC in the latest RFC index.
+
+    The index text comes from the local index cache, which is refreshed and
+    revalidated exactly as for
+    :func:`rfc_lookup.utilities.get_latest_report_ids`.
+
+    Args:
+        cache (IndexCache, optional): The index cache to use. Defaults to the
+            cache configured from the environment.
+
+    Returns:
+        list: The records, sorted by RFC number.
+    """
+    if cache is None:
+        cache = get_default_index_cache()
+
+    get_latest_report_ids(cache)
+    content = cache.load_content()
+    if content is None:
+        # The state survived without its text, so force a full download
+        cache.clear()
+        get_latest_report_ids(cache)
+        content = cache.load_content() or ""
+    return parse_rfc_index(content)
@@ -0,0 +1,297 @@
+"""Module for a local mirror of the plain-text RFCs.
+
+``rfc mirror sync`` keeps a directory holding ``rfc<ID>.txt`` for every
+issued RFC in step with the RFC index. Documents are fetched concurrently
+and each file only appears once complete, so an interrupted sync resumes
+where it stopped. ``mirror.json`` records a fingerprint of the index entry
+each document was last checked against. Only documents whose entry changed
+since are revalidated, with a conditional request against the modification
+time of their file, which is set from ``Last-Modified``.
+
+While ``RFC_LOOKUP_MIRROR`` points at a mirror, RFCs are read from it before
+the cache or the network.
+"""
+
+import contextlib
+import email.utils
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import astuple
+from pathlib import Path
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from rfc_lookup.constants import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_WORKERS,
+    MIRROR_DIR_ENV,
+    MIRROR_MANIFEST,
+    MIRROR_SAVE_INTERVAL,
+    RFC_TEXT_URL,
+)
+from rfc_lookup.errors import NetworkError
+from rfc_lookup.index import RfcRecord
+from rfc_lookup.utilities import open_url, read_chunks
+
+
+logger = logging.getLogger(__name__)
+
+
+def record_fingerprint(record: RfcRecord) -> str:
+    """Fingerprint an RFC index entry.
+
+    Args:
+        record (RfcRecord): The index entry.
+
+    Returns:
+        str: A digest that changes whenever any field of the entry does.
+    """
+    data = json.dumps(astuple(record), separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def _set_mtime(path: Path, modified: Optional[str]) -> None:
+    if not modified:
+        return
+    with contextlib.suppress(TypeError, ValueError):
+        timestamp = email.utils.parsedate_to_datetime(modified).timestamp()
+        os.utime(path, (timestamp, timestamp))
+
+
+class Mirror:
+    """Directory of plain-text RFCs mirrored from the RFC Editor."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the mirror.
+
+        Args:
+            path (Path): The mirror directory.
+        """
+        self.path = Path(path)
+
+    @property
+    def manifest_path(self) -> Path:
+        """The file recording what each document was checked against."""
+        return self.path / MIRROR_MANIFEST
+
+    def document_path(self, report_id: int) -> Path:
+        """Get the path of a mirrored RFC.
+
+        Args:
+            report_id (int): The RFC number.
+
+        Returns:
+            Path: The path of the document, which may not exist.
+        """
+        return self.path / f"rfc{report_id}.txt"
+
+    def contains(self, report_id: int) -> bool:
+        """Check whether an RFC is mirrored.
+
+        Args:
+            report_id (int): The RFC number.
+
+        Returns:
+            bool: True if the document is in the mirror.
+        """
+        return self.document_path(report_id).is_file()
+
+    def open(self, report_id: int) -> Optional[BinaryIO]:
+        """Open a mirrored RFC.
+
+        Args:
+            report_id (int): The RFC number.
+
+        Returns:
+            BinaryIO: The open document, or None if it is not mirrored.
+        """
+        try:
+            return open(self.document_path(report_id), "rb")
+        except OSError:
+            return None
+
+    def read(self, report_id: int) -> Optional[str]:
+        """Read a mirrored RFC.
+
+        Args:
+            report_id (int): The RFC number.
+
+        Returns:
+            str: The plain-text document, or None if it is not mirrored.
+        """
+        mirrored = self.open(report_id)
+        if mirrored is None:
+            return None
+        with mirrored:
+            return mirrored.read().decode("utf-8")
+
+    def load_manifest(self) -> Dict[int, str]:
+        """Load the fingerprints the documents were last checked against.
+
+        Returns:
+            dict: The fingerprint of each checked RFC, empty if the manifest
+                is missing or unreadable.
+        """
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            return {int(k): str(v) for k, v in data["documents"].items()}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return {}
+
+    def save_manifest(self, manifest: Dict[int, str]) -> None:
+        """Store the fingerprints the documents were last checked against.
+
+        Args:
+            manifest (dict): The fingerprint of each checked RFC.
+        """
+        data = {"documents": {str(k): v for k, v in sorted(manifest.items())}}
+        partial = self.manifest_path.with_suffix(".part")
+        partial.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(partial, self.manifest_path)
+
+    def plan(
+        self, records: Iterable[RfcRecord], revalidate: bool = False
+    ) -> List[Tuple[int, bool]]:
+        """Diff the mirror against the RFC index.
+
+        Args:
+            records (Iterable[RfcRecord]): The entries of the RFC index.
+            revalidate (bool): Revalidate every mirrored document, not only
+                those whose index entry changed.
+
+        Returns:
+            list: The RFC numbers to sync, each with whether its document is
+                already mirrored and only needs revalidating. RFCs without a
+                plain-text version are left out.
+        """
+        manifest = {} if revalidate else self.load_manifest()
+        tasks: List[Tuple[int, bool]] = []
+        for record in records:
+            # Some RFCs are only published in other formats
+            if not record.issued or "TXT" not in record.formats:
+                continue
+            if not self.document_path(record.number).exists():
+                tasks.append((record.number, False))
+            elif manifest.get(record.number) != record_fingerprint(record):
+                tasks.append((record.number, True))
+        return tasks
+
+    def fetch(
+        self,
+        report_id: int,
+        revalidate: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> bool:
+        """Download an RFC into the mirror.
+
+        The document is written to disk as it arrives rather than held in
+        memory, and only replaces the mirrored file once complete.
+
+        Args:
+            report_id (int): The RFC number.
+            revalidate (bool): Only download the document if it changed
+                since the mirrored file was written.
+            chunk_size (int): The number of bytes to read at a time.
+
+        Returns:
+            bool: Whether the document was downloaded.
+        """
+        path = self.document_path(report_id)
+        headers: Dict[str, str] = {}
+        if revalidate and path.exists():
+            headers["If-Modified-Since"] = email.utils.formatdate(
+                path.stat().st_mtime, usegmt=True
+            )
+
+        url = RFC_TEXT_URL.format(id=report_id)
+        with open_url(url, headers) as res:
+            if res.status == 304:
+                return False
+
+            partial = path.with_suffix(".part")
+            try:
+                with open(partial, "wb") as f:
+                    for chunk in read_chunks(res, url, chunk_size):
+                        f.write(chunk)
+                _set_mtime(partial, res.headers.get("last-modified"))
+                os.replace(partial, path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    partial.unlink()
+                raise
+        return True
+
+    def sync(
+        self,
+        records: Iterable[RfcRecord],
+        revalidate: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> Iterator[Tuple[int, Union[bool, Exception]]]:
+        """Bring the mirror in line with the RFC index.
+
+        Missing documents are downloaded, and mirrored documents whose index
+        entry changed are revalidated, through a bounded thread pool. The
+        manifest is saved as the sync goes and when it stops, so an
+        interrupted sync only repeats the documents in flight.
+
+        Args:
+            records (Iterable[RfcRecord]): The entries of the RFC index.
+            revalidate (bool): Revalidate every mirrored document.
+            max_workers (int): The maximum number of concurrent downloads.
+
+        Yields:
+            tuple: The RFC number and whether its document was downloaded,
+                or the :class:`NetworkError` or :class:`OSError` raised
+                for it. Documents already up to date are not yielded.
+        """
+        records = list(records)
+        fingerprints = {r.number: record_fingerprint(r) for r in records}
+        tasks = self.plan(records, revalidate)
+        self.path.mkdir(parents=True, exist_ok=True)
+        manifest = self.load_manifest()
+
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            futures: Dict["Future[bool]", int] = {
+                executor.submit(self.fetch, report_id, mirrored): report_id
+                for report_id, mirrored in tasks
+            }
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    report_id = futures[future]
+                    try:
+                        result: Union[bool, Exception] = future.result()
+                    except (NetworkError, OSError) as exc:
+                        yield report_id, exc
+                        continue
+                    manifest[report_id] = fingerprints[report_id]
+                    if done % MIRROR_SAVE_INTERVAL == 0:
+                        self.save_manifest(manifest)
+                    yield report_id, result
+            finally:
+                for future in futures:
+                    future.cancel()
+                self.save_manifest(manifest)
+
+
+def get_default_mirror() -> Optional[Mirror]:
+    """Get the mirror configured from the environment.
+
+    Returns:
+        Mirror: The mirror ``RFC_LOOKUP_MIRROR`` points at, or None if it is
+            unset.
+    """
+    path = os.environ.get(MIRROR_DIR_ENV)
+    if not path:
+        return None
+    return Mirror(Path(path).expanduser())
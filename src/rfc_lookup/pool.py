@@ -0,0 +1,334 @@
+"""Module for persistent HTTP connection pooling."""
+
+import http.client
+import logging
+import os
+import threading
+import time
+import urllib.parse
+from types import TracebackType
+from typing import Dict, List, Optional, Tuple, Type
+
+from rfc_lookup.constants import (
+    CONNECT_TIMEOUT_ENV,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_IDLE_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_READ_TIMEOUT,
+    READ_TIMEOUT_ENV,
+)
+from rfc_lookup.decoding import DECODE_ERRORS, get_decoder
+from rfc_lookup.errors import NetworkError
+
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, int]
+IdleConnections = List[Tuple[http.client.HTTPConnection, float]]
+
+# Errors raised when a kept-alive connection was closed by the server while
+# it sat idle in the pool.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class PooledResponse:
+    """An HTTP response whose connection returns to the pool once closed.
+
+    The body is decoded according to its ``Content-Encoding`` as it is read.
+    The connection is only reused if the body was read to the end and the
+    server did not ask for the connection to be closed.
+    """
+
+    def __init__(
+        self,
+        pool: "ConnectionPool",
+        key: PoolKey,
+        conn: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+    ) -> None:
+        """Initialize the response.
+
+        Args:
+            pool (ConnectionPool): The pool owning the connection.
+            key (tuple): The pool key of the connection.
+            conn (HTTPConnection): The connection the response was read from.
+            response (HTTPResponse): The underlying response.
+        """
+        self._pool = pool
+        self._key = key
+        self._conn: Optional[http.client.HTTPConnection] = conn
+        self._response = response
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = {k.lower(): v for k, v in response.getheaders()}
+        self._decoder = get_decoder(self.headers.get("content-encoding"))
+        self._flushed = False
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        """Read and decode from the response body.
+
+        Args:
+            amt (int, optional): The number of encoded bytes to read at a
+                time. Reads the whole remaining body if omitted.
+
+        Returns:
+            bytes: The decoded data, empty at the end of the body.
+
+        Raises:
+            NetworkError: If the body cannot be decoded.
+        """
+        try:
+            if amt is None:
+                return self._decode(self._response.read(), final=True)
+
+            # Compressed chunks may decode to nothing, so keep reading until
+            # there is output or the body has ended.
+            while True:
+                raw = self._response.read(amt)
+                data = self._decode(raw, final=not raw)
+                if data or not raw:
+                    return data
+        except DECODE_ERRORS as exc:
+            raise NetworkError(
+                f"Failed to decode response body: {exc}"
+            ) from exc
+
+    def _decode(self, raw: bytes, final: bool) -> bytes:
+        data = self._decoder.decompress(raw)
+        if final and not self._flushed:
+            self._flushed = True
+            data += self._decoder.flush()
+        return data
+
+    def close(self) -> None:
+        """Close the response and release its connection."""
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+
+        if self._response.isclosed() and not self._response.will_close:
+            self._pool._release(self._key, conn)
+        else:
+            self._response.close()
+            conn.close()
+
+    def __enter__(self) -> "PooledResponse":
+        """Enter the response context.
+
+        Returns:
+            PooledResponse: This response.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        """Close the response on leaving the context."""
+        self.close()
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive HTTP(S) connections per host.
+
+    Up to ``max_size`` idle connections are kept for each scheme, host and
+    port. Idle connections older than ``idle_timeout`` seconds are closed
+    instead of reused. Connecting and each read of a response are bounded by
+    their own timeouts, so a stalled server cannot block a request forever.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            max_size (int): The maximum number of idle connections per host.
+            idle_timeout (float): Seconds an idle connection may be reused.
+            connect_timeout (float, optional): Seconds to wait for a new
+                connection. Waits indefinitely if omitted.
+            read_timeout (float, optional): Seconds to wait for data from
+                the server. Waits indefinitely if omitted.
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._idle: Dict[PoolKey, IdleConnections] = {}
+        self._lock = threading.Lock()
+
+    def _new_connection(self, key: PoolKey) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host, port, timeout=self.connect_timeout
+            )
+        return http.client.HTTPConnection(
+            host, port, timeout=self.connect_timeout
+        )
+
+    def _acquire(self, key: PoolKey) -> Optional[http.client.HTTPConnection]:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                conn, released_at = idle.pop()
+                if now - released_at < self.idle_timeout:
+                    return conn
+                conn.close()
+        return None
+
+    def _release(self, key: PoolKey, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_size:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def idle_count(self, key: Optional[PoolKey] = None) -> int:
+        """Count the idle connections held by the pool.
+
+        Args:
+            key (tuple, optional): Only count connections for this
+                ``(scheme, host, port)``.
+
+        Returns:
+            int: The number of idle connections.
+        """
+        with self._lock:
+            if key is not None:
+                return len(self._idle.get(key, []))
+            return sum(len(idle) for idle in self._idle.values())
+
+    def request(self, url: str, headers: Dict[str, str]) -> PooledResponse:
+        """Send a GET request over a pooled connection.
+
+        A request on a reused connection that the server has since closed
+        is retried once on a new connection.
+
+        Args:
+            url (str): The full URL to request.
+            headers (dict): The request headers.
+
+        Returns:
+            PooledResponse: The response. Close it to release the connection.
+
+        Raises:
+            ValueError: If the URL scheme is not http or https.
+        """
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme {parsed.scheme!r}")
+
+        default_port = 443 if parsed.scheme == "https" else 80
+        key = (
+            parsed.scheme,
+            parsed.hostname or "",
+            parsed.port or default_port,
+        )
+        path = parsed.path or "/"
+        if parsed.query:
+            path = f"{path}?{parsed.query}"
+
+        conn = self._acquire(key)
+        if conn is not None:
+            try:
+                return self._send(key, conn, path, headers)
+            except STALE_CONNECTION_ERRORS:
+                logger.debug("Retrying request on stale connection to %s", key)
+                conn.close()
+
+        return self._send(key, self._new_connection(key), path, headers)
+
+    def _connect(self, conn: http.client.HTTPConnection) -> None:
+        conn.connect()
+        # The connect timeout only applies to connecting, later reads wait
+        # for up to the read timeout
+        conn.sock.settimeout(self.read_timeout)
+
+    def _send(
+        self,
+        key: PoolKey,
+        conn: http.client.HTTPConnection,
+        path: str,
+        headers: Dict[str, str],
+    ) -> PooledResponse:
+        try:
+            if conn.sock is None:
+                self._connect(conn)
+            conn.request("GET", path, headers=headers)
+            return PooledResponse(self, key, conn, conn.getresponse())
+        except BaseException:
+            conn.close()
+            raise
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                conn.close()
+
+
+def _timeout_from_env(name: str, default: float) -> Optional[float]:
+    value = os.environ.get(name)
+    if not value:
+        return default
+
+    try:
+        timeout = float(value)
+    except ValueError:
+        logger.debug("Ignoring invalid %s value %r", name, value)
+        return default
+    # Zero or less waits indefinitely
+    return timeout if timeout > 0 else None
+
+
+def default_timeouts() -> Tuple[Optional[float], Optional[float]]:
+    """Get the connect and read timeouts configured from the environment.
+
+    Reads ``RFC_LOOKUP_CONNECT_TIMEOUT`` and ``RFC_LOOKUP_READ_TIMEOUT`` in
+    seconds, falling back to the defaults when unset or invalid. A timeout
+    of ``0`` waits indefinitely.
+
+    Returns:
+        tuple: The connect and read timeouts, None for no timeout.
+    """
+    return (
+        _timeout_from_env(CONNECT_TIMEOUT_ENV, DEFAULT_CONNECT_TIMEOUT),
+        _timeout_from_env(READ_TIMEOUT_ENV, DEFAULT_READ_TIMEOUT),
+    )
+
+
+_default_pool: Optional[ConnectionPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> ConnectionPool:
+    """Get the connection pool shared by the package utility functions.
+
+    Returns:
+        ConnectionPool: The shared pool.
+    """
+    global _default_pool
+
+    with _default_pool_lock:
+        if _default_pool is None:
+            connect_timeout, read_timeout = default_timeouts()
+            _default_pool = ConnectionPool(
+                connect_timeout=connect_timeout, read_timeout=read_timeout
+            )
+        return _default_pool
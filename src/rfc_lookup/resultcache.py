@@ -0,0 +1,255 @@
+"""Module for memoizing search results in memory.
+
+:class:`ResultCache` keeps the results of recent searches in a bounded,
+thread-safe LRU whose entries expire after a time to live, so repeated
+searches do not go back to the RFC Editor. The cache can be backed by an
+SQLite database so that its entries survive restarts.
+"""
+
+import copy
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from rfc_lookup.constants import (
+    DEFAULT_SEARCH_CACHE_ENTRIES,
+    DEFAULT_SEARCH_CACHE_TTL,
+    SEARCH_CACHE_DB_ENV,
+    SEARCH_CACHE_TTL_ENV,
+)
+
+
+logger = logging.getLogger(__name__)
+
+Results = List[Dict[str, Any]]
+
+
+class ResultCache:
+    """Thread-safe LRU of search results with a time to live.
+
+    Entries are returned as copies, so callers may modify them freely. With
+    a database path, entries are also written to SQLite and read back from
+    it after a restart. Database errors are logged and otherwise ignored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_SEARCH_CACHE_ENTRIES,
+        ttl: float = DEFAULT_SEARCH_CACHE_TTL,
+        path: Optional[Path] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries (int): The maximum number of entries kept in memory.
+            ttl (float): Seconds an entry stays valid. ``0`` disables the
+                cache.
+            path (Path, optional): The SQLite database backing the cache.
+            clock (Callable): Function returning the current UNIX time.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Results]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything at all."""
+        return self.ttl > 0 and self.max_entries > 0
+
+    def __len__(self) -> int:
+        """Get the number of entries held in memory."""
+        with self._lock:
+            return len(self._entries)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, expires REAL, data TEXT)"
+            )
+            self._db = db
+        return self._db
+
+    def _load(self, key: str, now: float) -> Optional[Tuple[float, Results]]:
+        try:
+            db = self._connect()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT expires, data FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        except (OSError, sqlite3.Error) as exc:
+            logger.debug("Unable to read search cache %s: %s", self.path, exc)
+            return None
+        if row is None or row[0] <= now:
+            return None
+        try:
+            return row[0], json.loads(row[1])
+        except ValueError:
+            return None
+
+    def _store(self, key: str, expires: float, results: Results) -> None:
+        try:
+            db = self._connect()
+            if db is None:
+                return
+            with db:
+                db.execute(
+                    "DELETE FROM results WHERE expires <= ?", (self._clock(),)
+                )
+                db.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                    (key, expires, json.dumps(results)),
+                )
+        except (OSError, sqlite3.Error) as exc:
+            logger.debug("Unable to write search cache %s: %s", self.path, exc)
+
+    def get(self, key: str) -> Optional[Results]:
+        """Get the results stored for a search.
+
+        Args:
+            key (str): The normalized search.
+
+        Returns:
+            list: A copy of the results, or None if they are not cached or
+                have expired.
+        """
+        if not self.enabled:
+            return None
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                entry = self._load(key, now)
+                if entry is not None:
+                    self._remember(key, entry)
+            else:
+                self._entries.move_to_end(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def _remember(self, key: str, entry: Tuple[float, Results]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def set(self, key: str, results: Results) -> None:
+        """Store the results of a search.
+
+        Args:
+            key (str): The normalized search.
+            results (list): The search results.
+        """
+        if not self.enabled:
+            return
+        expires = self._clock() + self.ttl
+        entry = (expires, copy.deepcopy(results))
+        with self._lock:
+            self._remember(key, entry)
+            self._store(key, expires, entry[1])
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop the results of one search, or of every search.
+
+        Args:
+            key (str, optional): The normalized search to drop. Drops every
+                entry, including those in the database, if omitted.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            try:
+                db = self._connect()
+                if db is None:
+                    return
+                with db:
+                    if key is None:
+                        db.execute("DELETE FROM results")
+                    else:
+                        db.execute("DELETE FROM results WHERE key = ?", (key,))
+            except (OSError, sqlite3.Error) as exc:
+                logger.debug(
+                    "Unable to invalidate search cache %s: %s", self.path, exc
+                )
+
+    def close(self) -> None:
+        """Close the database, if one is open."""
+        with self._lock:
+            db, self._db = self._db, None
+        if db is not None:
+            db.close()
+
+
+def default_search_cache_ttl() -> float:
+    """Get the number of seconds search results are cached.
+
+    Reads ``RFC_LOOKUP_SEARCH_CACHE_TTL``, falling back to the default when
+    the variable is unset or not a valid number. ``0`` disables the cache.
+
+    Returns:
+        float: The time to live in seconds.
+    """
+    value = os.environ.get(SEARCH_CACHE_TTL_ENV)
+    if not value:
+        return DEFAULT_SEARCH_CACHE_TTL
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        logger.debug(
+            "Ignoring invalid %s value %r", SEARCH_CACHE_TTL_ENV, value
+        )
+        return DEFAULT_SEARCH_CACHE_TTL
+
+
+_default_search_cache: Optional[ResultCache] = None
+_default_search_cache_lock = threading.Lock()
+
+
+def get_default_search_cache() -> ResultCache:
+    """Get the search result cache shared by the package.
+
+    The cache is configured from the environment when first used. It is
+    backed by the SQLite database ``RFC_LOOKUP_SEARCH_CACHE_DB`` points at,
+    if set.
+
+    Returns:
+        ResultCache: The shared cache.
+    """
+    global _default_search_cache
+
+    with _default_search_cache_lock:
+        if _default_search_cache is None:
+            path = os.environ.get(SEARCH_CACHE_DB_ENV)
+            _default_search_cache = ResultCache(
+                ttl=default_search_cache_ttl(),
+                path=Path(path).expanduser() if path else None,
+            )
+        return _default_search_cache
@@ -0,0 +1,201 @@
+"""Module for retrying and rate limiting HTTP requests.
+
+:class:`RetryPolicy` decides how long to wait before retrying a request that
+failed with a transient error, using exponential backoff with full jitter
+and honoring ``Retry-After``. :class:`TokenBucket` spaces requests out to a
+steady rate while allowing short bursts.
+"""
+
+import email.utils
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from rfc_lookup.constants import (
+    DEFAULT_BACKOFF,
+    DEFAULT_MAX_BACKOFF,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_RETRIES,
+    RATE_LIMIT_ENV,
+    RETRIES_ENV,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(
+    value: Optional[str], now: Optional[float] = None
+) -> Optional[float]:
+    """Parse a ``Retry-After`` header.
+
+    Args:
+        value (str, optional): The header value, in seconds or an HTTP date.
+        now (float, optional): The current time as a UNIX timestamp.
+            Defaults to the system time.
+
+    Returns:
+        float: The number of seconds to wait, or None if the header is
+            missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if now is None:
+        now = time.time()
+    return max(date.timestamp() - now, 0.0)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and after how long failed requests are retried."""
+
+    retries: int = DEFAULT_RETRIES
+    backoff: float = DEFAULT_BACKOFF
+    max_backoff: float = DEFAULT_MAX_BACKOFF
+
+    def delay(
+        self, attempt: int, retry_after: Optional[float] = None
+    ) -> Optional[float]:
+        """Get the time to wait before retrying a failed attempt.
+
+        Without a ``Retry-After`` hint, the delay is drawn uniformly from
+        zero to an exponentially growing ceiling, so that clients failing
+        together do not retry together.
+
+        Args:
+            attempt (int): The number of the failed attempt, from 0.
+            retry_after (float, optional): The delay asked for by the server.
+
+        Returns:
+            float: The delay in seconds, or None if the request should not
+                be retried.
+        """
+        if attempt >= self.retries:
+            return None
+        if retry_after is not None:
+            # Waiting longer than the backoff ceiling is not worth it
+            return retry_after if retry_after <= self.max_backoff else None
+        ceiling = min(self.max_backoff, self.backoff * 2**attempt)
+        return random.uniform(0, ceiling)  # noqa: S311
+
+
+def default_retry_policy() -> RetryPolicy:
+    """Get the retry policy configured from the environment.
+
+    Reads the number of retries from ``RFC_LOOKUP_RETRIES``, falling back to
+    the default when the variable is unset or not a valid integer. ``0``
+    disables retries.
+
+    Returns:
+        RetryPolicy: The retry policy.
+    """
+    value = os.environ.get(RETRIES_ENV)
+    if not value:
+        return RetryPolicy()
+
+    try:
+        return RetryPolicy(retries=max(int(value), 0))
+    except ValueError:
+        logger.debug("Ignoring invalid %s value %r", RETRIES_ENV, value)
+        return RetryPolicy()
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the rate of requests.
+
+    The bucket holds up to ``burst`` tokens and refills at ``rate`` tokens
+    per second. Each request takes a token, waiting for one if the bucket is
+    empty. Waiting requests reserve their token up front, so they are served
+    in the order they arrived.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = DEFAULT_MAX_WORKERS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate (float): Requests per second. ``0`` disables the limit.
+            burst (int): The number of requests allowed at once.
+            clock (Callable): Monotonic clock returning seconds.
+            sleep (Callable): Function waiting for a number of seconds.
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, waiting until one is available.
+
+        Returns:
+            float: The number of seconds waited.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._updated
+            self._updated = now
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+def default_rate_limit() -> float:
+    """Get the request rate limit.
+
+    Reads ``RFC_LOOKUP_RATE_LIMIT`` in requests per second. Requests are not
+    limited when the variable is unset, ``0`` or not a valid number.
+
+    Returns:
+        float: The rate limit in requests per second, ``0`` for none.
+    """
+    value = os.environ.get(RATE_LIMIT_ENV)
+    if not value:
+        return 0.0
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        logger.debug("Ignoring invalid %s value %r", RATE_LIMIT_ENV, value)
+        return 0.0
+
+
+_default_rate_limiter: Optional[TokenBucket] = None
+_default_rate_limiter_lock = threading.Lock()
+
+
+def get_default_rate_limiter() -> TokenBucket:
+    """Get the rate limiter shared by the package utility functions.
+
+    Returns:
+        TokenBucket: The shared rate limiter.
+    """
+    global _default_rate_limiter
+
+    with _default_rate_limiter_lock:
+        if _default_rate_limiter is None:
+            _default_rate_limiter = TokenBucket(default_rate_limit())
+        return _default_rate_limiter
@@ -0,0 +1,455 @@
+"""Module for searching RFC metadata offline.
+
+The search index maps every lower-cased word of an RFC's title, authors,
+status, stream and series identifiers (e.g. ``std5``) to the numbers of the
+RFCs containing it. Each postings list is stored as delta-encoded varints,
+so the index for the whole RFC series is small enough to load and query in
+milliseconds.
+"""
+
+import bisect
+import json
+import logging
+import re
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from rfc_lookup.cache import IndexCache, get_default_index_cache
+from rfc_lookup.constants import RFC_FILE_URL, RFC_INFO_URL
+from rfc_lookup.errors import NetworkError
+from rfc_lookup.filters import SearchFilters
+from rfc_lookup.index import (
+    RfcRecord,
+    get_rfc_index,
+    merge_records,
+    parse_rfc_index,
+)
+from rfc_lookup.utilities import get_latest_report_ids
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN = re.compile(r"[a-z0-9]+")
+SERIES_ID = re.compile(r"([a-z]+)0*(\d+)")
+MAGIC = b"RFCSRCH1"
+HEADER_LENGTH = struct.Struct(">I")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-cased search terms.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        list: The terms, in order of appearance.
+    """
+    return TOKEN.findall(text.lower())
+
+
+def encode_postings(numbers: Iterable[int], previous: int = 0) -> bytes:
+    """Encode ascending RFC numbers as delta varints.
+
+    Args:
+        numbers (Iterable[int]): The RFC numbers, in ascending order.
+        previous (int): The last number of the list being continued, if
+            the numbers are appended to an encoded list.
+
+    Returns:
+        bytes: The encoded postings list.
+    """
+    out = bytearray()
+    for number in numbers:
+        delta = number - previous
+        previous = number
+        while delta >= 0x80:
+            out.append(delta & 0x7F | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_postings(data: bytes) -> List[int]:
+    """Decode a postings list produced by :func:`encode_postings`.
+
+    Args:
+        data (bytes): The encoded postings list.
+
+    Returns:
+        list: The RFC numbers, in ascending order.
+    """
+    numbers: List[int] = []
+    previous = value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        numbers.append(previous)
+        value = shift = 0
+    return numbers
+
+
+def record_terms(record: RfcRecord) -> Set[str]:
+    """Get the search terms of an RFC record.
+
+    Args:
+        record (RfcRecord): The record to index.
+
+    Returns:
+        set: The terms from the title and metadata of the record.
+    """
+    terms = set(tokenize(record.title))
+    for author in record.authors:
+        terms.update(tokenize(author))
+    terms.update(tokenize(record.status))
+    terms.update(tokenize(record.stream))
+    for also in record.also:
+        # Index "STD0005" as both "std0005" and "std5"
+        terms.update(tokenize(also))
+        terms.update("".join(m) for m in SERIES_ID.findall(also.lower()))
+    terms.add(str(record.number))
+    return terms
+
+
+def _record_from_row(row: List[Any]) -> RfcRecord:
+    values: List[Any] = [tuple(v) if isinstance(v, list) else v for v in row]
+    return RfcRecord(*values)
+
+
+class SearchIndex:
+    """Inverted index over the titles and metadata of RFC records."""
+
+    def __init__(
+        self,
+        terms: List[str],
+        offsets: List[int],
+        postings: bytes,
+        records: List[RfcRecord],
+        source: Optional[str] = None,
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            terms (list): The sorted search terms.
+            offsets (list): The start of each term's postings in
+                ``postings``, followed by the total length.
+            postings (bytes): The concatenated encoded postings lists.
+            records (list): The indexed records.
+            source (str, optional): The version of the index text the index
+                was built from.
+        """
+        self.terms = terms
+        self.offsets = offsets
+        self.postings = postings
+        self.records = {record.number: record for record in records}
+        self.source = source
+
+    @classmethod
+    def build(
+        cls, records: Iterable[RfcRecord], source: Optional[str] = None
+    ) -> "SearchIndex":
+        """Build an index from RFC records.
+
+        Args:
+            records (Iterable[RfcRecord]): The records to index.
+            source (str, optional): The version of the index text the records
+                were parsed from.
+
+        Returns:
+            SearchIndex: The new index.
+        """
+        indexed = [record for record in records if record.issued]
+        postings: Dict[str, List[int]] = {}
+        for record in sorted(indexed, key=lambda r: r.number):
+            for term in record_terms(record):
+                postings.setdefault(term, []).append(record.number)
+
+        terms = sorted(postings)
+        offsets = [0]
+        data = bytearray()
+        for term in terms:
+            data += encode_postings(postings[term])
+            offsets.append(len(data))
+        return cls(terms, offsets, bytes(data), indexed, source)
+
+    def extend(
+        self, records: Iterable[RfcRecord], source: Optional[str] = None
+    ) -> "SearchIndex":
+        """Build an index with newly published RFCs added.
+
+        Only the postings of the terms of the new RFCs are re-encoded.
+
+        Args:
+            records (Iterable[RfcRecord]): The records to add, all numbered
+                above the RFCs already indexed.
+            source (str, optional): The version of the index text the
+                extended index matches.
+
+        Returns:
+            SearchIndex: The extended index.
+
+        Raises:
+            ValueError: If a record is not newer than the indexed RFCs.
+        """
+        latest_id = max(self.records, default=0)
+        added = sorted(records, key=lambda r: r.number)
+        if added and added[0].number <= latest_id:
+            raise ValueError(f"RFC {added[0].number} is already indexed")
+
+        indexed = [record for record in added if record.issued]
+        postings: Dict[str, List[int]] = {}
+        for record in indexed:
+            for term in record_terms(record):
+                postings.setdefault(term, []).append(record.number)
+
+        positions = {term: i for i, term in enumerate(self.terms)}
+        terms = sorted(positions.keys() | postings.keys())
+        offsets = [0]
+        data = bytearray()
+        for term in terms:
+            existing = self._postings_at(positions.get(term))
+            data += existing
+            if term in postings:
+                # Continue the deltas from the last RFC already listed
+                last = decode_postings(existing)[-1] if existing else 0
+                data += encode_postings(postings[term], previous=last)
+            offsets.append(len(data))
+
+        merged = dict(self.records)
+        merge_records(merged, indexed)
+        return SearchIndex(
+            terms, offsets, bytes(data), list(merged.values()), source
+        )
+
+    def _postings_at(self, i: Optional[int]) -> bytes:
+        if i is None:
+            return b""
+        return self.postings[self.offsets[i] : self.offsets[i + 1]]
+
+    def to_bytes(self) -> bytes:
+        """Serialize the index.
+
+        Returns:
+            bytes: The serialized index.
+        """
+        header = json.dumps(
+            {
+                "source": self.source,
+                "terms": self.terms,
+                "offsets": self.offsets,
+                "records": [
+                    [getattr(record, name) for name in RfcRecord.__slots__]
+                    for record in self.records.values()
+                ],
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        return MAGIC + HEADER_LENGTH.pack(len(header)) + header + self.postings
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SearchIndex":
+        """Load an index serialized with :meth:`to_bytes`.
+
+        Args:
+            data (bytes): The serialized index.
+
+        Returns:
+            SearchIndex: The loaded index.
+
+        Raises:
+            ValueError: If the data is not a valid search index.
+        """
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a search index")
+
+        start = len(MAGIC) + HEADER_LENGTH.size
+        try:
+            (length,) = HEADER_LENGTH.unpack_from(data, len(MAGIC))
+            header = json.loads(data[start : start + length])
+            records = [_record_from_row(row) for row in header["records"]]
+            return cls(
+                header["terms"],
+                header["offsets"],
+                data[start + length :],
+                records,
+                header["source"],
+            )
+        except (struct.error, KeyError, TypeError) as exc:
+            raise ValueError(f"Invalid search index: {exc}") from exc
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        numbers: Set[int] = set()
+        first = bisect.bisect_left(self.terms, prefix)
+        for i in range(first, len(self.terms)):
+            if not self.terms[i].startswith(prefix):
+                break
+            numbers.update(decode_postings(self._postings_at(i)))
+        return numbers
+
+    def search(self, query: str) -> List[RfcRecord]:
+        """Find the RFCs matching every word of a query.
+
+        Each query word matches any term it is a prefix of, so ``crypto``
+        finds "Cryptographic" and ``tls`` finds "TLS".
+
+        Args:
+            query (str): The words to search for.
+
+        Returns:
+            list: The matching records, sorted by RFC number.
+        """
+        matches: Optional[Set[int]] = None
+        for word in sorted(set(tokenize(query)), key=len, reverse=True):
+            numbers = self._prefix_matches(word)
+            matches = numbers if matches is None else matches & numbers
+            if not matches:
+                return []
+        return [self.records[number] for number in sorted(matches or ())]
+
+
+def _load_search_index(cache: IndexCache) -> Optional[SearchIndex]:
+    data = cache.load_search()
+    if data is None:
+        return None
+    try:
+        return SearchIndex.from_bytes(data)
+    except ValueError as exc:
+        logger.debug("Ignoring unreadable search index: %s", exc)
+        return None
+
+
+def _build_search_index(
+    cache: IndexCache, records: Iterable[RfcRecord]
+) -> SearchIndex:
+    index = SearchIndex.build(records, source=cache.content_version())
+    cache.save_search(index.to_bytes())
+    return index
+
+
+def _extend_search_index(
+    cache: IndexCache, stored: SearchIndex, version: Optional[str]
+) -> Optional[SearchIndex]:
+    state = cache.load()
+    if state is None or state.delta is None or stored.source is None:
+        return None
+    if state.delta_source != stored.source:
+        return None
+    try:
+        index = stored.extend(parse_rfc_index(state.delta), source=version)
+    except ValueError as exc:
+        logger.debug("Rebuilding the search index: %s", exc)
+        return None
+    cache.save_search(index.to_bytes())
+    return index
+
+
+def get_search_index(cache: Optional[IndexCache] = None) -> SearchIndex:
+    """Get the offline search index, updating it if the RFC index changed.
+
+    If the RFC index only gained new RFCs since the search index was built,
+    they are parsed and added on their own. Otherwise the search index is
+    rebuilt from the whole RFC index.
+
+    The RFC index is refreshed as for
+    :func:`rfc_lookup.utilities.get_latest_report_ids`. If that fails, the
+    stored search index or index text is used instead, so searches keep
+    working without network access.
+
+    Args:
+        cache (IndexCache, optional): The index cache to use. Defaults to the
+            cache configured from the environment.
+
+    Returns:
+        SearchIndex: The search index.
+
+    Raises:
+        NetworkError: If the RFC index cannot be fetched and there is no
+            local copy to search.
+    """
+    if cache is None:
+        cache = get_default_index_cache()
+
+    stored = _load_search_index(cache)
+    try:
+        get_latest_report_ids(cache)
+    except NetworkError:
+        if stored is not None:
+            logger.debug("Searching the stored index offline")
+            return stored
+        content = cache.load_content()
+        if content is None:
+            raise
+        return _build_search_index(cache, parse_rfc_index(content))
+
+    version = cache.content_version()
+    if stored is not None and version and stored.source == version:
+        return stored
+
+    if stored is not None:
+        extended = _extend_search_index(cache, stored, version)
+        if extended is not None:
+            return extended
+    return _build_search_index(cache, get_rfc_index(cache))
+
+
+def record_result(record: RfcRecord) -> Dict[str, Any]:
+    """Convert a record into a result dict of the RFC editor search.
+
+    Args:
+        record (RfcRecord): The matching record.
+
+    Returns:
+        dict: A result with the same keys as
+            :func:`rfc_lookup.utilities.search_rfc_editor` results.
+    """
+    relations = [
+        (label, numbers)
+        for label, numbers in (
+            ("Obsoletes", record.obsoletes),
+            ("Obsoleted by", record.obsoleted_by),
+            ("Updates", record.updates),
+            ("Updated by", record.updated_by),
+        )
+        if numbers
+    ]
+    return {
+        "id": record.number,
+        "link": RFC_INFO_URL.format(id=record.number),
+        "files": {
+            fmt: RFC_FILE_URL.format(id=record.number, ext=fmt.lower())
+            for fmt in record.formats
+        },
+        "title": record.title,
+        "authors": list(record.authors),
+        "publication_date": record.date,
+        "more_info": ", ".join(
+            f"{label} " + ", ".join(f"RFC {n}" for n in numbers)
+            for label, numbers in relations
+        ),
+        "status": record.status.title(),
+    }
+
+
+def search_local(
+    value: str,
+    cache: Optional[IndexCache] = None,
+    filters: Optional[SearchFilters] = None,
+) -> List[Dict[str, Any]]:
+    """Search the offline index for RFCs by title and metadata keywords.
+
+    Args:
+        value (str): The words to search for.
+        cache (IndexCache, optional): The index cache to use. Defaults to the
+            cache configured from the environment.
+        filters (SearchFilters, optional): The filters, order and limit to
+            apply to the results.
+
+    Returns:
+        list: A list of dicts with the same keys as
+            :func:`rfc_lookup.utilities.search_rfc_editor` results.
+    """
+    records = get_search_index(cache).search(value)
+    results = [record_result(record) for record in records]
+    return filters.apply(results) if filters is not None else results
@@ -0,0 +1,407 @@
+"""Module for the local RFC lookup server.
+
+``rfc serve`` runs :class:`RfcServer`, a threaded HTTP server that keeps the
+RFC index, the offline search index and recently read RFCs in memory, and
+keeps its connections to the RFC Editor open between requests. While it is
+running, the CLI finds it through a file in the cache directory and sends
+its lookups there instead of starting from a cold process.
+
+The server answers ``GET`` requests with JSON documents:
+
+``/rfc/{id}``
+    ``{"id": 8446, "text": "..."}`` with the plain-text RFC.
+``/search?q={query}[&online=1][&status=...][&since=YYYY-MM]...``
+    ``{"query": "tls", "results": [...]}`` with results shaped as those of
+    :func:`rfc_lookup.utilities.search_rfc_editor`, filtered as given by
+    :meth:`rfc_lookup.filters.SearchFilters.query`.
+``/index``
+    ``{"ids": [1, 2, ...]}`` with the RFC IDs of the latest RFC index.
+``/valid/{id}``
+    ``{"id": 8446, "valid": true}`` if the RFC was issued, checked as by
+    :func:`rfc_lookup.utilities.validate_report_id`.
+
+Errors are ``{"error": "...", "type": "..."}`` documents. Identical upstream
+fetches in flight at the same time are made once, and responses carry
+``Cache-Control`` and ``ETag`` headers so clients can cache and revalidate
+them.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from rfc_lookup.cache import (
+    DiskCache,
+    IndexCache,
+    get_default_cache,
+    get_default_index_cache,
+)
+from rfc_lookup.client import server_file_path
+from rfc_lookup.constants import DEFAULT_SERVER_MEMORY_SIZE
+from rfc_lookup.errors import InvalidRfcIdError, NetworkError
+from rfc_lookup.filters import SearchFilters
+from rfc_lookup.search import SearchIndex, get_search_index, record_result
+from rfc_lookup.singleflight import SingleFlight
+from rfc_lookup.utilities import (
+    get_latest_report_ids,
+    get_report_id_bitset,
+    get_rfc_report,
+    search_rfc_editor,
+)
+
+
+logger = logging.getLogger(__name__)
+
+RFC_PATH = re.compile(r"/rfc/(\d+)")
+VALID_PATH = re.compile(r"/valid/(\d+)")
+# Published RFCs never change
+RFC_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class MemoryCache:
+    """Thread-safe LRU of RFC documents, bounded by their total size."""
+
+    def __init__(self, max_size: int = DEFAULT_SERVER_MEMORY_SIZE) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size (int): Maximum total size of the documents, in bytes.
+        """
+        self.max_size = max_size
+        self.size = 0
+        self._entries: "OrderedDict[int, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: int) -> Optional[str]:
+        """Get a document, marking it as recently used.
+
+        Args:
+            key (int): The RFC number.
+
+        Returns:
+            str: The document, or None if it is not cached.
+        """
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+            return text
+
+    def set(self, key: int, text: str) -> None:
+        """Add a document, evicting the least recently used ones.
+
+        Args:
+            key (int): The RFC number.
+            text (str): The document.
+        """
+        if len(text) > self.max_size:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = text
+            self.size += len(text)
+            while self.size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class RfcServer(ThreadingHTTPServer):
+    """HTTP server answering RFC lookups from memory where it can."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        cache: Optional[DiskCache] = None,
+        index_cache: Optional[IndexCache] = None,
+        memory_size: int = DEFAULT_SERVER_MEMORY_SIZE,
+    ) -> None:
+        """Initialize the server and bind its socket.
+
+        Args:
+            address (tuple): The host and port to listen on. Port 0 picks a
+                free port.
+            cache (DiskCache, optional): The cache of RFC documents. Defaults
+                to the cache configured from the environment.
+            index_cache (IndexCache, optional): The cache of the RFC index.
+                Defaults to the cache configured from the environment.
+            memory_size (int): Maximum size of the RFC documents kept in
+                memory, in bytes.
+        """
+        super().__init__(address, RfcRequestHandler)
+        self.cache = cache if cache is not None else get_default_cache()
+        self.index_cache = (
+            index_cache
+            if index_cache is not None
+            else get_default_index_cache()
+        )
+        self.documents = MemoryCache(memory_size)
+        self.flights = SingleFlight()
+        self._search_index: Optional[SearchIndex] = None
+        self._search_checked = 0.0
+        self._search_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def get_rfc_report(self, report_id: int) -> str:
+        """Get an RFC document, from memory if it was read recently.
+
+        Args:
+            report_id (int): The RFC number to retrieve.
+
+        Returns:
+            str: The plain-text RFC document.
+        """
+        text = self.documents.get(report_id)
+        if text is None:
+            text = self.flights.do(
+                ("rfc", report_id), lambda: self._load_rfc_report(report_id)
+            )
+        return text
+
+    def _load_rfc_report(self, report_id: int) -> str:
+        text = get_rfc_report(report_id, self.cache)
+        self.documents.set(report_id, text)
+        return text
+
+    def get_latest_report_ids(self) -> List[int]:
+        """Get the RFC IDs of the latest RFC index.
+
+        Returns:
+            list: The RFC IDs, in ascending order.
+        """
+        return self.flights.do(
+            ("index",), lambda: get_latest_report_ids(self.index_cache)
+        )
+
+    def validate_report_id(self, report_id: int) -> None:
+        """Check that an RFC exists.
+
+        Args:
+            report_id (int): The RFC number to check.
+        """
+        get_report_id_bitset(self.index_cache).check(report_id)
+
+    def search_index(self) -> SearchIndex:
+        """Get the offline search index, checking it once per index TTL.
+
+        Returns:
+            SearchIndex: The search index.
+        """
+        with self._search_lock:
+            age = time.monotonic() - self._search_checked
+            if self._search_index is None or age >= self.index_cache.ttl:
+                self._search_index = get_search_index(self.index_cache)
+                self._search_checked = time.monotonic()
+            return self._search_index
+
+    def search(
+        self,
+        value: str,
+        online: bool = False,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search for RFCs.
+
+        Args:
+            value (str): The words to search for.
+            online (bool): Query the RFC Editor instead of the local index.
+            filters (SearchFilters, optional): The filters of the search.
+
+        Returns:
+            list: The search results.
+        """
+        filters = filters or SearchFilters()
+        if online:
+            return self.flights.do(
+                ("search", value, filters),
+                lambda: search_rfc_editor(value, filters),
+            )
+        records = self.search_index().search(value)
+        return filters.apply(record_result(r) for r in records)
+
+    def warm(self) -> None:
+        """Load the RFC index and the search index into memory."""
+        try:
+            self.search_index()
+        except NetworkError as exc:
+            logger.warning("Unable to load the RFC index: %s", exc)
+
+    def run(self) -> None:
+        """Serve requests until interrupted, announcing the server meanwhile.
+
+        The URL is written to the server file in the cache directory so
+        that the CLI can find the server, and removed again on shutdown.
+        """
+        self.warm()
+        path = server_file_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"url": self.url, "pid": os.getpid()}), encoding="utf-8"
+        )
+        try:
+            self.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server_close()
+            _remove_server_file(self.url)
+
+
+def _remove_server_file(url: str) -> None:
+    path = server_file_path()
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    # Leave the file alone if another server has replaced it since
+    if isinstance(data, dict) and data.get("url") == url:
+        path.unlink()
+
+
+class RequestError(Exception):
+    """Raised by a request handler to respond with an HTTP error."""
+
+    def __init__(self, status: int, message: str, kind: str) -> None:
+        """Initialize the error.
+
+        Args:
+            status (int): The HTTP status code.
+            message (str): The error message.
+            kind (str): The error type reported to the client.
+        """
+        super().__init__(status, message, kind)
+        self.status = status
+        self.message = message
+        self.kind = kind
+
+
+class RfcRequestHandler(BaseHTTPRequestHandler):
+    """Handler for the JSON API of :class:`RfcServer`."""
+
+    server: RfcServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Answer a lookup with a JSON document."""
+        parsed = urllib.parse.urlsplit(self.path)
+        params = dict(urllib.parse.parse_qsl(parsed.query))
+        try:
+            data, cache_control = self.route(parsed.path, params)
+        except InvalidRfcIdError as exc:
+            self.send_error_json(404, str(exc), "invalid_rfc_id")
+        except NetworkError as exc:
+            self.send_error_json(502, str(exc), "network_error")
+        except RequestError as exc:
+            self.send_error_json(exc.status, exc.message, exc.kind)
+        else:
+            self.send_json(200, data, cache_control)
+
+    def route(
+        self, path: str, params: Dict[str, str]
+    ) -> Tuple[Dict[str, Any], str]:
+        """Run the lookup for a request path.
+
+        Args:
+            path (str): The request path.
+            params (dict): The query parameters.
+
+        Returns:
+            tuple: The response data and its ``Cache-Control`` header.
+
+        Raises:
+            RequestError: If the request is invalid.
+        """
+        # Index-based answers may change once the index is revalidated
+        fresh = f"max-age={int(self.server.index_cache.ttl)}"
+
+        if path == "/index":
+            return {"ids": self.server.get_latest_report_ids()}, fresh
+
+        if path == "/search":
+            query = params.get("q", "").strip()
+            if not query:
+                raise RequestError(
+                    400, "Missing query parameter 'q'", "bad_request"
+                )
+            online = params.get("online") == "1"
+            try:
+                filters = SearchFilters.from_query(params)
+            except ValueError as exc:
+                raise RequestError(400, str(exc), "bad_request") from None
+            results = self.server.search(query, online, filters)
+            return {"query": query, "results": results}, fresh
+
+        match = VALID_PATH.fullmatch(path)
+        if match:
+            report_id = int(match.group(1))
+            self.server.validate_report_id(report_id)
+            return {"id": report_id, "valid": True}, fresh
+
+        match = RFC_PATH.fullmatch(path)
+        if match:
+            report_id = int(match.group(1))
+            text = self.server.get_rfc_report(report_id)
+            return {"id": report_id, "text": text}, RFC_CACHE_CONTROL
+
+        raise RequestError(404, f"Unknown path {path!r}", "not_found")
+
+    def send_json(
+        self, status: int, data: Dict[str, Any], cache_control: str
+    ) -> None:
+        """Send a JSON response, or 304 if the client has it already.
+
+        Args:
+            status (int): The HTTP status code.
+            data (dict): The response data.
+            cache_control (str): The ``Cache-Control`` header.
+        """
+        body = json.dumps(data).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        not_modified = etag in self.headers.get("If-None-Match", "")
+        self.send_response(304 if not_modified else status)
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("ETag", etag)
+        if not_modified:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status: int, message: str, kind: str) -> None:
+        """Send a JSON error response that must not be cached.
+
+        Args:
+            status (int): The HTTP status code.
+            message (str): The error message.
+            kind (str): The error type reported to the client.
+        """
+        body = json.dumps({"error": message, "type": kind}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests through the module logger instead of stderr."""
+        logger.info("%s - %s", self.address_string(), format % args)
@@ -0,0 +1,66 @@
+"""Module for coalescing concurrent identical calls.
+
+When several threads ask for the same thing at once, :class:`SingleFlight`
+runs the call in the first thread only and hands its result, or its
+exception, to the others once it finishes.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar, cast
+
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Run a call once for all the concurrent callers with the same key."""
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run a call, or wait for the identical call already in flight.
+
+        Args:
+            key (Hashable): Identifies the call.
+            fn (Callable): The call to run.
+
+        Returns:
+            Any: The result of the call.
+
+        Raises:
+            BaseException: Whatever the call raised, in every waiting thread.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return cast(T, call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return cast(T, call.result)
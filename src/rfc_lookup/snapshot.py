@@ -0,0 +1,376 @@
+"""Module for the compiled, memory-mapped snapshot of the RFC index.
+
+``rfc index build`` compiles the records of the RFC index into a flat binary
+file that is memory-mapped instead of parsed, so it loads in microseconds
+and its pages are shared by every process reading it. After a header, the
+file holds arrays of native unsigned 32-bit integers:
+
+* the sorted RFC numbers,
+* the title, date, status, stream and DOI of each RFC, as indexes into the
+  string pool,
+* an offset table delimiting the authors, formats, "Also" identifiers and
+  related RFC numbers of each RFC in a shared value array,
+* the value array itself,
+* the offsets of each string in the pool,
+
+followed by the interned UTF-8 string pool and a
+:class:`~rfc_lookup.validity.ReportIdBitset` of the issued RFC numbers.
+"""
+
+import bisect
+import logging
+import mmap
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from rfc_lookup.cache import IndexCache, get_default_index_cache
+from rfc_lookup.index import (
+    RfcRecord,
+    get_rfc_index,
+    merge_records,
+    parse_rfc_index,
+)
+from rfc_lookup.validity import ReportIdBitset
+
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"RFCSNAP2"
+# Byte order, record count, string count, value count, pool and source size
+HEADER = struct.Struct("<cxxxIIIII")
+TEXT_FIELDS = ("title", "date", "status", "stream", "doi")
+STRING_LIST_FIELDS = ("authors", "formats", "also")
+NUMBER_LIST_FIELDS = ("obsoletes", "obsoleted_by", "updates", "updated_by")
+LIST_FIELDS = STRING_LIST_FIELDS + NUMBER_LIST_FIELDS
+BYTE_ORDER = sys.byteorder[0].encode("ascii")
+ITEM_SIZE = array("I").itemsize
+
+
+def _padded(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % ITEM_SIZE)
+
+
+def build_snapshot(
+    records: Iterable[RfcRecord], source: Optional[str] = None
+) -> bytes:
+    """Compile RFC records into a snapshot.
+
+    Args:
+        records (Iterable[RfcRecord]): The records to compile.
+        source (str, optional): The version of the index text the records
+            were parsed from.
+
+    Returns:
+        bytes: The compiled snapshot.
+    """
+    strings: Dict[str, int] = {}
+    ids = array("I")
+    texts = array("I")
+    offsets = array("I", [0])
+    values = array("I")
+    not_issued = set()
+
+    for record in sorted(records, key=lambda r: r.number):
+        ids.append(record.number)
+        if not record.issued:
+            not_issued.add(record.number)
+        for name in TEXT_FIELDS:
+            texts.append(
+                strings.setdefault(getattr(record, name), len(strings))
+            )
+        for name in STRING_LIST_FIELDS:
+            values.extend(
+                strings.setdefault(item, len(strings))
+                for item in getattr(record, name)
+            )
+            offsets.append(len(values))
+        for name in NUMBER_LIST_FIELDS:
+            values.extend(getattr(record, name))
+            offsets.append(len(values))
+
+    encoded = [string.encode("utf-8") for string in strings]
+    string_offsets = array("I", [0])
+    for item in encoded:
+        string_offsets.append(string_offsets[-1] + len(item))
+    pool = b"".join(encoded)
+    source_bytes = (source or "").encode("utf-8")
+    latest_id = ids[-1] if ids else 0
+    # Numbers missing from the index are taken as issued, as when checking
+    # against the cached index state
+    bitset = ReportIdBitset.from_ids(
+        (n for n in range(1, latest_id + 1) if n not in not_issued), latest_id
+    )
+
+    header = HEADER.pack(
+        BYTE_ORDER,
+        len(ids),
+        len(encoded),
+        len(values),
+        len(pool),
+        len(source_bytes),
+    )
+    return b"".join(
+        (
+            MAGIC,
+            header,
+            _padded(source_bytes),
+            ids.tobytes(),
+            texts.tobytes(),
+            offsets.tobytes(),
+            values.tobytes(),
+            string_offsets.tobytes(),
+            pool,
+            bytes(bitset.bits),
+        )
+    )
+
+
+class IndexSnapshot:
+    """Read-only view of a compiled snapshot of the RFC index."""
+
+    def __init__(self, data: Union[bytes, mmap.mmap]) -> None:
+        """Initialize the view without copying the data.
+
+        Args:
+            data (bytes): The compiled snapshot, typically memory-mapped.
+
+        Raises:
+            ValueError: If the data is not a snapshot compiled on a machine
+                with the same byte order.
+        """
+        view = memoryview(data)
+        if bytes(view[: len(MAGIC)]) != MAGIC:
+            raise ValueError("Not an index snapshot")
+        try:
+            order, count, strings, values, pool, source = HEADER.unpack_from(
+                view, len(MAGIC)
+            )
+        except struct.error as exc:
+            raise ValueError(f"Invalid index snapshot: {exc}") from exc
+        if order != BYTE_ORDER:
+            raise ValueError("Index snapshot has a different byte order")
+
+        position = len(MAGIC) + HEADER.size
+        source_end = position + source
+        self.source: Optional[str] = (
+            bytes(view[position:source_end]).decode("utf-8") or None
+        )
+        position = source_end + (-source % ITEM_SIZE)
+
+        lengths = (
+            count,
+            count * len(TEXT_FIELDS),
+            count * len(LIST_FIELDS) + 1,
+            values,
+            strings + 1,
+        )
+        if position + sum(lengths) * ITEM_SIZE + pool > len(view):
+            raise ValueError("Truncated index snapshot")
+
+        sections: List[memoryview] = []
+        for length in lengths:
+            end = position + length * ITEM_SIZE
+            sections.append(view[position:end].cast("I"))
+            position = end
+
+        self.ids = sections[0]
+        self._texts, self._offsets, self._values, self._strings = sections[1:]
+        self._pool = view[position : position + pool]
+        position += pool
+        bits_size = self.latest_id // 8 + 1
+        if position + bits_size > len(view):
+            raise ValueError("Truncated index snapshot")
+        bits = view[position : position + bits_size]
+        self.issued = ReportIdBitset(bits, self.latest_id)
+
+    @classmethod
+    def open(cls, path: Path) -> "IndexSnapshot":
+        """Memory-map a snapshot file.
+
+        Args:
+            path (Path): The snapshot file.
+
+        Returns:
+            IndexSnapshot: The mapped snapshot.
+        """
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        """Get the number of RFCs in the snapshot."""
+        return len(self.ids)
+
+    def __contains__(self, number: object) -> bool:
+        """Check whether an RFC number is listed in the index."""
+        return isinstance(number, int) and self._position(number) is not None
+
+    @property
+    def latest_id(self) -> int:
+        """The highest RFC number in the index, 0 if it is empty."""
+        return self.ids[-1] if len(self.ids) else 0
+
+    def _position(self, number: int) -> Optional[int]:
+        i = bisect.bisect_left(self.ids, number)
+        if i < len(self.ids) and self.ids[i] == number:
+            return i
+        return None
+
+    def _string(self, index: int) -> str:
+        start, end = self._strings[index], self._strings[index + 1]
+        return bytes(self._pool[start:end]).decode("utf-8")
+
+    def _record(self, i: int) -> RfcRecord:
+        text = self._texts[i * len(TEXT_FIELDS) : (i + 1) * len(TEXT_FIELDS)]
+        first = i * len(LIST_FIELDS)
+        lists = [
+            self._values[self._offsets[k] : self._offsets[k + 1]]
+            for k in range(first, first + len(LIST_FIELDS))
+        ]
+        authors, formats, also = (
+            tuple(self._string(s) for s in items)
+            for items in lists[: len(STRING_LIST_FIELDS)]
+        )
+        obsoletes, obsoleted_by, updates, updated_by = (
+            tuple(items.tolist()) for items in lists[len(STRING_LIST_FIELDS) :]
+        )
+        title, date, status, stream, doi = (self._string(s) for s in text)
+        return RfcRecord(
+            number=self.ids[i],
+            title=title,
+            authors=authors,
+            date=date,
+            status=status,
+            stream=stream,
+            formats=formats,
+            obsoletes=obsoletes,
+            obsoleted_by=obsoleted_by,
+            updates=updates,
+            updated_by=updated_by,
+            also=also,
+            doi=doi,
+        )
+
+    def record(self, number: int) -> Optional[RfcRecord]:
+        """Get the record of an RFC.
+
+        Args:
+            number (int): The RFC number.
+
+        Returns:
+            RfcRecord: The record, or None if the number is not in the index.
+        """
+        i = self._position(number)
+        return None if i is None else self._record(i)
+
+    def records(self) -> Iterator[RfcRecord]:
+        """Iterate over all the records, sorted by RFC number.
+
+        Yields:
+            RfcRecord: Each record.
+        """
+        for i in range(len(self.ids)):
+            yield self._record(i)
+
+
+_snapshots: Dict[Path, IndexSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def _compile(cache: IndexCache, records: Iterable[RfcRecord]) -> IndexSnapshot:
+    data = build_snapshot(records, source=cache.content_version())
+    cache.save_snapshot(data)
+    return IndexSnapshot(data)
+
+
+def _extend_snapshot(
+    cache: IndexCache, snapshot: IndexSnapshot
+) -> Optional[IndexSnapshot]:
+    # Only the RFCs added since the snapshot was compiled need parsing
+    state = cache.load()
+    if state is None or state.delta is None or snapshot.source is None:
+        return None
+    if state.delta_source != snapshot.source:
+        return None
+    records = {record.number: record for record in snapshot.records()}
+    merge_records(records, parse_rfc_index(state.delta))
+    return _compile(cache, records.values())
+
+
+def _load_snapshot(cache: IndexCache, version: str) -> Optional[IndexSnapshot]:
+    try:
+        snapshot = IndexSnapshot.open(cache.snapshot_path)
+    except OSError:
+        return None
+    except ValueError as exc:
+        logger.debug("Rebuilding unreadable index snapshot: %s", exc)
+    else:
+        if snapshot.source == version:
+            return snapshot
+
+        extended = _extend_snapshot(cache, snapshot)
+        if extended is not None:
+            return extended
+
+    content = cache.load_content()
+    if content is None:
+        return None
+    return _compile(cache, parse_rfc_index(content))
+
+
+def get_index_snapshot(
+    cache: Optional[IndexCache] = None,
+) -> Optional[IndexSnapshot]:
+    """Get the snapshot of the stored RFC index, if one was built.
+
+    Snapshots are only used once :func:`build_index_snapshot` has compiled
+    one. After that, a snapshot that no longer matches the stored index text
+    is recompiled from the text, without any network access. Mapped
+    snapshots are reused for the life of the process.
+
+    Args:
+        cache (IndexCache, optional): The index cache to use. Defaults to the
+            cache configured from the environment.
+
+    Returns:
+        IndexSnapshot: The snapshot, or None if there is none.
+    """
+    if cache is None:
+        cache = get_default_index_cache()
+
+    version = cache.content_version()
+    if version is None:
+        return None
+
+    with _snapshots_lock:
+        snapshot = _snapshots.get(cache.snapshot_path)
+        if snapshot is None or snapshot.source != version:
+            snapshot = _load_snapshot(cache, version)
+            if snapshot is None:
+                return None
+            _snapshots[cache.snapshot_path] = snapshot
+        return snapshot
+
+
+def build_index_snapshot(cache: Optional[IndexCache] = None) -> IndexSnapshot:
+    """Compile the latest RFC index into a snapshot and store it.
+
+    The index is refreshed as for :func:`rfc_lookup.index.get_rfc_index`.
+
+    Args:
+        cache (IndexCache, optional): The index cache to use. Defaults to the
+            cache configured from the environment.
+
+    Returns:
+        IndexSnapshot: The new snapshot.
+    """
+    if cache is None:
+        cache = get_default_index_cache()
+
+    snapshot = _compile(cache, get_rfc_index(cache))
+    with _snapshots_lock:
+        _snapshots[cache.snapshot_path] = snapshot
+    return snapshot
@@ -0,0 +1,520 @@
+"""Module for the SQLite store of RFC metadata.
+
+:class:`MetadataStore` keeps the records of the RFC index in an SQLite
+database, with indexed status and publication month columns, a table of
+obsoletes and updates relations indexed in both directions, and an FTS5
+full-text index over titles, authors and metadata keywords. Filtered,
+sorted and limited searches then run as a single query, and any number of
+threads can read the store at once.
+
+The store is an optional alternative to the in-memory
+:class:`rfc_lookup.search.SearchIndex`. It is built on first use and kept
+up to date with the RFC index like the other local indexes.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from rfc_lookup.cache import IndexCache, get_default_index_cache
+from rfc_lookup.errors import NetworkError, StoreError
+from rfc_lookup.filters import SearchFilters, parse_month
+from rfc_lookup.index import (
+    RfcRecord,
+    get_rfc_index,
+    merge_records,
+    parse_rfc_index,
+)
+from rfc_lookup.search import record_result, record_terms, tokenize
+from rfc_lookup.utilities import get_latest_report_ids
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = "1"
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE rfcs (
+    number INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    authors TEXT NOT NULL,
+    date TEXT NOT NULL,
+    month INTEGER,
+    status TEXT NOT NULL,
+    status_key TEXT NOT NULL,
+    stream TEXT NOT NULL,
+    formats TEXT NOT NULL,
+    obsoletes TEXT NOT NULL,
+    obsoleted_by TEXT NOT NULL,
+    updates TEXT NOT NULL,
+    updated_by TEXT NOT NULL,
+    also TEXT NOT NULL,
+    doi TEXT NOT NULL
+);
+CREATE INDEX rfcs_status ON rfcs (status_key);
+CREATE INDEX rfcs_month ON rfcs (month);
+CREATE TABLE relations (
+    number INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    other INTEGER NOT NULL
+);
+CREATE INDEX relations_number ON relations (number, kind);
+CREATE INDEX relations_other ON relations (other, kind);
+CREATE VIRTUAL TABLE rfc_text USING fts5 (
+    title, authors, keywords, content='', prefix='2 3'
+);
+"""
+# Record fields stored as JSON arrays, in column order
+LIST_FIELDS = (
+    "authors",
+    "formats",
+    "obsoletes",
+    "obsoleted_by",
+    "updates",
+    "updated_by",
+    "also",
+)
+RFC_FIELDS = set(RfcRecord.__slots__)
+SORT_COLUMNS = {
+    "number": "r.number",
+    "title": "lower(r.title), r.number",
+    "date": "r.month, r.number",
+}
+
+
+def _month_number(year_month: Optional[Tuple[int, int]]) -> Optional[int]:
+    if year_month is None:
+        return None
+    return year_month[0] * 12 + year_month[1] - 1
+
+
+def _record_row(record: RfcRecord) -> Tuple[Any, ...]:
+    return (
+        record.number,
+        record.title,
+        json.dumps(record.authors),
+        record.date,
+        _month_number(parse_month(record.date)),
+        record.status,
+        record.status.lower(),
+        record.stream,
+        json.dumps(record.formats),
+        json.dumps(record.obsoletes),
+        json.dumps(record.obsoleted_by),
+        json.dumps(record.updates),
+        json.dumps(record.updated_by),
+        json.dumps(record.also),
+        record.doi,
+    )
+
+
+def _row_record(row: sqlite3.Row) -> RfcRecord:
+    values = {key: row[key] for key in row.keys() if key in RFC_FIELDS}
+    for key in LIST_FIELDS:
+        values[key] = tuple(json.loads(values[key]))
+    return RfcRecord(**values)
+
+
+def _match_expression(text: str, column: Optional[str] = None) -> str:
+    # Lower-cased letters and digits are valid FTS5 barewords
+    terms = " ".join(f"{term}*" for term in tokenize(text))
+    if column is None or not terms:
+        return terms
+    return f"{column} : ({terms})"
+
+
+class MetadataStore:
+    """SQLite database of RFC records with a full-text index.
+
+    Each thread reads through its own connection. Rebuilding the store
+    writes a new database and moves it into place, so readers never see a
+    half-built store.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the store.
+
+        Args:
+            path (Path): The database file.
+        """
+        self.path = path
+        self._local = threading.local()
+        self._generation = 0
+        self._write_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is not None and self._local.generation == self._generation:
+            return conn
+        if conn is not None:
+            conn.close()
+
+        try:
+            conn = sqlite3.connect(
+                f"{self.path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+        except sqlite3.Error as exc:
+            raise StoreError(f"Unable to open {self.path}: {exc}") from None
+        conn.row_factory = sqlite3.Row
+        self._local.conn = conn
+        self._local.generation = self._generation
+        return conn
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> List[sqlite3.Row]:
+        try:
+            return self._connection().execute(sql, tuple(params)).fetchall()
+        except sqlite3.Error as exc:
+            raise StoreError(f"Unable to read {self.path}: {exc}") from None
+
+    @property
+    def source(self) -> Optional[str]:
+        """The version of the index text the store was built from."""
+        if not self.path.exists():
+            return None
+        try:
+            rows = self._query("SELECT key, value FROM meta")
+        except StoreError as exc:
+            logger.debug("Ignoring unreadable metadata store: %s", exc)
+            return None
+        meta = {row["key"]: row["value"] for row in rows}
+        if meta.get("schema") != SCHEMA_VERSION:
+            return None
+        return meta.get("source")
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, records: List[RfcRecord]) -> None:
+        conn.executemany(
+            f"INSERT OR REPLACE INTO rfcs VALUES ({', '.join('?' * 15)})",
+            [_record_row(record) for record in records],
+        )
+        conn.executemany(
+            "DELETE FROM relations WHERE number = ?",
+            [(record.number,) for record in records],
+        )
+        conn.executemany(
+            "INSERT INTO relations VALUES (?, ?, ?)",
+            [
+                (record.number, kind, other)
+                for record in records
+                for kind in ("obsoletes", "updates")
+                for other in getattr(record, kind)
+            ],
+        )
+
+    @staticmethod
+    def _index_text(
+        conn: sqlite3.Connection, records: Iterable[RfcRecord]
+    ) -> None:
+        conn.executemany(
+            "INSERT INTO rfc_text (rowid, title, authors, keywords) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (
+                    record.number,
+                    record.title,
+                    " ".join(record.authors),
+                    " ".join(sorted(record_terms(record))),
+                )
+                for record in records
+                if record.issued
+            ],
+        )
+
+    def build(
+        self, records: Iterable[RfcRecord], source: Optional[str] = None
+    ) -> None:
+        """Replace the contents of the store.
+
+        Args:
+            records (Iterable[RfcRecord]): The records to store.
+            source (str, optional): The version of the index text the records
+                were parsed from.
+
+        Raises:
+            StoreError: If the database cannot be written, for example
+                because SQLite was built without FTS5.
+        """
+        records = list(records)
+        with self._write_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            os.close(fd)
+            try:
+                conn = sqlite3.connect(tmp)
+                try:
+                    with conn:
+                        conn.executescript(SCHEMA)
+                        conn.executemany(
+                            "INSERT INTO meta VALUES (?, ?)",
+                            [("schema", SCHEMA_VERSION), ("source", source)],
+                        )
+                        self._insert(conn, records)
+                        self._index_text(conn, records)
+                finally:
+                    conn.close()
+                os.replace(tmp, self.path)
+            except (OSError, sqlite3.Error) as exc:
+                Path(tmp).unlink(missing_ok=True)
+                raise StoreError(
+                    f"Unable to build {self.path}: {exc}"
+                ) from None
+            self._generation += 1
+
+    def extend(
+        self, records: Iterable[RfcRecord], source: Optional[str] = None
+    ) -> None:
+        """Add newly published RFCs to the store.
+
+        The records of the RFCs they obsolete or update are updated to link
+        back to them, as :func:`rfc_lookup.index.merge_records` does.
+
+        Args:
+            records (Iterable[RfcRecord]): The new records.
+            source (str, optional): The version of the index text the store
+                now matches.
+
+        Raises:
+            StoreError: If the database cannot be written.
+        """
+        records = list(records)
+        numbers = {
+            number
+            for record in records
+            for number in record.obsoletes + record.updates
+        }
+        merged = {number: record for number, record in self.get_many(numbers)}
+        merge_records(merged, records)
+
+        with self._write_lock:
+            try:
+                conn = sqlite3.connect(str(self.path))
+                try:
+                    with conn:
+                        self._insert(conn, list(merged.values()))
+                        self._index_text(conn, records)
+                        conn.execute(
+                            "UPDATE meta SET value = ? WHERE key = 'source'",
+                            (source,),
+                        )
+                finally:
+                    conn.close()
+            except sqlite3.Error as exc:
+                raise StoreError(
+                    f"Unable to update {self.path}: {exc}"
+                ) from None
+
+    def get(self, number: int) -> Optional[RfcRecord]:
+        """Get the record of an RFC.
+
+        Args:
+            number (int): The RFC number.
+
+        Returns:
+            RfcRecord: The record, or None if it is not in the store.
+        """
+        rows = self._query("SELECT * FROM rfcs WHERE number = ?", (number,))
+        return _row_record(rows[0]) if rows else None
+
+    def get_many(self, numbers: Iterable[int]) -> List[Tuple[int, RfcRecord]]:
+        """Get the records of several RFCs.
+
+        Args:
+            numbers (Iterable[int]): The RFC numbers.
+
+        Returns:
+            list: The RFC numbers and records found, by RFC number.
+        """
+        numbers = sorted(set(numbers))
+        if not numbers:
+            return []
+        rows = self._query(
+            "SELECT * FROM rfcs WHERE number IN "
+            f"({', '.join('?' * len(numbers))}) ORDER BY number",
+            numbers,
+        )
+        return [(row["number"], _row_record(row)) for row in rows]
+
+    def related(
+        self, number: int, kind: str, reverse: bool = False
+    ) -> List[int]:
+        """Get the RFCs an RFC obsoletes or updates, or that do so to it.
+
+        Args:
+            number (int): The RFC number.
+            kind (str): ``obsoletes`` or ``updates``.
+            reverse (bool): Find the RFCs that obsolete or update this one
+                instead.
+
+        Returns:
+            list: The related RFC numbers, in ascending order.
+        """
+        if reverse:
+            sql = "SELECT number FROM relations WHERE other = ? AND kind = ?"
+        else:
+            sql = "SELECT other FROM relations WHERE number = ? AND kind = ?"
+        return sorted(row[0] for row in self._query(sql, (number, kind)))
+
+    def search(
+        self, query: str, filters: Optional[SearchFilters] = None
+    ) -> List[Dict[str, Any]]:
+        """Find the RFCs matching every word of a query.
+
+        Words match as prefixes, as with
+        :meth:`rfc_lookup.search.SearchIndex.search`.
+
+        Args:
+            query (str): The words to search for.
+            filters (SearchFilters, optional): The filters, order and limit
+                of the results.
+
+        Returns:
+            list: Dicts with the same keys as
+                :func:`rfc_lookup.utilities.search_rfc_editor` results.
+        """
+        filters = filters or SearchFilters()
+        match = _match_expression(query)
+        if not match:
+            return []
+        if filters.author:
+            author = _match_expression(filters.author, "authors")
+            match = f"{match} AND {author}" if author else match
+
+        sql = [
+            "SELECT r.* FROM rfc_text JOIN rfcs r ON r.number = rfc_text.rowid",
+            "WHERE rfc_text MATCH ?",
+        ]
+        params: List[Any] = [match]
+        statuses = filters.statuses()
+        if statuses:
+            sql.append(
+                f"AND r.status_key IN ({', '.join('?' * len(statuses))})"
+            )
+            params.extend(statuses)
+        if filters.since is not None:
+            sql.append("AND r.month >= ?")
+            params.append(filters.since.year * 12 + filters.since.month - 1)
+        if filters.until is not None:
+            sql.append("AND r.month <= ?")
+            params.append(filters.until.year * 12 + filters.until.month - 1)
+
+        order = SORT_COLUMNS[filters.sort]
+        if filters.descending:
+            order = ", ".join(f"{column} DESC" for column in order.split(", "))
+        sql.append(f"ORDER BY {order}")
+        if filters.limit is not None:
+            sql.append("LIMIT ?")
+            params.append(filters.limit)
+
+        rows = self._query(" ".join(sql), params)  # noqa: S608
+        return [record_result(_row_record(row)) for row in rows]
+
+    def close(self) -> None:
+        """Close the connection of the calling thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_stores: Dict[Path, MetadataStore] = {}
+_stores_lock = threading.Lock()
+
+
+def _open_store(cache: IndexCache) -> MetadataStore:
+    with _stores_lock:
+        store = _stores.get(cache.store_path)
+        if store is None:
+            store = _stores[cache.store_path] = MetadataStore(cache.store_path)
+        return store
+
+
+def _extend_store(
+    cache: IndexCache, store: MetadataStore, version: Optional[str]
+) -> bool:
+    state = cache.load()
+    stored = store.source
+    if state is None or state.delta is None or stored is None:
+        return False
+    if state.delta_source != stored:
+        return False
+    records = parse_rfc_index(state.delta)
+    if store.get_many(r.number for r in records):
+        logger.debug("Rebuilding the metadata store: records already stored")
+        return False
+    store.extend(records, source=version)
+    return True
+
+
+def get_metadata_store(cache: Optional[IndexCache] = None) -> MetadataStore:
+    """Get the metadata store, updating it if the RFC index changed.
+
+    The store is built from the RFC index on first use. Afterwards, RFCs
+    added to the index are added to the store on their own, and any other
+    change rebuilds it. The RFC index is refreshed as for
+    :func:`rfc_lookup.search.get_search_index`, and a stored copy is used
+    if that fails.
+
+    Args:
+        cache (IndexCache, optional): The index cache to use. Defaults to the
+            cache configured from the environment.
+
+    Returns:
+        MetadataStore: The up-to-date store.
+
+    Raises:
+        NetworkError: If the RFC index cannot be fetched and there is no
+            local copy to build the store from.
+        StoreError: If the store cannot be built.
+    """
+    if cache is None:
+        cache = get_default_index_cache()
+
+    store = _open_store(cache)
+    try:
+        get_latest_report_ids(cache)
+    except NetworkError:
+        if store.source is not None:
+            logger.debug("Searching the stored metadata offline")
+            return store
+        content = cache.load_content()
+        if content is None:
+            raise
+        store.build(parse_rfc_index(content), cache.content_version())
+        return store
+
+    version = cache.content_version()
+    source = store.source
+    if source is not None and version and source == version:
+        return store
+    if source is None or not _extend_store(cache, store, version):
+        records = get_rfc_index(cache)
+        store.build(records, cache.content_version())
+    return store
+
+
+def search_store(
+    value: str,
+    cache: Optional[IndexCache] = None,
+    filters: Optional[SearchFilters] = None,
+) -> List[Dict[str, Any]]:
+    """Search the metadata store for RFCs by title and metadata keywords.
+
+    Args:
+        value (str): The words to search for.
+        cache (IndexCache, optional): The index cache to use. Defaults to the
+            cache configured from the environment.
+        filters (SearchFilters, optional): The filters, order and limit of
+            the results.
+
+    Returns:
+        list: A list of dicts with the same keys as
+            :func:`rfc_lookup.utilities.search_rfc_editor` results.
+    """
+    return get_metadata_store(cache).search(value, filters)
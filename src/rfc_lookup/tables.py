@@ -0,0 +1,218 @@
+"""Module for streaming the rows out of an HTML table.
+
+:class:`TableParser` is fed the page as it arrives and hands back each row
+of the first table with a given class as soon as the row is closed, without
+building a document tree.
+"""
+
+from collections import deque
+from html.parser import HTMLParser
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+VOID_ELEMENTS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+# Elements whose text does not count towards the text of their parents
+HIDDEN_TEXT_ELEMENTS = frozenset({"script", "style", "template"})
+
+
+class TableLink:
+    """A link inside a table cell."""
+
+    __slots__ = ("href", "parts")
+
+    def __init__(self, href: Optional[str]) -> None:
+        """Initialize the link.
+
+        Args:
+            href (str, optional): The link target, None if it has none.
+        """
+        self.href = href
+        self.parts: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """All the text inside the link."""
+        return "".join(self.parts)
+
+
+class TableCell:
+    """A table cell with its text and links."""
+
+    __slots__ = ("parts", "links")
+
+    def __init__(self) -> None:
+        """Initialize an empty cell."""
+        self.parts: List[str] = []
+        self.links: List[TableLink] = []
+
+    @property
+    def text(self) -> str:
+        """All the text inside the cell, including nested elements."""
+        return "".join(self.parts)
+
+
+class _Row:
+    __slots__ = ("cells", "closed")
+
+    def __init__(self) -> None:
+        self.cells: List[TableCell] = []
+        self.closed = False
+
+
+_Element = Tuple[str, Union[None, _Row, TableCell, TableLink]]
+
+
+def _href(attrs: List[Tuple[str, Optional[str]]]) -> Optional[str]:
+    attributes = dict(attrs)
+    if "href" not in attributes:
+        return None
+    # A bare attribute has an empty value, as in BeautifulSoup
+    return attributes["href"] or ""
+
+
+class TableParser(HTMLParser):
+    """Incremental parser for the rows of the first table with a class.
+
+    Rows, cells and links match what BeautifulSoup's ``find_all("tr")``,
+    ``find_all("td")`` and ``find_all("a")`` would return on the same table,
+    including those of nested elements, and cell text matches ``.text``.
+    """
+
+    def __init__(self, class_name: str) -> None:
+        """Initialize the parser.
+
+        Args:
+            class_name (str): The class of the table to extract.
+        """
+        super().__init__(convert_charrefs=True)
+        self.class_name = class_name
+        self.finished = False
+        self._stack: List[_Element] = []
+        self._rows: Deque[_Row] = deque()
+        self._hidden = 0
+
+    def _is_target(self, attrs: List[Tuple[str, Optional[str]]]) -> bool:
+        value = dict(attrs).get("class") or ""
+        return value == self.class_name or self.class_name in value.split()
+
+    def handle_starttag(
+        self, tag: str, attrs: List[Tuple[str, Optional[str]]]
+    ) -> None:
+        """Track the elements opened inside the table."""
+        if self.finished:
+            return
+        if not self._stack:
+            if tag == "table" and self._is_target(attrs):
+                self._stack.append((tag, None))
+            return
+        if tag not in VOID_ELEMENTS:
+            self._stack.append((tag, self._open_element(tag, attrs)))
+
+    def _open_element(
+        self, tag: str, attrs: List[Tuple[str, Optional[str]]]
+    ) -> Union[None, _Row, TableCell, TableLink]:
+        if tag == "tr":
+            row = _Row()
+            self._rows.append(row)
+            return row
+        if tag == "td":
+            cell = TableCell()
+            for _, parent in self._stack:
+                if isinstance(parent, _Row):
+                    parent.cells.append(cell)
+            return cell
+        if tag == "a":
+            link = TableLink(_href(attrs))
+            for _, parent in self._stack:
+                if isinstance(parent, TableCell):
+                    parent.links.append(link)
+            return link
+        if tag in HIDDEN_TEXT_ELEMENTS:
+            self._hidden += 1
+        return None
+
+    def handle_endtag(self, tag: str) -> None:
+        """Close an element and everything left open inside it."""
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                break
+        else:
+            # Stray end tags are ignored, as in BeautifulSoup
+            return
+
+        self._close_elements(i)
+        if not self._stack:
+            self.finished = True
+
+    def _close_elements(self, start: int) -> None:
+        for tag, payload in self._stack[start:]:
+            if isinstance(payload, _Row):
+                payload.closed = True
+            elif tag in HIDDEN_TEXT_ELEMENTS:
+                self._hidden -= 1
+        del self._stack[start:]
+
+    def handle_data(self, data: str) -> None:
+        """Add text to every open cell and link."""
+        if self._hidden:
+            return
+        for _, payload in self._stack:
+            if isinstance(payload, (TableCell, TableLink)):
+                payload.parts.append(data)
+
+    def close(self) -> None:
+        """Finish parsing, closing any elements left open."""
+        super().close()
+        self._close_elements(0)
+
+    def pop_rows(self) -> List[List[TableCell]]:
+        """Take the rows completed so far, in document order.
+
+        Returns:
+            list: The cells of each completed row.
+        """
+        rows: List[List[TableCell]] = []
+        while self._rows and self._rows[0].closed:
+            rows.append(self._rows.popleft().cells)
+        return rows
+
+
+def iter_table_rows(
+    chunks: Iterable[str], class_name: str
+) -> Iterator[List[TableCell]]:
+    """Stream the rows of the first table with a class out of an HTML page.
+
+    Reading stops as soon as the table has ended.
+
+    Args:
+        chunks (Iterable[str]): The page text, in pieces of any size.
+        class_name (str): The class of the table to extract.
+
+    Yields:
+        list: The cells of each row, as soon as the row is complete.
+    """
+    parser = TableParser(class_name)
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.pop_rows()
+        if parser.finished:
+            return
+    parser.close()
+    yield from parser.pop_rows()
@@ -1,20 +1,85 @@
 """Module for package utility functions."""
 
+import codecs
+import contextlib
+import functools
+import http.client
 import logging
+import os
 import re
-import urllib.error
+import threading
+import time
 import urllib.parse
-import urllib.request
-from typing import Any, Dict, List, Optional, cast
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-from bs4 import BeautifulSoup, Tag
-
-from rfc_lookup.constants import ALLOWED_SCHEMES, DEFAULT_HEADERS
+from rfc_lookup.cache import (
+    DiskCache,
+    IndexCache,
+    IndexState,
+    get_default_cache,
+    get_default_index_cache,
+)
+from rfc_lookup.constants import (
+    ALLOWED_SCHEMES,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_HEADERS,
+    DEFAULT_MAX_WORKERS,
+    MAX_REDIRECTS,
+    REDIRECT_STATUSES,
+    RETRY_STATUSES,
+    RFC_FILE_URL,
+    RFC_FORMATS,
+    RFC_INDEX_URL,
+    RFC_SEARCH_URL,
+    RFC_TEXT_URL,
+    SEARCH_CHUNK_SIZE,
+)
+from rfc_lookup.decoding import accept_encoding
 from rfc_lookup.errors import InvalidRfcIdError, NetworkError
+from rfc_lookup.filters import SearchFilters
+from rfc_lookup.pool import PooledResponse, get_default_pool
+from rfc_lookup.resultcache import get_default_search_cache
+from rfc_lookup.retry import (
+    default_retry_policy,
+    get_default_rate_limiter,
+    parse_retry_after,
+)
+from rfc_lookup.singleflight import SingleFlight
+from rfc_lookup.tables import TableCell, iter_table_rows
+from rfc_lookup.validity import ReportIdBitset, Validity
 
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# An RFC index entry starts with its number at the beginning of a line
+REPORT_ID_LINE = re.compile(r"^([0-9]+)(?: |$)", re.MULTILINE)
+NOT_ISSUED_LINE = re.compile(r"^([0-9]+)\s+Not Issued\.", re.MULTILINE)
+SEARCH_RESULTS_CLASS = "gridtable"
+
+# Identical fetches made by several threads at once share a single request
+_flights = SingleFlight()
+
+# Bitsets built from the cached index state, kept until the index changes
+_bitsets: Dict[Tuple[Path, str], ReportIdBitset] = {}
+_bitsets_lock = threading.Lock()
+
 
 def clean_chars(text: str) -> str:
     """Clean up special characters in a string.
@@ -53,22 +118,18 @@ def extract_authors(line: str) -> List[str]:
     return authors
 
 
-def get_request(
-    url: str,
-    params: Optional[Dict[str, str]] = None,
-) -> bytes:
-    """Get the content of a web page.
+def build_url(url: str, params: Optional[Dict[str, str]] = None) -> str:
+    """Build and validate a request URL.
 
     Args:
-        url (str): The URL to request.
+        url (str): The base URL.
         params (dict, optional): Query parameters to append to the URL.
 
     Returns:
-        bytes: The raw response body.
+        str: The full URL including the query string.
 
     Raises:
         ValueError: If the URL is empty or uses a disallowed scheme.
-        NetworkError: If the request fails due to a network or HTTP error.
     """
     if not url:
         raise ValueError("URL cannot be empty.")
@@ -85,125 +146,924 @@ def get_request(
             f"Invalid URL scheme {parsed.scheme!r}. "
             f"Allowed schemes are: {', '.join(ALLOWED_SCHEMES)}"
         )
+    return full_url
 
-    # Create and execute the request
-    headers = DEFAULT_HEADERS
-    req = urllib.request.Request(full_url, headers=headers)
-    try:
-        return cast(bytes, urllib.request.urlopen(req).read())
-    except (urllib.error.URLError, urllib.error.HTTPError) as exc:
-        raise NetworkError(f"Request to {full_url!r} failed: {exc}") from exc
 
+@dataclass
+class HttpResponse:
+    """A completed HTTP response."""
 
-def search_rfc_editor(value: str) -> List[Dict[str, Any]]:
-    """Search the RFC editor for RFCs by title.
+    status: int
+    body: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def _follow_redirects(url: str, headers: Dict[str, str]) -> PooledResponse:
+    pool = get_default_pool()
+    current_url = url
+    for _ in range(MAX_REDIRECTS + 1):
+        res = pool.request(current_url, headers=headers)
+        location = res.headers.get("location")
+        if res.status in REDIRECT_STATUSES and location:
+            res.close()
+            current_url = build_url(urllib.parse.urljoin(current_url, location))
+            continue
+        return res
+
+    raise NetworkError(f"Request to {url!r} failed: too many redirects")
+
+
+def open_url(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> PooledResponse:
+    """Open a URL over a pooled keep-alive connection, following redirects.
+
+    A ``304 Not Modified`` answer to a conditional request is returned
+    rather than raised. The caller must close the response to return its
+    connection to the pool.
+
+    Requests are spaced out by the shared rate limiter. Connection errors,
+    timeouts and ``429`` or ``5xx`` answers are retried with jittered
+    exponential backoff, or after the delay given by ``Retry-After``.
+
+    Args:
+        url (str): The full URL to request.
+        headers (dict, optional): Extra request headers.
+
+    Returns:
+        PooledResponse: The open response.
+
+    Raises:
+        NetworkError: If the request fails due to a network or HTTP error.
+    """
+    # Compressed responses are decoded transparently by PooledResponse
+    request_headers = {
+        **DEFAULT_HEADERS,
+        "Accept-Encoding": accept_encoding(),
+        **(headers or {}),
+    }
+    policy = default_retry_policy()
+    limiter = get_default_rate_limiter()
+    attempt = 0
+
+    while True:
+        limiter.acquire()
+        try:
+            res = _follow_redirects(url, request_headers)
+        except (OSError, http.client.HTTPException) as exc:
+            error = NetworkError(f"Request to {url!r} failed: {exc}")
+            error.__cause__ = exc
+            delay = policy.delay(attempt)
+        else:
+            if res.status < 400:
+                return res
+            res.close()
+            error = NetworkError(
+                f"Request to {url!r} failed: "
+                f"HTTP Error {res.status}: {res.reason}"
+            )
+            if res.status not in RETRY_STATUSES:
+                raise error
+            retry_after = parse_retry_after(res.headers.get("retry-after"))
+            delay = policy.delay(attempt, retry_after)
+
+        if delay is None:
+            raise error
+        logger.debug("Retrying in %.2f seconds: %s", delay, error)
+        time.sleep(delay)
+        attempt += 1
+
+
+def get_response(
+    url: str,
+    params: Optional[Dict[str, str]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> HttpResponse:
+    """Get a web page along with its status and response headers.
+
+    A ``304 Not Modified`` answer to a conditional request is returned as a
+    response with an empty body rather than raised as an error. Concurrent
+    calls for the same URL and headers wait for one request and share its
+    response.
+
+    Args:
+        url (str): The URL to request.
+        params (dict, optional): Query parameters to append to the URL.
+        headers (dict, optional): Extra request headers.
+
+    Returns:
+        HttpResponse: The response status, body and lower-cased headers.
+
+    Raises:
+        NetworkError: If the request fails due to a network or HTTP error.
+    """
+    full_url = build_url(url, params)
+    key = ("response", full_url, tuple(sorted((headers or {}).items())))
+    return _flights.do(key, lambda: _fetch_response(full_url, headers))
+
+
+def _fetch_response(
+    full_url: str, headers: Optional[Dict[str, str]]
+) -> HttpResponse:
+    with open_url(full_url, headers) as res:
+        try:
+            body = res.read()
+        except (OSError, http.client.HTTPException) as exc:
+            raise NetworkError(
+                f"Request to {full_url!r} failed: {exc}"
+            ) from exc
+    return HttpResponse(status=res.status, body=body, headers=res.headers)
+
+
+def get_request(
+    url: str,
+    params: Optional[Dict[str, str]] = None,
+) -> bytes:
+    """Get the content of a web page.
+
+    Transient failures are retried as described for :func:`open_url`.
+
+    Args:
+        url (str): The URL to request.
+        params (dict, optional): Query parameters to append to the URL.
+
+    Returns:
+        bytes: The raw response body.
+    """
+    return get_response(url, params).body
+
+
+def search_params(
+    value: str, filters: Optional[SearchFilters] = None
+) -> Dict[str, str]:
+    """Build the RFC editor search query parameters.
 
     Args:
         value (str): The title or keyword to search for.
+        filters (SearchFilters, optional): The filters to send along.
+
+    Returns:
+        dict: The query parameters for the search page.
+    """
+    return {"title": value, **(filters or SearchFilters()).params()}
+
+
+def _search_result(cells: List[TableCell]) -> Optional[Dict[str, Any]]:
+    if len(cells) != 7:
+        # There's a chance that the table column breaks for the report column
+        logger.debug("Skipping row with %d columns", len(cells))
+        return None
+
+    if not cells[0].links:
+        return None
+    report_anchor = cells[0].links[0]
+
+    _id = int(clean_chars(report_anchor.text.strip()).split(" ")[1])
+    return {
+        "id": _id,
+        "link": report_anchor.href,
+        "files": {clean_chars(a.text.strip()): a.href for a in cells[1].links},
+        "title": clean_chars(cells[2].text.strip()),
+        "authors": extract_authors(clean_chars(cells[3].text.strip())),
+        "publication_date": clean_chars(cells[4].text.strip()),
+        "more_info": clean_chars(cells[5].text.strip()),
+        "status": clean_chars(cells[6].text.strip()).split(" (")[0],
+    }
+
+
+def iter_search_results(chunks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Stream the results out of an RFC editor search page.
+
+    Each result is yielded as soon as its table row has been read.
+
+    Args:
+        chunks (Iterable[str]): The search page HTML, in pieces of any size.
+
+    Yields:
+        dict: A matching RFC with keys: id, link, files, title, authors,
+            publication_date, more_info, status.
+    """
+    rows = iter_table_rows(chunks, SEARCH_RESULTS_CLASS)
+    # The first row holds the column headings
+    next(rows, None)
+    for cells in rows:
+        result = _search_result(cells)
+        if result is not None:
+            yield result
+
+
+def parse_search_results(html: str) -> List[Dict[str, Any]]:
+    """Parse the result table of an RFC editor search page.
+
+    Args:
+        html (str): The search page HTML.
 
     Returns:
         list: A list of dicts, each representing a matching RFC with keys:
             id, link, files, title, authors, publication_date, more_info,
             status.
     """
-    url = "https://www.rfc-editor.org/search/rfc_search_detail.php"
-    params = {
-        "title": value,
-        "pubstatus[]": "Any",
-        "pub_date_type": "any",
-        "page": "All",
-        "sortkey": "Number",
-        "sorting": "ASC",
-    }
-    html = get_request(url, params).decode("utf-8")
-    soup = BeautifulSoup(html, "html.parser")
-    table = soup.find("table", class_="gridtable")
-    results: List[Dict[str, Any]] = []
+    return list(iter_search_results([html]))
 
-    if not isinstance(table, Tag):
-        return results
 
-    rows = table.find_all("tr")[1:]
+def search_cache_key(
+    value: str, filters: Optional[SearchFilters] = None
+) -> str:
+    """Build the key search results are cached under.
 
-    for row in rows:
-        cells = row.find_all("td")
+    Searches that differ only in case or whitespace share a key.
 
-        if len(cells) != 7:
-            # There's a chance that the table column breaks for the report column
-            logger.debug("Skipping row with %d columns", len(cells))
-            continue
+    Args:
+        value (str): The title or keyword to search for.
+        filters (SearchFilters, optional): The filters of the search.
 
-        report_anchor = cells[0].find("a")
-        if not isinstance(report_anchor, Tag):
-            continue
-        report_url = report_anchor.get("href")
-
-        _id = int(clean_chars(report_anchor.text.strip()).split(" ")[1])
-        results.append(
-            {
-                "id": _id,
-                "link": report_url,
-                "files": {
-                    clean_chars(a.text.strip()): a.get("href")
-                    for a in cells[1].find_all("a")
-                    if isinstance(a, Tag)
-                },
-                "title": clean_chars(cells[2].text.strip()),
-                "authors": extract_authors(clean_chars(cells[3].text.strip())),
-                "publication_date": clean_chars(cells[4].text.strip()),
-                "more_info": clean_chars(cells[5].text.strip()),
-                "status": clean_chars(cells[6].text.strip()).split(" (")[0],
-            }
-        )
+    Returns:
+        str: The search URL for the normalized search.
+    """
+    normalized = " ".join(value.split()).lower()
+    return build_url(RFC_SEARCH_URL, search_params(normalized, filters))
+
+
+def search_rfc_editor(
+    value: str, filters: Optional[SearchFilters] = None
+) -> List[Dict[str, Any]]:
+    """Search the RFC editor for RFCs by title.
+
+    The filters are sent to the RFC editor, so only matching rows are
+    downloaded and parsed. Results are cached for a few minutes, see
+    :func:`rfc_lookup.resultcache.get_default_search_cache`.
+
+    Args:
+        value (str): The title or keyword to search for.
+        filters (SearchFilters, optional): The status, dates, author, order
+            and number of the wanted results.
 
+    Returns:
+        list: A list of dicts, each representing a matching RFC with keys:
+            id, link, files, title, authors, publication_date, more_info,
+            status.
+    """
+    filters = filters or SearchFilters()
+    cache = get_default_search_cache()
+    key = search_cache_key(value, filters)
+    results = cache.get(key)
+    if results is not None:
+        return results
+
+    params = search_params(value, filters)
+    html = get_request(RFC_SEARCH_URL, params).decode("utf-8")
+    results = list(filters.truncate(iter_search_results([html])))
+    cache.set(key, results)
     return results
 
 
-def get_latest_report_ids() -> List[int]:
-    """Get and parse the IETF latest reports.
+def iter_search_rfc_editor(
+    value: str,
+    chunk_size: int = SEARCH_CHUNK_SIZE,
+    filters: Optional[SearchFilters] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream RFC editor search results while the result page downloads.
+
+    The request is sent once iteration starts, and each result is yielded
+    as soon as its table row has arrived, so memory use does not grow with
+    the number of results. Cached results from :func:`search_rfc_editor`
+    are served without a request; streamed results are not cached.
+
+    Args:
+        value (str): The title or keyword to search for.
+        chunk_size (int): The number of bytes to read at a time.
+        filters (SearchFilters, optional): The filters to send along.
 
     Returns:
-        list: A sorted list of known RFC IDs as integers.
+        iterator: Dicts with the same keys as :func:`search_rfc_editor`
+            results.
     """
-    url = "https://www.ietf.org/rfc/rfc-index-latest.txt"
-    content = get_request(url).decode("utf-8")
+    filters = filters or SearchFilters()
+    results = get_default_search_cache().get(search_cache_key(value, filters))
+    if results is not None:
+        return iter(results)
+
+    url = build_url(RFC_SEARCH_URL, search_params(value, filters))
+    return filters.truncate(iter_search_results(_stream_text(url, chunk_size)))
 
-    report_ids = []
-    for line in content.split("\n"):
-        split = line.split(" ")
-        if len(split) < 1:  # pragma: no cover
-            # Skip empty lines
-            continue
 
-        c = split[0]
-        if re.search(r"^[0-9]+$", c) is not None:
-            report_ids.append(int(c))
+def parse_report_ids(content: str) -> List[int]:
+    """Parse the RFC IDs out of an RFC index text.
 
+    Args:
+        content (str): The RFC index text.
+
+    Returns:
+        list: A sorted list of RFC IDs as integers.
+    """
+    report_ids = [int(n) for n in REPORT_ID_LINE.findall(content)]
     report_ids.sort()
     return report_ids
 
 
-def get_rfc_report(report_id: int) -> str:
-    """Get the RFC report for a given RFC ID.
+def parse_not_issued_ids(content: str) -> List[int]:
+    """Parse the numbers listed as "Not Issued" out of an RFC index text.
 
     Args:
-        report_id (int): The RFC number to retrieve.
+        content (str): The RFC index text.
 
     Returns:
-        str: The plain-text content of the RFC document.
+        list: A sorted list of RFC numbers that were never issued.
+    """
+    return sorted({int(n) for n in NOT_ISSUED_LINE.findall(content)})
+
+
+def split_new_entries(
+    content: str, latest_id: int, known: Optional[str] = None
+) -> Optional[str]:
+    """Get the entries of an RFC index text numbered above a given RFC.
+
+    The latest RFC index lists the newest RFCs first, so the new entries
+    are those before the first entry numbered ``latest_id`` or below.
+
+    Args:
+        content (str): The RFC index text.
+        latest_id (int): The highest RFC number already known.
+        known (str, optional): The index text the known entries were read
+            from. If given, the known entries must not have changed since.
+
+    Returns:
+        str: The text of the new entries, empty if there are none, or None
+            if the index does not list the newest RFCs first or a known
+            entry changed.
+    """
+    matches = REPORT_ID_LINE.finditer(content)
+    start: Optional[int] = None
+    previous: Optional[int] = None
+    for match in matches:
+        number = int(match.group(1))
+        if previous is not None and number >= previous:
+            return None
+        if number <= latest_id:
+            # Make sure the known entries continue in descending order
+            following = next(matches, None)
+            if following is not None and int(following.group(1)) >= number:
+                return None
+            if known is not None and not _entries_unchanged(
+                content, match.start(), known
+            ):
+                return None
+            return "" if start is None else content[start : match.start()]
+        if start is None:
+            start = match.start()
+        previous = number
+    return None
+
+
+def _entries_unchanged(content: str, offset: int, known: str) -> bool:
+    # Edits to known entries, such as a status change, are only picked up
+    # by parsing the whole index again
+    first = REPORT_ID_LINE.search(known)
+    return first is not None and content[offset:] == known[first.start() :]
+
+
+def _merge_index_state(
+    cache: IndexCache, state: Optional[IndexState], content: str
+) -> Optional[IndexState]:
+    if state is None or not state.ids:
+        return None
+    known = cache.load_content()
+    if known is None:
+        return None
+    delta = split_new_entries(content, state.ids[-1], known)
+    if delta is None:
+        return None
+    return IndexState(
+        ids=state.ids + parse_report_ids(delta),
+        not_issued=state.not_issued + parse_not_issued_ids(delta),
+        delta=delta,
+        delta_source=cache.content_version(),
+    )
+
+
+def index_request_headers(state: Optional[IndexState]) -> Dict[str, str]:
+    """Build the conditional request headers for revalidating the index.
+
+    Args:
+        state (IndexState, optional): The stored index state.
+
+    Returns:
+        dict: The ``If-None-Match``/``If-Modified-Since`` headers, if any.
+    """
+    headers: Dict[str, str] = {}
+    if state is not None and state.ids:
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+    return headers
+
+
+def store_index_response(
+    cache: IndexCache, state: Optional[IndexState], res: HttpResponse
+) -> List[int]:
+    """Update the index cache from an index response.
+
+    When the index only gained entries above the highest known RFC, and
+    the known entries are unchanged, only the new entries are parsed and
+    merged into the stored state.
+
+    Args:
+        cache (IndexCache): The index cache.
+        state (IndexState, optional): The previously stored index state.
+        res (HttpResponse): The response to the index request.
+
+    Returns:
+        list: A sorted list of known RFC IDs as integers.
+    """
+    if res.status == 304 and state is not None:
+        cache.touch(state)
+        return state.ids
+
+    content = res.body.decode("utf-8")
+    new_state = _merge_index_state(cache, state, content) or IndexState(
+        ids=parse_report_ids(content),
+        not_issued=parse_not_issued_ids(content),
+    )
+    new_state.etag = res.headers.get("etag")
+    new_state.last_modified = res.headers.get("last-modified")
+    new_state.fetched_at = time.time()
+    cache.save(new_state, res.body)
+    return new_state.ids
+
+
+def get_latest_report_ids(cache: Optional[IndexCache] = None) -> List[int]:
+    """Get and parse the IETF latest reports.
+
+    The parsed IDs are kept in the local index cache. A copy younger than
+    the cache TTL is used as-is; an older one is revalidated with
+    ``If-None-Match``/``If-Modified-Since`` and only re-downloaded and
+    re-parsed when the index has changed. Threads refreshing the same cache
+    at once share a single refresh.
+
+    Args:
+        cache (IndexCache, optional): The index cache to use. Defaults to the
+            cache configured from the environment.
+
+    Returns:
+        list: A sorted list of known RFC IDs as integers.
+    """
+    if cache is None:
+        cache = get_default_index_cache()
+
+    state = cache.load()
+    if state is not None and state.ids and cache.is_fresh(state):
+        return state.ids
+
+    index_cache = cache
+    return _flights.do(
+        ("index", str(cache.path)),
+        lambda: _refresh_report_ids(index_cache, state),
+    )
+
+
+def _refresh_report_ids(
+    cache: IndexCache, state: Optional[IndexState]
+) -> List[int]:
+    res = get_response(RFC_INDEX_URL, headers=index_request_headers(state))
+    return store_index_response(cache, state, res)
+
+
+def index_report_id_bitset(
+    cache: IndexCache, report_ids: List[int]
+) -> ReportIdBitset:
+    """Get the issued RFC numbers of the stored RFC index as a bitset.
+
+    The bitset is mapped from the index snapshot when one was built with
+    ``rfc index build``, and otherwise built from the cached index state.
+    Built bitsets are kept for the life of the process and rebuilt when the
+    index changes.
+
+    Args:
+        cache (IndexCache): The index cache the RFC IDs were loaded from.
+        report_ids (list): The RFC IDs of the index, in ascending order.
+
+    Returns:
+        ReportIdBitset: The issued RFC numbers.
+    """
+    # The snapshot module parses the index with rfc_lookup.index, which
+    # imports this module
+    from rfc_lookup.snapshot import get_index_snapshot
+
+    latest_id = report_ids[-1] if report_ids else 0
+    snapshot = get_index_snapshot(cache)
+    if snapshot is not None and snapshot.latest_id == latest_id:
+        return snapshot.issued
+
+    version = cache.content_version()
+    key = (cache.path, version or "")
+    with _bitsets_lock:
+        bitset = _bitsets.get(key)
+        if version is None or bitset is None or bitset.latest_id != latest_id:
+            # Every number up to the latest one is listed in the index, those
+            # that were never issued as "Not Issued"
+            state = cache.load()
+            not_issued = set(state.not_issued if state is not None else ())
+            bitset = ReportIdBitset.from_ids(
+                (n for n in range(1, latest_id + 1) if n not in not_issued),
+                latest_id,
+            )
+            _bitsets.clear()
+            if version is not None:
+                _bitsets[key] = bitset
+        return bitset
+
+
+def get_report_id_bitset(cache: Optional[IndexCache] = None) -> ReportIdBitset:
+    """Get the issued RFC numbers of the latest RFC index as a bitset.
+
+    The index is refreshed as for :func:`get_latest_report_ids`.
+
+    Args:
+        cache (IndexCache, optional): The index cache to use. Defaults to the
+            cache configured from the environment.
+
+    Returns:
+        ReportIdBitset: The issued RFC numbers.
+    """
+    report_ids = get_latest_report_ids(cache)
+    if cache is None:
+        cache = get_default_index_cache()
+    return index_report_id_bitset(cache, report_ids)
+
+
+def validate_report_id(report_id: int) -> None:
+    """Check that an RFC exists.
+
+    Once the RFC index has been compiled with ``rfc index build``, numbers
+    up to the latest RFC of the snapshot are checked without loading the
+    index. Published RFCs never go away, so only higher numbers need the
+    index to be refreshed.
+
+    Args:
+        report_id (int): The RFC number to check.
 
     Raises:
-        InvalidRfcIdError: If report_id is out of the valid range.
+        InvalidRfcIdError: If the RFC is out of range or was never issued.
     """
-    latest_ids = get_latest_report_ids()
-    latest_id = latest_ids[-1]
+    from rfc_lookup.snapshot import get_index_snapshot
 
-    if 0 >= report_id or report_id > latest_id:
-        raise InvalidRfcIdError(
-            f"Invalid RFC ID {report_id}, must be between 0 and {latest_id}"
-        )
+    snapshot = get_index_snapshot()
+    if snapshot is not None:
+        if snapshot.issued.validity(report_id) is not Validity.OUT_OF_RANGE:
+            snapshot.issued.check(report_id)
+            return
+    get_report_id_bitset().check(report_id)
+
+
+def rfc_file_url(report_id: int, fmt: str = "txt") -> str:
+    """Build the URL of an RFC document.
+
+    Args:
+        report_id (int): The RFC number.
+        fmt (str): The document format, one of ``txt``, ``html``, ``xml``,
+            ``pdf`` or ``json``.
+
+    Returns:
+        str: The URL of the document.
+
+    Raises:
+        ValueError: If the format is not known.
+    """
+    if fmt not in RFC_FORMATS:
+        raise ValueError(f"Unknown RFC format {fmt!r}")
+    if fmt == "txt":
+        return RFC_TEXT_URL.format(id=report_id)
+    return RFC_FILE_URL.format(id=report_id, ext=fmt)
+
+
+def _open_mirrored(report_id: int) -> Optional[BinaryIO]:
+    # The mirror module downloads through this module
+    from rfc_lookup.mirror import get_default_mirror
+
+    mirror = get_default_mirror()
+    return None if mirror is None else mirror.open(report_id)
+
+
+def _is_stored(report_id: int, cache: DiskCache, fmt: str = "txt") -> bool:
+    from rfc_lookup.mirror import get_default_mirror
 
-    url = f"https://www.rfc-editor.org/rfc/rfc{report_id}.txt"
+    mirror = get_default_mirror()
+    if fmt == "txt" and mirror is not None and mirror.contains(report_id):
+        return True
+    return cache.contains(rfc_file_url(report_id, fmt))
+
+
+def _read_mirrored(report_id: int) -> Optional[str]:
+    from rfc_lookup.mirror import get_default_mirror
+
+    mirror = get_default_mirror()
+    return None if mirror is None else mirror.read(report_id)
+
+
+def _download_rfc_report(report_id: int, cache: DiskCache) -> str:
+    url = RFC_TEXT_URL.format(id=report_id)
+    return _flights.do(("rfc", url), lambda: _fetch_rfc_report(url, cache))
+
+
+def _fetch_rfc_report(url: str, cache: DiskCache) -> str:
     res: bytes = get_request(url)
     content: str = res.decode("utf-8")
+    cache.set(url, res)
     return content
+
+
+def _read_rfc_report(report_id: int, cache: DiskCache) -> str:
+    mirrored = _read_mirrored(report_id)
+    if mirrored is not None:
+        return mirrored
+    cached = cache.get(RFC_TEXT_URL.format(id=report_id))
+    if cached is not None:
+        return cached.decode("utf-8")
+    return _download_rfc_report(report_id, cache)
+
+
+def get_rfc_report(report_id: int, cache: Optional[DiskCache] = None) -> str:
+    """Get the RFC report for a given RFC ID.
+
+    Published RFC text never changes, so the document is served from the
+    on-disk cache when present and stored there after a download. A mirror
+    configured with ``RFC_LOOKUP_MIRROR`` is read before the cache.
+
+    Args:
+        report_id (int): The RFC number to retrieve.
+        cache (DiskCache, optional): The cache to use. Defaults to the cache
+            configured from the environment.
+
+    Returns:
+        str: The plain-text content of the RFC document.
+    """
+    mirrored = _read_mirrored(report_id)
+    if mirrored is not None:
+        return mirrored
+
+    if cache is None:
+        cache = get_default_cache()
+
+    url = RFC_TEXT_URL.format(id=report_id)
+    cached = cache.get(url)
+    if cached is not None:
+        return cached.decode("utf-8")
+
+    validate_report_id(report_id)
+    return _download_rfc_report(report_id, cache)
+
+
+def _iter_file(f: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    with f:
+        yield from iter(lambda: f.read(chunk_size), b"")
+
+
+def read_chunks(
+    res: PooledResponse, url: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Read a response body in pieces.
+
+    Args:
+        res (PooledResponse): The open response.
+        url (str): The URL the response is for, to report errors.
+        chunk_size (int): The number of bytes to read at a time.
+
+    Yields:
+        bytes: The decoded body, one piece at a time.
+
+    Raises:
+        NetworkError: If the connection fails while reading.
+    """
+    while True:
+        try:
+            chunk = res.read(chunk_size)
+        except (OSError, http.client.HTTPException) as exc:
+            raise NetworkError(f"Request to {url!r} failed: {exc}") from exc
+        if not chunk:
+            return
+        yield chunk
+
+
+def _stream_url(url: str, chunk_size: int, cache: DiskCache) -> Iterator[bytes]:
+    with open_url(url) as res, cache.writer(url) as sink:
+        for chunk in read_chunks(res, url, chunk_size):
+            sink.write(chunk)
+            yield chunk
+
+
+def _stream_text(url: str, chunk_size: int) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open_url(url) as res:
+        for chunk in read_chunks(res, url, chunk_size):
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+
+
+def _open_rfc_report(
+    report_id: int, chunk_size: int, cache: DiskCache, fmt: str = "txt"
+) -> Iterator[bytes]:
+    url = rfc_file_url(report_id, fmt)
+    # The mirror only holds plain-text documents
+    mirrored = _open_mirrored(report_id) if fmt == "txt" else None
+    cached = mirrored or cache.open(url)
+    if cached is not None:
+        return _iter_file(cached, chunk_size)
+    return _stream_url(url, chunk_size, cache)
+
+
+def iter_rfc_report(
+    report_id: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache: Optional[DiskCache] = None,
+    fmt: str = "txt",
+) -> Iterator[bytes]:
+    """Stream the RFC report for a given RFC ID in fixed-size chunks.
+
+    The ID is validated immediately, while the document is only fetched as
+    the iterator is consumed. A mirror configured with ``RFC_LOOKUP_MIRROR``
+    is read before the cache for plain text. A downloaded document is
+    written to the on-disk cache as it streams and committed once it is
+    complete.
+
+    Args:
+        report_id (int): The RFC number to retrieve.
+        chunk_size (int): The number of bytes to read at a time.
+        cache (DiskCache, optional): The cache to use. Defaults to the cache
+            configured from the environment.
+        fmt (str): The document format, see :func:`rfc_file_url`.
+
+    Returns:
+        iterator: The raw bytes of the RFC document.
+    """
+    url = rfc_file_url(report_id, fmt)
+    mirrored = _open_mirrored(report_id) if fmt == "txt" else None
+    if mirrored is not None:
+        return _iter_file(mirrored, chunk_size)
+
+    if cache is None:
+        cache = get_default_cache()
+
+    if not cache.contains(url):
+        validate_report_id(report_id)
+    return _open_rfc_report(report_id, chunk_size, cache, fmt)
+
+
+def download_rfc_report(
+    report_id: int,
+    fileobj: BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache: Optional[DiskCache] = None,
+    fmt: str = "txt",
+) -> int:
+    """Write the RFC report for a given RFC ID to a binary file object.
+
+    Only ``chunk_size`` bytes of the document are held in memory at once.
+
+    Args:
+        report_id (int): The RFC number to retrieve.
+        fileobj (BinaryIO): The file object to write to.
+        chunk_size (int): The number of bytes to read at a time.
+        cache (DiskCache, optional): The cache to use. Defaults to the cache
+            configured from the environment.
+        fmt (str): The document format, see :func:`rfc_file_url`.
+
+    Returns:
+        int: The number of bytes written.
+    """
+    written = 0
+    for chunk in iter_rfc_report(report_id, chunk_size, cache, fmt):
+        fileobj.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def _save_rfc_report(
+    report_id: int,
+    output_dir: str,
+    chunk_size: int,
+    cache: DiskCache,
+    fmt: str = "txt",
+) -> str:
+    path = os.path.join(output_dir, f"rfc{report_id}.{fmt}")
+    partial = f"{path}.part"
+    try:
+        with open(partial, "wb") as f:
+            for chunk in _open_rfc_report(report_id, chunk_size, cache, fmt):
+                f.write(chunk)
+        os.replace(partial, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(partial)
+        raise
+    return path
+
+
+def _map_report_ids(
+    report_ids: Iterable[int],
+    func: Callable[[int], T],
+    max_workers: int,
+    cache: DiskCache,
+    fmt: str = "txt",
+) -> Iterator[Tuple[int, Union[T, Exception]]]:
+    pending: List[int] = []
+    issued: Optional[ReportIdBitset] = None
+    for report_id in report_ids:
+        if not _is_stored(report_id, cache, fmt):
+            if issued is None:
+                issued = get_report_id_bitset()
+            try:
+                issued.check(report_id)
+            except InvalidRfcIdError as exc:
+                yield report_id, exc
+                continue
+        pending.append(report_id)
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        futures = {
+            executor.submit(func, report_id): report_id for report_id in pending
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except (NetworkError, OSError) as exc:
+                yield futures[future], exc
+
+
+def get_rfc_reports(
+    report_ids: Iterable[int],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    cache: Optional[DiskCache] = None,
+) -> Iterator[Tuple[int, Union[str, Exception]]]:
+    """Get several RFC reports concurrently.
+
+    All IDs are validated against a single fetch of the RFC index and the
+    documents are downloaded through a bounded thread pool. Results are
+    yielded as soon as each download finishes, so their order is not the
+    order of ``report_ids``.
+
+    Args:
+        report_ids (iterable): The RFC numbers to retrieve.
+        max_workers (int): The maximum number of concurrent downloads.
+        cache (DiskCache, optional): The cache to use. Defaults to the cache
+            configured from the environment.
+
+    Yields:
+        tuple: The RFC number and either its plain-text content or the
+            :class:`InvalidRfcIdError` or :class:`NetworkError` raised for it.
+    """
+    if cache is None:
+        cache = get_default_cache()
+
+    yield from _map_report_ids(
+        report_ids,
+        functools.partial(_read_rfc_report, cache=cache),
+        max_workers,
+        cache,
+    )
+
+
+def save_rfc_reports(
+    report_ids: Iterable[int],
+    output_dir: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache: Optional[DiskCache] = None,
+    fmt: str = "txt",
+) -> Iterator[Tuple[int, Union[str, Exception]]]:
+    """Stream several RFC reports concurrently to ``rfc<ID>.<fmt>`` files.
+
+    Works like :func:`get_rfc_reports`, but each document is copied to its
+    file in ``chunk_size`` pieces, so memory use stays bounded no matter how
+    large the documents are. A file only appears once it is complete.
+
+    Args:
+        report_ids (iterable): The RFC numbers to retrieve.
+        output_dir (str): The directory to write the files to.
+        max_workers (int): The maximum number of concurrent downloads.
+        chunk_size (int): The number of bytes to read at a time.
+        cache (DiskCache, optional): The cache to use. Defaults to the cache
+            configured from the environment.
+        fmt (str): The document format, see :func:`rfc_file_url`.
+
+    Yields:
+        tuple: The RFC number and either the path of its file or the
+            exception raised for it.
+    """
+    if cache is None:
+        cache = get_default_cache()
+
+    yield from _map_report_ids(
+        report_ids,
+        functools.partial(
+            _save_rfc_report,
+            output_dir=output_dir,
+            chunk_size=chunk_size,
+            cache=cache,
+            fmt=fmt,
+        ),
+        max_workers,
+        cache,
+        fmt,
+    )
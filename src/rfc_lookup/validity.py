@@ -0,0 +1,100 @@
+"""Module for checking RFC numbers against the RFC index in constant time.
+
+:class:`ReportIdBitset` holds one bit per number up to the latest RFC, set
+for the numbers that were issued, so telling an RFC that exists from one
+that was never issued or is out of range is a single bit test.
+"""
+
+from enum import Enum
+from typing import Iterable, Optional, Union
+
+from rfc_lookup.errors import InvalidRfcIdError
+
+
+class Validity(Enum):
+    """Whether an RFC number can be retrieved."""
+
+    EXISTS = "exists"
+    NOT_ISSUED = "not issued"
+    OUT_OF_RANGE = "out of range"
+
+
+class ReportIdBitset:
+    """Bitset of the issued RFC numbers of the RFC index."""
+
+    def __init__(
+        self, bits: Union[bytes, bytearray, memoryview], latest_id: int
+    ) -> None:
+        """Initialize the bitset without copying the bits.
+
+        Args:
+            bits (bytes): Bit ``n % 8`` of byte ``n // 8`` is set if RFC
+                ``n`` was issued.
+            latest_id (int): The highest number in the index.
+        """
+        self.bits = bits
+        self.latest_id = latest_id
+
+    @classmethod
+    def from_ids(
+        cls, issued: Iterable[int], latest_id: Optional[int] = None
+    ) -> "ReportIdBitset":
+        """Build a bitset from the issued RFC numbers.
+
+        Args:
+            issued (Iterable[int]): The issued RFC numbers.
+            latest_id (int, optional): The highest number in the index,
+                issued or not. Defaults to the highest issued number.
+
+        Returns:
+            ReportIdBitset: The new bitset.
+        """
+        numbers = [n for n in issued if n > 0]
+        if latest_id is None:
+            latest_id = max(numbers, default=0)
+        bits = bytearray(latest_id // 8 + 1)
+        for n in numbers:
+            bits[n >> 3] |= 1 << (n & 7)
+        return cls(bytes(bits), latest_id)
+
+    def validity(self, report_id: int) -> Validity:
+        """Check whether an RFC number exists.
+
+        Args:
+            report_id (int): The RFC number to check.
+
+        Returns:
+            Validity: Whether the RFC exists, was never issued, or is out of
+                the range of the index.
+        """
+        if report_id <= 0 or report_id > self.latest_id:
+            return Validity.OUT_OF_RANGE
+        if self.bits[report_id >> 3] & (1 << (report_id & 7)):
+            return Validity.EXISTS
+        return Validity.NOT_ISSUED
+
+    def __contains__(self, report_id: object) -> bool:
+        """Check whether an RFC number was issued."""
+        return (
+            isinstance(report_id, int)
+            and self.validity(report_id) is Validity.EXISTS
+        )
+
+    def check(self, report_id: int) -> None:
+        """Check that an RFC exists.
+
+        Args:
+            report_id (int): The RFC number to check.
+
+        Raises:
+            InvalidRfcIdError: If the RFC is out of range or was never
+                issued.
+        """
+        validity = self.validity(report_id)
+        if validity is Validity.OUT_OF_RANGE:
+            raise InvalidRfcIdError(
+                f"Invalid RFC ID {report_id}, must be between 0 and "
+                f"{self.latest_id}"
+            )
+        if validity is Validity.NOT_ISSUED:
+            raise InvalidRfcIdError(f"RFC {report_id} was never issued")
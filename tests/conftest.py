@@ -0,0 +1,34 @@
+"""Shared test fixtures."""
+
+from pathlib import Path
+
+import pytest
+
+from rfc_lookup import resultcache
+from rfc_lookup.constants import (
+    CACHE_DIR_ENV,
+    MIRROR_DIR_ENV,
+    RETRIES_ENV,
+    SEARCH_CACHE_DB_ENV,
+    SEARCH_CACHE_TTL_ENV,
+    SERVER_URL_ENV,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the on-disk cache at a temporary directory for every test.
+
+    This also hides any running ``rfc serve`` and any configured mirror
+    from the code under test, disables retries so failing requests fail
+    fast, and gives every test a fresh search result cache.
+    """
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv(CACHE_DIR_ENV, str(cache_dir))
+    monkeypatch.delenv(SERVER_URL_ENV, raising=False)
+    monkeypatch.delenv(MIRROR_DIR_ENV, raising=False)
+    monkeypatch.setenv(RETRIES_ENV, "0")
+    monkeypatch.delenv(SEARCH_CACHE_DB_ENV, raising=False)
+    monkeypatch.delenv(SEARCH_CACHE_TTL_ENV, raising=False)
+    monkeypatch.setattr(resultcache, "_default_search_cache", None)
+    return cache_dir
@@ -0,0 +1,369 @@
+"""Tests for aio module."""
+
+import asyncio
+import gzip
+import threading
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, TypeVar
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from rfc_lookup import aio
+from rfc_lookup.aio import (
+    async_get_latest_report_ids,
+    async_get_request,
+    async_get_response,
+    async_get_rfc_report,
+    async_search_rfc_editor,
+    set_concurrency_limit,
+)
+from rfc_lookup.cache import DiskCache, IndexCache, IndexState
+from rfc_lookup.constants import (
+    DEFAULT_MAX_WORKERS,
+    MIRROR_DIR_ENV,
+    READ_TIMEOUT_ENV,
+)
+from rfc_lookup.errors import InvalidRfcIdError, NetworkError
+from rfc_lookup.utilities import HttpResponse
+
+
+T = TypeVar("T")
+
+Handler = Callable[[str, Dict[str, str]], bytes]
+
+
+def run_with_server(handler: Handler, test: Callable[[str], Awaitable[T]]) -> T:
+    """Run a coroutine against a local HTTP server answering with handler."""
+
+    async def handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        request_line = (await reader.readline()).decode()
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+        writer.write(handler(request_line.split(" ")[1], headers))
+        await writer.drain()
+        writer.close()
+
+    async def main() -> T:
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await test(f"http://127.0.0.1:{port}")
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    return asyncio.run(main())
+
+
+def response(status: int, body: bytes = b"", **headers: str) -> bytes:
+    """Build a raw HTTP/1.1 response."""
+    lines = [f"HTTP/1.1 {status} Status"]
+    lines += [f"{k.replace('_', '-')}: {v}" for k, v in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+
+def test_async_get_request() -> None:
+    """Test a plain request with a content length."""
+    seen: List[Dict[str, str]] = []
+
+    def handler(path: str, headers: Dict[str, str]) -> bytes:
+        seen.append(headers)
+        assert path == "/doc?a=1"
+        return response(200, b"Hello", Content_Length="5")
+
+    async def test(base: str) -> bytes:
+        return await async_get_request(f"{base}/doc", {"a": "1"})
+
+    assert run_with_server(handler, test) == b"Hello"
+    assert "user-agent" in seen[0]
+
+
+def test_async_get_response_chunked() -> None:
+    """Test a chunked response body is reassembled."""
+
+    def handler(path: str, headers: Dict[str, str]) -> bytes:
+        return response(
+            200,
+            b"5\r\nHello\r\n7;ext=1\r\n, World\r\n0\r\nX-Trailer: 1\r\n\r\n",
+            Transfer_Encoding="chunked",
+            ETag='"abc"',
+        )
+
+    async def test(base: str) -> HttpResponse:
+        return await async_get_response(base)
+
+    res = run_with_server(handler, test)
+    assert res.status == 200
+    assert res.body == b"Hello, World"
+    assert res.headers["etag"] == '"abc"'
+
+
+def test_async_get_response_gzip() -> None:
+    """Test compressed bodies are advertised for and decoded."""
+
+    def handler(path: str, headers: Dict[str, str]) -> bytes:
+        assert "gzip" in headers["accept-encoding"]
+        body = gzip.compress(b"Hello")
+        return response(
+            200, body, Content_Encoding="gzip", Content_Length=str(len(body))
+        )
+
+    async def test(base: str) -> bytes:
+        return await async_get_request(base)
+
+    assert run_with_server(handler, test) == b"Hello"
+
+
+def test_async_get_response_read_to_eof() -> None:
+    """Test a response without a length is read until the connection ends."""
+
+    def handler(path: str, headers: Dict[str, str]) -> bytes:
+        return response(200, b"Hello")
+
+    async def test(base: str) -> bytes:
+        return await async_get_request(base)
+
+    assert run_with_server(handler, test) == b"Hello"
+
+
+def test_async_get_response_not_modified() -> None:
+    """Test a 304 response is returned with an empty body."""
+
+    def handler(path: str, headers: Dict[str, str]) -> bytes:
+        assert headers["if-none-match"] == '"abc"'
+        return response(304)
+
+    async def test(base: str) -> HttpResponse:
+        return await async_get_response(
+            base, headers={"If-None-Match": '"abc"'}
+        )
+
+    res = run_with_server(handler, test)
+    assert res.status == 304
+    assert res.body == b""
+
+
+def test_async_get_response_redirect() -> None:
+    """Test redirects are followed."""
+
+    def handler(path: str, headers: Dict[str, str]) -> bytes:
+        if path == "/old":
+            return response(301, Location="/new", Content_Length="0")
+        return response(200, b"moved", Content_Length="5")
+
+    async def test(base: str) -> bytes:
+        return await async_get_request(f"{base}/old")
+
+    assert run_with_server(handler, test) == b"moved"
+
+
+def test_async_get_response_too_many_redirects() -> None:
+    """Test redirect loops raise NetworkError."""
+
+    def handler(path: str, headers: Dict[str, str]) -> bytes:
+        return response(302, Location="/loop", Content_Length="0")
+
+    async def test(base: str) -> bytes:
+        return await async_get_request(base)
+
+    with pytest.raises(NetworkError, match="too many redirects"):
+        run_with_server(handler, test)
+
+
+def test_async_get_response_http_error() -> None:
+    """Test HTTP errors raise NetworkError."""
+
+    def handler(path: str, headers: Dict[str, str]) -> bytes:
+        return response(404, Content_Length="0")
+
+    async def test(base: str) -> bytes:
+        return await async_get_request(base)
+
+    with pytest.raises(NetworkError, match="404"):
+        run_with_server(handler, test)
+
+
+def test_async_get_response_malformed() -> None:
+    """Test a malformed status line raises NetworkError."""
+
+    def handler(path: str, headers: Dict[str, str]) -> bytes:
+        return b"garbage\r\n\r\n"
+
+    async def test(base: str) -> bytes:
+        return await async_get_request(base)
+
+    with pytest.raises(NetworkError, match="Malformed"):
+        run_with_server(handler, test)
+
+
+def test_async_get_response_connection_error() -> None:
+    """Test connection failures raise NetworkError."""
+
+    async def test() -> bytes:
+        return await async_get_request("http://127.0.0.1:1/")
+
+    with pytest.raises(NetworkError):
+        asyncio.run(test())
+
+
+def test_async_get_response_read_timeout(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a server that stops answering times out like the sync client."""
+    monkeypatch.setenv(READ_TIMEOUT_ENV, "0.05")
+
+    async def handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        await reader.read()
+        writer.close()
+
+    async def main() -> bytes:
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await async_get_request(f"http://127.0.0.1:{port}/")
+        finally:
+            server.close()
+
+    with pytest.raises(NetworkError):
+        asyncio.run(main())
+
+
+def test_async_get_request_invalid_scheme() -> None:
+    """Test disallowed schemes raise ValueError."""
+    with pytest.raises(ValueError):
+        asyncio.run(async_get_request("ssh:127.0.0.1"))
+
+
+def test_set_concurrency_limit() -> None:
+    """Test the number of requests in flight is bounded."""
+    active = 0
+    peak = 0
+
+    async def fake_fetch(url: str, headers: Dict[str, str]) -> Any:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return 200, {}, b""
+
+    async def main() -> None:
+        await asyncio.gather(
+            *(async_get_request("http://127.0.0.1/") for _ in range(6))
+        )
+
+    set_concurrency_limit(2)
+    try:
+        with patch.object(aio, "_fetch", fake_fetch):
+            asyncio.run(main())
+    finally:
+        set_concurrency_limit(DEFAULT_MAX_WORKERS)
+    assert peak == 2
+
+    with pytest.raises(ValueError):
+        set_concurrency_limit(0)
+
+
+def test_async_search_rfc_editor() -> None:
+    """Test the async search parses the result table and caches it."""
+    html = b"""<table class="gridtable"><tr></tr><tr>
+<td><a href="#">RFC 1</a></td><td></td><td>Title</td><td>John Doe</td>
+<td>January 1</td><td></td><td>Proposed Standard</td></tr></table>"""
+    mock = AsyncMock(return_value=html)
+    with patch.object(aio, "async_get_request", mock):
+        results = asyncio.run(async_search_rfc_editor("title"))
+        assert asyncio.run(async_search_rfc_editor("title")) == results
+    assert [r["id"] for r in results] == [1]
+    mock.assert_called_once()
+
+
+def test_async_get_latest_report_ids(tmp_path: Path) -> None:
+    """Test the async index fetch uses and revalidates the index cache."""
+    cache = IndexCache(tmp_path, ttl=0)
+    cache.save(IndexState(ids=[1, 2], etag='"abc"'))
+    mock = AsyncMock(return_value=HttpResponse(304))
+    with patch.object(aio, "async_get_response", mock):
+        assert asyncio.run(async_get_latest_report_ids(cache)) == [1, 2]
+    assert mock.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+    fresh = IndexCache(tmp_path, ttl=60)
+    mock.reset_mock()
+    with patch.object(aio, "async_get_response", mock):
+        assert asyncio.run(async_get_latest_report_ids(fresh)) == [1, 2]
+    mock.assert_not_called()
+
+
+def test_async_get_latest_report_ids_default_cache() -> None:
+    """Test the async index fetch parses a downloaded index."""
+    mock = AsyncMock(return_value=HttpResponse(200, b"1 One\n2 Two\n"))
+    with patch.object(aio, "async_get_response", mock):
+        assert asyncio.run(async_get_latest_report_ids()) == [1, 2]
+
+
+def test_async_get_rfc_report(tmp_path: Path) -> None:
+    """Test the async report fetch validates, downloads and caches."""
+    cache = DiskCache(tmp_path, max_size=1024)
+    with patch.object(
+        aio, "async_get_latest_report_ids", AsyncMock(return_value=[2])
+    ), patch.object(
+        aio, "async_get_request", AsyncMock(return_value=b"Hello")
+    ) as mock_request:
+        assert asyncio.run(async_get_rfc_report(1, cache)) == "Hello"
+        assert asyncio.run(async_get_rfc_report(1, cache)) == "Hello"
+        assert mock_request.call_count == 1
+
+        with pytest.raises(InvalidRfcIdError):
+            asyncio.run(async_get_rfc_report(3))
+
+
+def test_async_get_rfc_report_mirrored(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the async report fetch reads a configured mirror first."""
+    monkeypatch.setenv(MIRROR_DIR_ENV, str(tmp_path))
+    (tmp_path / "rfc1.txt").write_bytes(b"Mirrored")
+    with patch.object(aio, "async_get_request", AsyncMock()) as mock_request:
+        assert asyncio.run(async_get_rfc_report(1)) == "Mirrored"
+    mock_request.assert_not_called()
+
+    # RFCs missing from the mirror are downloaded
+    with patch.object(
+        aio, "async_get_latest_report_ids", AsyncMock(return_value=[2])
+    ), patch.object(aio, "async_get_request", AsyncMock(return_value=b"Two")):
+        assert asyncio.run(async_get_rfc_report(2)) == "Two"
+
+
+def test_async_get_rfc_report_cache_off_loop(tmp_path: Path) -> None:
+    """Test the disk cache is read and written outside the event loop."""
+    cache = DiskCache(tmp_path, max_size=1024)
+    threads: List[int] = []
+    get, set_ = cache.get, cache.set
+
+    def record_get(url: str) -> Any:
+        threads.append(threading.get_ident())
+        return get(url)
+
+    def record_set(url: str, data: bytes) -> None:
+        threads.append(threading.get_ident())
+        set_(url, data)
+
+    with patch.object(cache, "get", record_get), patch.object(
+        cache, "set", record_set
+    ), patch.object(
+        aio, "async_get_latest_report_ids", AsyncMock(return_value=[2])
+    ), patch.object(
+        aio, "async_get_request", AsyncMock(return_value=b"Hello")
+    ):
+        assert asyncio.run(async_get_rfc_report(1, cache)) == "Hello"
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
@@ -0,0 +1,322 @@
+"""Tests for cache module."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from rfc_lookup.cache import (
+    DiskCache,
+    IndexCache,
+    IndexState,
+    default_cache_dir,
+    default_cache_size,
+    default_index_ttl,
+    get_default_cache,
+    get_default_index_cache,
+)
+from rfc_lookup.constants import (
+    CACHE_DIR_ENV,
+    CACHE_SIZE_ENV,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_INDEX_TTL,
+    INDEX_TTL_ENV,
+)
+
+
+def test_default_cache_dir_env(isolated_cache_dir: Path) -> None:
+    """Test the cache directory honors the override variable."""
+    assert default_cache_dir() == isolated_cache_dir
+
+
+def test_default_cache_dir_xdg(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test the cache directory falls back to XDG_CACHE_HOME."""
+    monkeypatch.delenv(CACHE_DIR_ENV)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_dir() == tmp_path / "rfc-lookup"
+
+
+def test_default_cache_dir_home(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test the cache directory falls back to the home directory."""
+    monkeypatch.delenv(CACHE_DIR_ENV)
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert default_cache_dir() == tmp_path / ".cache" / "rfc-lookup"
+
+
+def test_default_cache_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the cache size limit is read from the environment."""
+    monkeypatch.delenv(CACHE_SIZE_ENV, raising=False)
+    assert default_cache_size() == DEFAULT_CACHE_SIZE
+
+    monkeypatch.setenv(CACHE_SIZE_ENV, "1024")
+    assert default_cache_size() == 1024
+
+    monkeypatch.setenv(CACHE_SIZE_ENV, "lots")
+    assert default_cache_size() == DEFAULT_CACHE_SIZE
+
+
+def test_cache_roundtrip(tmp_path: Path) -> None:
+    """Test values can be stored and read back."""
+    cache = DiskCache(tmp_path, max_size=1024)
+    assert cache.get("key") is None
+    cache.set("key", b"value")
+    assert cache.get("key") == b"value"
+    assert cache.size() == 5
+
+
+def test_cache_disabled(tmp_path: Path) -> None:
+    """Test a zero size limit disables the cache."""
+    cache = DiskCache(tmp_path, max_size=0)
+    cache.set("key", b"value")
+    assert cache.get("key") is None
+    assert not (tmp_path / "objects").exists()
+
+
+def test_cache_skips_oversized(tmp_path: Path) -> None:
+    """Test entries larger than the limit are not stored."""
+    cache = DiskCache(tmp_path, max_size=4)
+    cache.set("key", b"value")
+    assert cache.get("key") is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Test the least recently used entry is evicted first."""
+    cache = DiskCache(tmp_path, max_size=10)
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    os.utime(cache._entry_path("a"), (0, 0))
+    os.utime(cache._entry_path("b"), (1, 1))
+    # Reading "a" makes it the most recently used entry
+    assert cache.get("a") == b"aaaa"
+
+    cache.set("c", b"cccc")
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"cccc"
+
+
+def test_cache_tracks_size(tmp_path: Path) -> None:
+    """Test the directory is only scanned again to evict entries."""
+    with patch.object(
+        DiskCache, "_entries", autospec=True, side_effect=DiskCache._entries
+    ) as mock_entries:
+        DiskCache(tmp_path, max_size=10).set("a", b"aaaa")
+        assert mock_entries.call_count == 1
+
+        # Replacing an entry only counts the difference in size
+        for _ in range(3):
+            DiskCache(tmp_path, max_size=10).set("a", b"aaaa")
+        with DiskCache(tmp_path, max_size=10).writer("b") as sink:
+            sink.write(b"bbbb")
+        assert mock_entries.call_count == 1
+
+        DiskCache(tmp_path, max_size=10).set("c", b"cccc")
+        assert mock_entries.call_count == 2
+    assert DiskCache(tmp_path).size() == 8
+
+
+def test_cache_evict(tmp_path: Path) -> None:
+    """Test eviction skips partial writes and stops once under the limit."""
+    cache = DiskCache(tmp_path, max_size=12)
+    for key in "abc":
+        cache.set(key, b"xxxx")
+    partial = cache._entry_path("d").with_suffix(".tmp")
+    partial.parent.mkdir(parents=True, exist_ok=True)
+    partial.write_bytes(b"x" * 100)
+    assert cache.size() == 12
+    cache.evict()
+    assert cache.size() == 12
+
+    # Entries that cannot be removed are skipped
+    cache.max_size = 4
+    with patch.object(Path, "unlink", side_effect=OSError):
+        cache.evict()
+    assert cache.size() == 12
+    cache.evict()
+    assert cache.size() == 4
+    assert partial.exists()
+
+
+def test_cache_write_error(tmp_path: Path) -> None:
+    """Test write failures are ignored."""
+    blocker = tmp_path / "file"
+    blocker.write_bytes(b"")
+    cache = DiskCache(blocker, max_size=1024)
+    cache.set("key", b"value")
+    assert cache.get("key") is None
+
+
+def test_cache_clear(tmp_path: Path) -> None:
+    """Test clearing removes all entries."""
+    cache = DiskCache(tmp_path, max_size=1024)
+    cache.set("a", b"a")
+    cache.set("b", b"b")
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_get_default_cache(isolated_cache_dir: Path) -> None:
+    """Test the default cache uses the environment configuration."""
+    assert get_default_cache().path == isolated_cache_dir
+
+
+def test_default_index_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the index TTL is read from the environment."""
+    monkeypatch.delenv(INDEX_TTL_ENV, raising=False)
+    assert default_index_ttl() == DEFAULT_INDEX_TTL
+
+    monkeypatch.setenv(INDEX_TTL_ENV, "30")
+    assert default_index_ttl() == 30
+
+    monkeypatch.setenv(INDEX_TTL_ENV, "soon")
+    assert default_index_ttl() == DEFAULT_INDEX_TTL
+
+
+def test_index_cache_roundtrip(tmp_path: Path) -> None:
+    """Test the index state and content can be stored and loaded."""
+    cache = IndexCache(tmp_path, ttl=60)
+    assert cache.load() is None
+
+    state = IndexState(ids=[1, 2], etag='"abc"')
+    cache.save(state, b"index")
+    assert cache.load() == state
+    assert cache.content_path.read_bytes() == b"index"
+    assert cache.load_content() == "index"
+
+
+def test_index_cache_search(tmp_path: Path) -> None:
+    """Test the search index is stored next to a versioned index text."""
+    cache = IndexCache(tmp_path)
+    assert cache.content_version() is None
+    assert cache.load_search() is None
+
+    cache.save(IndexState(ids=[1]), b"index")
+    assert cache.content_version() is not None
+    cache.save_search(b"search")
+    assert cache.load_search() == b"search"
+
+
+def test_index_cache_clear(tmp_path: Path) -> None:
+    """Test clearing removes the index state and content."""
+    cache = IndexCache(tmp_path)
+    cache.save(IndexState(ids=[1]), b"index")
+    cache.save_search(b"search")
+    cache.clear()
+    assert cache.load() is None
+    assert cache.load_content() is None
+    assert cache.load_search() is None
+    cache.clear()
+
+
+def test_index_cache_freshness(tmp_path: Path) -> None:
+    """Test the TTL decides whether a state is fresh."""
+    cache = IndexCache(tmp_path, ttl=60)
+    state = IndexState(ids=[1])
+    assert not cache.is_fresh(state)
+    cache.touch(state)
+    assert cache.is_fresh(state)
+    assert cache.load() == state
+
+
+def test_index_cache_corrupt(tmp_path: Path) -> None:
+    """Test an unreadable state file is ignored."""
+    cache = IndexCache(tmp_path)
+    cache.state_path.parent.mkdir(parents=True)
+    cache.state_path.write_text("{not json", encoding="utf-8")
+    assert cache.load() is None
+
+
+def test_index_cache_write_error(tmp_path: Path) -> None:
+    """Test write failures are ignored."""
+    blocker = tmp_path / "file"
+    blocker.write_bytes(b"")
+    cache = IndexCache(blocker)
+    cache.save(IndexState(ids=[1]), b"index")
+    assert cache.load() is None
+    cache.save_search(b"search")
+    assert cache.load_search() is None
+    cache.save_snapshot(b"snapshot")
+    assert not cache.snapshot_path.exists()
+
+
+def test_index_cache_write_interrupted(tmp_path: Path) -> None:
+    """Test a failed write leaves no temporary file behind."""
+    cache = IndexCache(tmp_path)
+    with patch("rfc_lookup.cache.os.replace", side_effect=OSError):
+        cache.save(IndexState(ids=[1]), b"index")
+    assert cache.load() is None
+    assert list(tmp_path.rglob("*.tmp")) == []
+
+
+def test_get_default_index_cache(isolated_cache_dir: Path) -> None:
+    """Test the default index cache uses the environment configuration."""
+    assert get_default_index_cache().path == isolated_cache_dir
+
+
+def test_cache_open(tmp_path: Path) -> None:
+    """Test cached entries can be opened for streaming."""
+    cache = DiskCache(tmp_path, max_size=1024)
+    assert not cache.contains("key")
+    assert cache.open("key") is None
+    cache.set("key", b"value")
+    assert cache.contains("key")
+
+    f = cache.open("key")
+    assert f is not None
+    with f:
+        assert f.read() == b"value"
+
+    assert DiskCache(tmp_path, max_size=0).open("key") is None
+
+
+def test_cache_writer(tmp_path: Path) -> None:
+    """Test entries can be written incrementally."""
+    cache = DiskCache(tmp_path, max_size=1024)
+    with cache.writer("key") as sink:
+        sink.write(b"val")
+        assert cache.get("key") is None
+        sink.write(b"ue")
+    assert cache.get("key") == b"value"
+    assert list(tmp_path.glob("objects/*/*.tmp")) == []
+
+
+def test_cache_writer_error(tmp_path: Path) -> None:
+    """Test entries are discarded when writing is interrupted."""
+    cache = DiskCache(tmp_path, max_size=1024)
+    with pytest.raises(RuntimeError):
+        with cache.writer("key") as sink:
+            sink.write(b"val")
+            raise RuntimeError("interrupted")
+    assert cache.get("key") is None
+    assert list(tmp_path.glob("objects/*/*.tmp")) == []
+
+
+def test_cache_writer_oversized(tmp_path: Path) -> None:
+    """Test entries growing past the size limit are discarded."""
+    cache = DiskCache(tmp_path, max_size=4)
+    with cache.writer("key") as sink:
+        sink.write(b"val")
+        sink.write(b"ue")
+        sink.write(b"!")
+    assert cache.get("key") is None
+    assert list(tmp_path.glob("objects/*/*.tmp")) == []
+
+
+def test_cache_writer_disabled(tmp_path: Path) -> None:
+    """Test writers do nothing when the cache is disabled or unwritable."""
+    with DiskCache(tmp_path, max_size=0).writer("key") as sink:
+        sink.write(b"value")
+    assert not (tmp_path / "objects").exists()
+
+    blocker = tmp_path / "file"
+    blocker.write_bytes(b"")
+    cache = DiskCache(blocker, max_size=1024)
+    with cache.writer("key") as sink:
+        sink.write(b"value")
+    assert cache.get("key") is None
@@ -0,0 +1,86 @@
+"""Tests for client module."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from rfc_lookup.client import ServerClient, find_server, server_file_path
+from rfc_lookup.constants import SERVER_URL_ENV
+from rfc_lookup.errors import ServerUnavailableError
+
+
+def test_find_server_none() -> None:
+    """Test no server is found when none is announced."""
+    assert find_server() is None
+
+
+def test_find_server_from_file(isolated_cache_dir: Path) -> None:
+    """Test the server announced in the cache directory is found."""
+    isolated_cache_dir.mkdir(parents=True)
+    server_file_path().write_text(
+        json.dumps({"url": "http://127.0.0.1:8123", "pid": 1})
+    )
+
+    server = find_server()
+    assert server is not None
+    assert server.host == "127.0.0.1"
+    assert server.port == 8123
+
+
+def test_find_server_ignores_broken_file(isolated_cache_dir: Path) -> None:
+    """Test an unreadable server file is ignored."""
+    isolated_cache_dir.mkdir(parents=True)
+    server_file_path().write_text("not json")
+    assert find_server() is None
+
+
+def test_find_server_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the environment variable takes precedence."""
+    monkeypatch.setenv(SERVER_URL_ENV, "http://localhost:9000")
+
+    server = find_server()
+    assert server is not None
+    assert server.url == "http://localhost:9000"
+
+
+def test_client_unavailable() -> None:
+    """Test a server that is not listening is reported as unavailable."""
+    # Port 9 (discard) is closed on test machines
+    client = ServerClient("http://127.0.0.1:9", timeout=1.0)
+    with pytest.raises(ServerUnavailableError):
+        client.get_latest_report_ids()
+
+
+class NotJsonHandler(BaseHTTPRequestHandler):
+    """Handler answering every request with a body that is not JSON."""
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Answer with plain text."""
+        body = b"not json"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep the test output quiet."""
+
+
+def test_client_invalid_response() -> None:
+    """Test a server answering with something else than JSON is unusable."""
+    server = HTTPServer(("127.0.0.1", 0), NotJsonHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        client = ServerClient(f"http://{host!s}:{port}")
+        with pytest.raises(ServerUnavailableError, match="Invalid response"):
+            client.get_latest_report_ids()
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -1,13 +1,35 @@
 """Tests for Command Line functionality."""
 
+import datetime
 import os
+import subprocess  # noqa: S404
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
 from unittest.mock import Mock, patch
 
 import pytest
 from click.testing import CliRunner
 
+from rfc_lookup.cache import IndexCache
 from rfc_lookup.command import cli
-from rfc_lookup.errors import NetworkError
+from rfc_lookup.constants import (
+    DEFAULT_MAX_WORKERS,
+    MIRROR_DIR_ENV,
+    SERVER_URL_ENV,
+)
+from rfc_lookup.errors import (
+    InvalidRfcIdError,
+    NetworkError,
+    ServerUnavailableError,
+    StoreError,
+)
+from rfc_lookup.filters import SearchFilters
+from rfc_lookup.server import RfcServer
+from rfc_lookup.utilities import HttpResponse
+
+from .test_graph import INDEX as GRAPH_INDEX
 
 
 @pytest.fixture
@@ -40,12 +62,45 @@ def test_cli_no_cmd(cli_runner: CliRunner) -> None:
     assert mock_help in result.output
 
 
+# Modules that only the commands doing network or parsing work may import
+DEFERRED_MODULES = [
+    "bs4",
+    "concurrent.futures",
+    "html.parser",
+    "http.client",
+    "importlib.metadata",
+    "json",
+    "urllib.parse",
+    "urllib.request",
+    "webbrowser",
+    "rfc_lookup.utilities",
+]
+
+
+@pytest.mark.parametrize("args", [["--help"], ["get", "--url", "1-3"]])
+def test_cli_defers_imports(args: List[str]) -> None:
+    """Test commands that need no network access skip the heavy imports."""
+    script = (
+        "import sys\n"
+        "from rfc_lookup.command import cli\n"
+        f"cli.main({args!r}, standalone_mode=False)\n"
+        f"print(sorted(set({DEFERRED_MODULES!r}) & set(sys.modules)))\n"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert result.stdout.splitlines()[-1] == "[]"
+
+
 # ---------------------------------------------------------------------------
 # rfc get
 # ---------------------------------------------------------------------------
 
 
-@patch("rfc_lookup.command.get_rfc_report")
+@patch("rfc_lookup.utilities.get_rfc_report")
 def test_cli_rfc_get_report(
     mock_get_rfc_report: Mock, cli_runner: CliRunner
 ) -> None:
@@ -56,7 +111,7 @@ def test_cli_rfc_get_report(
     assert "RFC Report" in result.output
 
 
-@patch("rfc_lookup.command.get_rfc_report")
+@patch("rfc_lookup.utilities.get_rfc_report")
 def test_cli_rfc_get_report_url_only(
     mock_get_rfc_report: Mock, cli_runner: CliRunner
 ) -> None:
@@ -67,14 +122,14 @@ def test_cli_rfc_get_report_url_only(
     assert "https://www.rfc-editor.org/rfc/rfc1234" in result.output
 
 
-@patch("rfc_lookup.command.get_rfc_report")
+@patch("rfc_lookup.utilities.iter_rfc_report")
 def test_cli_rfc_get_report_output_file(
-    mock_get_rfc_report: Mock, cli_runner: CliRunner, tmp_path: object
+    mock_iter_rfc_report: Mock, cli_runner: CliRunner, tmp_path: object
 ) -> None:
-    """Test the CLI get command writes to a file with --output."""
+    """Test the CLI get command streams to a file with --output."""
     import tempfile
 
-    mock_get_rfc_report.return_value = "RFC Content"
+    mock_iter_rfc_report.return_value = iter([b"RFC ", b"Content"])
     with tempfile.NamedTemporaryFile(
         mode="w", suffix=".txt", delete=False
     ) as tmp:
@@ -90,6 +145,71 @@ def test_cli_rfc_get_report_output_file(
         os.unlink(tmp_name)
 
 
+@patch("rfc_lookup.utilities.iter_rfc_report")
+def test_cli_rfc_get_report_output_file_error(
+    mock_iter_rfc_report: Mock, cli_runner: CliRunner, tmp_path: Path
+) -> None:
+    """Test the CLI get command removes the --output file on failure."""
+    mock_iter_rfc_report.side_effect = InvalidRfcIdError("Invalid RFC ID")
+    output = tmp_path / "rfc.txt"
+    result = cli_runner.invoke(cli, ["get", "1234", "--output", str(output)])
+    assert result.exit_code == 1
+    assert "Invalid RFC ID" in result.output
+    assert not output.exists()
+
+
+@pytest.mark.parametrize(
+    "error", [InvalidRfcIdError("Invalid RFC ID"), NetworkError("Offline")]
+)
+@patch("rfc_lookup.utilities.iter_rfc_report")
+def test_cli_rfc_get_report_output_file_kept(
+    mock_iter_rfc_report: Mock,
+    error: Exception,
+    cli_runner: CliRunner,
+    tmp_path: Path,
+) -> None:
+    """Test the CLI get command leaves an existing --output file on failure."""
+    mock_iter_rfc_report.side_effect = error
+    output = tmp_path / "important.txt"
+    output.write_text("keep me", encoding="utf-8")
+    result = cli_runner.invoke(cli, ["get", "99999", "-o", str(output)])
+    assert result.exit_code == 1
+    assert output.read_text(encoding="utf-8") == "keep me"
+    assert list(tmp_path.iterdir()) == [output]
+
+
+@patch("rfc_lookup.utilities.iter_rfc_report")
+def test_cli_rfc_get_report_format(
+    mock_iter_rfc_report: Mock, cli_runner: CliRunner, tmp_path: Path
+) -> None:
+    """Test the CLI get command fetches other formats as raw bytes."""
+    pdf = b"%PDF-1.4\n\x00\xff\xfe\r\n%%EOF"
+    mock_iter_rfc_report.side_effect = lambda *args: iter([pdf[:7], pdf[7:]])
+    result = cli_runner.invoke(cli, ["get", "8446", "--format", "PDF"])
+    assert result.exit_code == 0
+    assert result.stdout_bytes == pdf
+    assert mock_iter_rfc_report.call_args.args[3] == "pdf"
+
+    output = tmp_path / "rfc8446.pdf"
+    result = cli_runner.invoke(
+        cli, ["get", "8446", "-f", "pdf", "-o", str(output)]
+    )
+    assert result.exit_code == 0
+    assert output.read_bytes() == pdf
+
+
+def test_cli_rfc_get_url_format(cli_runner: CliRunner) -> None:
+    """Test the CLI get command shows the URL of the chosen format."""
+    result = cli_runner.invoke(cli, ["get", "8446", "--url", "-f", "xml"])
+    assert result.output == "https://www.rfc-editor.org/rfc/rfc8446.xml\n"
+
+
+def test_cli_rfc_get_unknown_format(cli_runner: CliRunner) -> None:
+    """Test the CLI get command rejects unknown formats."""
+    result = cli_runner.invoke(cli, ["get", "8446", "--format", "docx"])
+    assert result.exit_code == 2
+
+
 @patch("rfc_lookup.utilities.get_latest_report_ids")
 def test_cli_rfc_get_report_out_of_range(
     mock_get_latest_report_ids: Mock, cli_runner: CliRunner
@@ -111,12 +231,103 @@ def test_cli_rfc_get_invalid_id(cli_runner: CliRunner) -> None:
     result = cli_runner.invoke(cli, ["get", mock_value])
     assert result.exit_code == 2
     assert (
-        f"Error: Invalid value for 'ID': {mock_value!r} is not a valid integer"
+        f"Error: Invalid value for 'ID...': {mock_value!r} is not a valid integer"
         in result.output
     )
 
 
-@patch("rfc_lookup.command.get_rfc_report")
+def test_cli_rfc_get_invalid_range(cli_runner: CliRunner) -> None:
+    """Test the CLI get command rejects reversed ranges."""
+    result = cli_runner.invoke(cli, ["get", "10-5"])
+    assert result.exit_code == 2
+    assert "'10-5' is not a valid range" in result.output
+
+
+def test_cli_rfc_get_url_many(cli_runner: CliRunner) -> None:
+    """Test the CLI get command prints URLs for IDs and ranges."""
+    result = cli_runner.invoke(cli, ["get", "791", "8000-8002", "791", "--url"])
+    assert result.exit_code == 0
+    assert result.output.split() == [
+        f"https://www.rfc-editor.org/rfc/rfc{i}.html"
+        for i in (791, 8000, 8001, 8002)
+    ]
+
+
+def test_cli_rfc_get_many_requires_output_dir(cli_runner: CliRunner) -> None:
+    """Test the CLI get command refuses to print several RFCs to stdout."""
+    result = cli_runner.invoke(cli, ["get", "791", "793"])
+    assert result.exit_code == 2
+    assert "--output-dir" in result.output
+
+
+def test_cli_rfc_get_output_and_output_dir(
+    cli_runner: CliRunner, tmp_path: Path
+) -> None:
+    """Test the CLI get command refuses both an output file and directory."""
+    result = cli_runner.invoke(
+        cli,
+        ["get", "791", "-o", str(tmp_path / "rfc791.txt")]
+        + ["--output-dir", str(tmp_path)],
+    )
+    assert result.exit_code == 2
+    assert "--output and --output-dir cannot be combined" in result.output
+    assert list(tmp_path.iterdir()) == []
+
+
+@patch("rfc_lookup.utilities.save_rfc_reports")
+def test_cli_rfc_get_output_dir(
+    mock_save_rfc_reports: Mock, cli_runner: CliRunner, tmp_path: Path
+) -> None:
+    """Test the CLI get command saves several RFCs to a directory."""
+    output_dir = tmp_path / "rfcs"
+    mock_save_rfc_reports.return_value = iter(
+        [(793, f"{output_dir}/rfc793.txt"), (791, f"{output_dir}/rfc791.txt")]
+    )
+    result = cli_runner.invoke(
+        cli, ["get", "791", "793", "--output-dir", str(output_dir), "-j", "2"]
+    )
+    assert result.exit_code == 0
+    assert output_dir.is_dir()
+    mock_save_rfc_reports.assert_called_once_with(
+        [791, 793], str(output_dir), max_workers=2, fmt="txt"
+    )
+    assert f"RFC 791 saved to {output_dir}/rfc791.txt" in result.output
+    assert f"Saved 2 of 2 RFCs to {output_dir}." in result.output
+
+
+@patch("rfc_lookup.utilities.save_rfc_reports")
+def test_cli_rfc_get_output_dir_failures(
+    mock_save_rfc_reports: Mock, cli_runner: CliRunner, tmp_path: Path
+) -> None:
+    """Test the CLI get command summarizes failed downloads."""
+    mock_save_rfc_reports.return_value = iter(
+        [
+            (791, f"{tmp_path}/rfc791.txt"),
+            (99999, InvalidRfcIdError("Invalid RFC ID 99999")),
+            (793, NetworkError("timeout")),
+        ]
+    )
+    result = cli_runner.invoke(
+        cli, ["get", "791", "793", "99999", "-d", str(tmp_path)]
+    )
+    assert result.exit_code == 1
+    assert "RFC 793 failed: timeout" in result.output
+    assert "Saved 1 of 3 RFCs" in result.output
+    assert "Failed: 793, 99999" in result.output
+
+
+@patch("rfc_lookup.utilities.save_rfc_reports")
+def test_cli_rfc_get_output_dir_network_error(
+    mock_save_rfc_reports: Mock, cli_runner: CliRunner, tmp_path: Path
+) -> None:
+    """Test the CLI get command handles NetworkError fetching the index."""
+    mock_save_rfc_reports.side_effect = NetworkError("timeout")
+    result = cli_runner.invoke(cli, ["get", "791", "-d", str(tmp_path)])
+    assert result.exit_code == 1
+    assert "Network error" in result.output
+
+
+@patch("rfc_lookup.utilities.get_rfc_report")
 def test_cli_rfc_get_network_error(
     mock_get_rfc_report: Mock, cli_runner: CliRunner
 ) -> None:
@@ -132,7 +343,7 @@ def test_cli_rfc_get_network_error(
 # ---------------------------------------------------------------------------
 
 
-@patch("rfc_lookup.command.search_rfc_editor")
+@patch("rfc_lookup.utilities.search_rfc_editor")
 def test_cli_rfc_search(
     mock_search_rfc_editor: Mock, cli_runner: CliRunner
 ) -> None:
@@ -143,7 +354,7 @@ def test_cli_rfc_search(
         {"id": 5678, "title": "RFC Report 2"},
     ]
     mock_search_rfc_editor.return_value = mock_search_results
-    result = cli_runner.invoke(cli, ["search", mock_search_value])
+    result = cli_runner.invoke(cli, ["search", mock_search_value, "--online"])
     assert result.exit_code == 0
     assert (
         f"Search {mock_search_value!r} with {len(mock_search_results)} results."
@@ -155,7 +366,7 @@ def test_cli_rfc_search(
     )
 
 
-@patch("rfc_lookup.command.search_rfc_editor")
+@patch("rfc_lookup.utilities.search_rfc_editor")
 def test_cli_rfc_search_verbose(
     mock_search_rfc_editor: Mock, cli_runner: CliRunner
 ) -> None:
@@ -170,31 +381,187 @@ def test_cli_rfc_search_verbose(
         }
     ]
     mock_search_rfc_editor.return_value = mock_search_results
-    result = cli_runner.invoke(cli, ["search", "http", "--verbose"])
+    result = cli_runner.invoke(cli, ["search", "http", "--verbose", "--online"])
     assert result.exit_code == 0
     assert "A. Author, B. Author" in result.output
     assert "Proposed Standard" in result.output
     assert "January 2000" in result.output
 
 
-@patch("rfc_lookup.command.search_rfc_editor")
+@patch("rfc_lookup.utilities.search_rfc_editor")
 def test_cli_rfc_search_network_error(
     mock_search_rfc_editor: Mock, cli_runner: CliRunner
 ) -> None:
     """Test the CLI search command handles NetworkError."""
     mock_search_rfc_editor.side_effect = NetworkError("timeout")
-    result = cli_runner.invoke(cli, ["search", "http"])
+    result = cli_runner.invoke(cli, ["search", "http", "--online"])
     assert result.exit_code == 1
     assert "Network error" in result.output
 
 
+@patch("rfc_lookup.utilities.search_rfc_editor")
+@patch("rfc_lookup.search.search_local")
+def test_cli_rfc_search_online_default(
+    mock_search_local: Mock,
+    mock_search_rfc_editor: Mock,
+    cli_runner: CliRunner,
+) -> None:
+    """Test the CLI search command queries the RFC Editor by default."""
+    mock_search_rfc_editor.return_value = [{"id": 8446, "title": "TLS 1.3"}]
+    result = cli_runner.invoke(cli, ["search", "tls"])
+    assert result.exit_code == 0
+    assert "8446: TLS 1.3" in result.output
+    mock_search_rfc_editor.assert_called_once_with("tls", SearchFilters())
+    mock_search_local.assert_not_called()
+
+
+@patch("rfc_lookup.utilities.search_rfc_editor")
+@patch("rfc_lookup.search.search_local")
+def test_cli_rfc_search_local(
+    mock_search_local: Mock,
+    mock_search_rfc_editor: Mock,
+    cli_runner: CliRunner,
+) -> None:
+    """Test the CLI search command uses the local index with --offline."""
+    mock_search_local.return_value = [{"id": 8446, "title": "TLS 1.3"}]
+    result = cli_runner.invoke(cli, ["search", "tls", "--offline"])
+    assert result.exit_code == 0
+    assert "8446: TLS 1.3" in result.output
+    mock_search_local.assert_called_once_with("tls", filters=SearchFilters())
+    mock_search_rfc_editor.assert_not_called()
+
+
+@patch("rfc_lookup.utilities.search_rfc_editor")
+def test_cli_rfc_search_filters(
+    mock_search_rfc_editor: Mock, cli_runner: CliRunner
+) -> None:
+    """Test the CLI search command passes its filters on."""
+    mock_search_rfc_editor.return_value = [{"id": 8446, "title": "TLS 1.3"}]
+    result = cli_runner.invoke(
+        cli,
+        [
+            "search",
+            "tls",
+            "--online",
+            "--status",
+            "Proposed Standard",
+            "--since",
+            "2018-03",
+            "--until",
+            "2020",
+            "--author",
+            "Rescorla",
+            "--limit",
+            "5",
+        ],
+    )
+    assert result.exit_code == 0
+    mock_search_rfc_editor.assert_called_once_with(
+        "tls",
+        SearchFilters(
+            status="proposed standard",
+            since=datetime.date(2018, 3, 1),
+            until=datetime.date(2020, 12, 1),
+            author="Rescorla",
+            limit=5,
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--since", "2018-13"],
+        ["--since", "soon"],
+        ["--until", "2018-00"],
+        ["--since", "2020", "--until", "2019-12"],
+        ["--limit", "0"],
+    ],
+)
+def test_cli_rfc_search_invalid_filters(
+    args: List[str], cli_runner: CliRunner
+) -> None:
+    """Test the CLI search command rejects invalid filters."""
+    result = cli_runner.invoke(cli, ["search", "tls", *args])
+    assert result.exit_code == 2
+
+
+@patch("rfc_lookup.store.search_store")
+def test_cli_rfc_search_store(
+    mock_search_store: Mock, cli_runner: CliRunner
+) -> None:
+    """Test the CLI search command queries the metadata store with --local."""
+    mock_search_store.return_value = [{"id": 8446, "title": "TLS 1.3"}]
+    result = cli_runner.invoke(cli, ["search", "tls", "--local", "--limit=1"])
+    assert result.exit_code == 0
+    assert "8446: TLS 1.3" in result.output
+    mock_search_store.assert_called_once_with(
+        "tls", filters=SearchFilters(limit=1)
+    )
+
+    mock_search_store.side_effect = StoreError("no FTS5")
+    result = cli_runner.invoke(cli, ["search", "tls", "--local"])
+    assert result.exit_code == 1
+    assert "Store error: no FTS5" in result.output
+
+
+def test_cli_rfc_search_local_online(cli_runner: CliRunner) -> None:
+    """Test --local and --online cannot be combined."""
+    result = cli_runner.invoke(cli, ["search", "tls", "--local", "--online"])
+    assert result.exit_code == 2
+    assert "cannot be combined" in result.output
+
+
+@patch("rfc_lookup.utilities.iter_search_rfc_editor")
+def test_cli_rfc_search_stream(
+    mock_iter_search_rfc_editor: Mock, cli_runner: CliRunner
+) -> None:
+    """Test streamed results are printed before the count."""
+    mock_iter_search_rfc_editor.return_value = iter(
+        [{"id": 1234, "title": "RFC Report 1"}]
+    )
+    result = cli_runner.invoke(cli, ["search", "tcp", "--online", "--stream"])
+    assert result.exit_code == 0
+    assert result.output == (
+        "1234: RFC Report 1\nSearch 'tcp' with 1 results.\n"
+    )
+
+
+@patch("rfc_lookup.search.search_local")
+def test_cli_rfc_search_stream_local(
+    mock_search_local: Mock, cli_runner: CliRunner
+) -> None:
+    """Test local results can be printed with the count last."""
+    mock_search_local.return_value = []
+    result = cli_runner.invoke(cli, ["search", "tcp", "--offline", "--stream"])
+    assert result.exit_code == 0
+    assert result.output == "Search 'tcp' with 0 results.\n"
+
+
+@patch("rfc_lookup.utilities.iter_search_rfc_editor")
+def test_cli_rfc_search_stream_network_error(
+    mock_iter_search_rfc_editor: Mock, cli_runner: CliRunner
+) -> None:
+    """Test a stream cut short by a network error."""
+
+    def results() -> Iterator[Dict[str, Any]]:
+        yield {"id": 1234, "title": "RFC Report 1"}
+        raise NetworkError("reset")
+
+    mock_iter_search_rfc_editor.return_value = results()
+    result = cli_runner.invoke(cli, ["search", "tcp", "--online", "--stream"])
+    assert result.exit_code == 1
+    assert "1234: RFC Report 1" in result.output
+    assert "Network error: reset" in result.output
+
+
 # ---------------------------------------------------------------------------
 # rfc open
 # ---------------------------------------------------------------------------
 
 
-@patch("rfc_lookup.command.webbrowser.open")
-@patch("rfc_lookup.command.get_latest_report_ids")
+@patch("webbrowser.open")
+@patch("rfc_lookup.utilities.get_latest_report_ids")
 def test_cli_rfc_open_browser(
     mock_get_latest_report_ids: Mock,
     mock_browser_open: Mock,
@@ -209,8 +576,8 @@ def test_cli_rfc_open_browser(
     )
 
 
-@patch("rfc_lookup.command.get_rfc_report")
-@patch("rfc_lookup.command.get_latest_report_ids")
+@patch("rfc_lookup.utilities.get_rfc_report")
+@patch("rfc_lookup.utilities.get_latest_report_ids")
 def test_cli_rfc_open_text(
     mock_get_latest_report_ids: Mock,
     mock_get_rfc_report: Mock,
@@ -224,7 +591,7 @@ def test_cli_rfc_open_text(
     assert "RFC plain text content" in result.output
 
 
-@patch("rfc_lookup.command.get_latest_report_ids")
+@patch("rfc_lookup.utilities.get_latest_report_ids")
 def test_cli_rfc_open_out_of_range(
     mock_get_latest_report_ids: Mock, cli_runner: CliRunner
 ) -> None:
@@ -235,7 +602,7 @@ def test_cli_rfc_open_out_of_range(
     assert "Invalid RFC ID" in result.output
 
 
-@patch("rfc_lookup.command.get_latest_report_ids")
+@patch("rfc_lookup.utilities.get_latest_report_ids")
 def test_cli_rfc_open_network_error_ids(
     mock_get_latest_report_ids: Mock, cli_runner: CliRunner
 ) -> None:
@@ -246,8 +613,8 @@ def test_cli_rfc_open_network_error_ids(
     assert "Network error" in result.output
 
 
-@patch("rfc_lookup.command.get_rfc_report")
-@patch("rfc_lookup.command.get_latest_report_ids")
+@patch("rfc_lookup.utilities.get_rfc_report")
+@patch("rfc_lookup.utilities.get_latest_report_ids")
 def test_cli_rfc_open_text_network_error(
     mock_get_latest_report_ids: Mock,
     mock_get_rfc_report: Mock,
@@ -259,3 +626,309 @@ def test_cli_rfc_open_text_network_error(
     result = cli_runner.invoke(cli, ["open", "1234", "--text"])
     assert result.exit_code == 1
     assert "Network error" in result.output
+
+
+# ---------------------------------------------------------------------------
+# rfc graph
+# ---------------------------------------------------------------------------
+
+
+@patch("rfc_lookup.utilities.get_response")
+def test_cli_rfc_graph(mock_get_response: Mock, cli_runner: CliRunner) -> None:
+    """Test the CLI graph command follows obsoleted-by relations."""
+    mock_get_response.return_value = HttpResponse(200, GRAPH_INDEX.encode())
+    result = cli_runner.invoke(cli, ["graph", "2068"])
+    assert result.exit_code == 0
+    assert result.output == (
+        "RFC 2068 is obsoleted by 5 RFCs.\n"
+        "2616: Hypertext Transfer Protocol -- HTTP/1.1\n"
+        "7230: HTTP/1.1: Message Syntax and Routing [2]\n"
+        "7231: HTTP/1.1: Semantics and Content [2]\n"
+        "9110: HTTP Semantics [3]\n"
+        "9112: (not in the index) [3]\n"
+        "Current: 9110, 9112\n"
+    )
+
+
+@patch("rfc_lookup.utilities.get_response")
+def test_cli_rfc_graph_relations(
+    mock_get_response: Mock, cli_runner: CliRunner
+) -> None:
+    """Test the CLI graph command follows the chosen relation and depth."""
+    mock_get_response.return_value = HttpResponse(200, GRAPH_INDEX.encode())
+    result = cli_runner.invoke(cli, ["graph", "2616", "--updated-by"])
+    assert result.exit_code == 0
+    assert result.output == (
+        "RFC 2616 is updated by 1 RFCs.\n"
+        "2817: Upgrading to TLS Within HTTP/1.1\n"
+    )
+
+    result = cli_runner.invoke(cli, ["graph", "9110", "--obsoletes"])
+    assert "RFC 9110 obsoletes 4 RFCs." in result.output
+
+    result = cli_runner.invoke(
+        cli, ["graph", "9110", "--obsoletes", "--depth", "1"]
+    )
+    assert "RFC 9110 obsoletes 2 RFCs." in result.output
+
+
+@patch("rfc_lookup.utilities.get_response")
+def test_cli_rfc_graph_errors(
+    mock_get_response: Mock, cli_runner: CliRunner
+) -> None:
+    """Test the CLI graph command reports unknown RFCs and network errors."""
+    mock_get_response.side_effect = NetworkError("offline")
+    result = cli_runner.invoke(cli, ["graph", "2068"])
+    assert result.exit_code == 1
+    assert "Network error: offline" in result.output
+
+    mock_get_response.side_effect = None
+    mock_get_response.return_value = HttpResponse(200, GRAPH_INDEX.encode())
+    result = cli_runner.invoke(cli, ["graph", "1"])
+    assert result.exit_code == 1
+    assert "RFC 1 is not in the RFC index" in result.output
+
+
+# ---------------------------------------------------------------------------
+# rfc index
+# ---------------------------------------------------------------------------
+
+
+@patch("rfc_lookup.snapshot.build_index_snapshot")
+def test_cli_rfc_index_build(
+    mock_build_index_snapshot: Mock, cli_runner: CliRunner
+) -> None:
+    """Test the CLI index build command compiles the snapshot."""
+    mock_build_index_snapshot.return_value.__len__.return_value = 9000
+    result = cli_runner.invoke(cli, ["index", "build"])
+    assert result.exit_code == 0
+    assert "Compiled 9000 RFCs into" in result.output
+    assert "rfc-index-latest.snap" in result.output
+
+
+@patch("rfc_lookup.snapshot.build_index_snapshot")
+def test_cli_rfc_index_build_network_error(
+    mock_build_index_snapshot: Mock, cli_runner: CliRunner
+) -> None:
+    """Test the CLI index build command handles NetworkError."""
+    mock_build_index_snapshot.side_effect = NetworkError("timeout")
+    result = cli_runner.invoke(cli, ["index", "build"])
+    assert result.exit_code == 1
+    assert "Network error" in result.output
+
+
+# ---------------------------------------------------------------------------
+# rfc mirror
+# ---------------------------------------------------------------------------
+
+
+@patch("rfc_lookup.mirror.Mirror.sync")
+@patch("rfc_lookup.index.get_rfc_index")
+def test_cli_rfc_mirror_sync(
+    mock_get_rfc_index: Mock,
+    mock_sync: Mock,
+    cli_runner: CliRunner,
+    tmp_path: Path,
+) -> None:
+    """Test the CLI mirror sync command reports what it fetched."""
+    mock_get_rfc_index.return_value = [Mock(issued=True)] * 3
+    mock_sync.return_value = iter([(1, True), (2, False)])
+    result = cli_runner.invoke(cli, ["mirror", "sync", str(tmp_path)])
+    assert result.exit_code == 0
+    assert "Fetched 1 RFCs, 1 unchanged. 3 of 3 RFCs mirrored" in result.output
+    mock_sync.assert_called_once_with(
+        mock_get_rfc_index.return_value, False, DEFAULT_MAX_WORKERS
+    )
+
+
+@patch("rfc_lookup.mirror.Mirror.sync")
+@patch("rfc_lookup.index.get_rfc_index")
+def test_cli_rfc_mirror_sync_failures(
+    mock_get_rfc_index: Mock,
+    mock_sync: Mock,
+    cli_runner: CliRunner,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the CLI mirror sync command reports failed downloads."""
+    monkeypatch.setenv(MIRROR_DIR_ENV, str(tmp_path))
+    mock_get_rfc_index.return_value = [Mock(issued=True)] * 2
+    mock_sync.return_value = iter([(1, NetworkError("timeout"))])
+    result = cli_runner.invoke(cli, ["mirror", "sync", "--all", "-j", "2"])
+    assert result.exit_code == 1
+    assert "RFC 1 failed: timeout" in result.output
+    assert "1 of 2 RFCs mirrored" in result.output
+    assert "Failed: 1" in result.output
+    mock_sync.assert_called_once_with(mock_get_rfc_index.return_value, True, 2)
+
+
+@patch("rfc_lookup.index.get_rfc_index")
+def test_cli_rfc_mirror_sync_network_error(
+    mock_get_rfc_index: Mock, cli_runner: CliRunner, tmp_path: Path
+) -> None:
+    """Test the CLI mirror sync command handles NetworkError."""
+    mock_get_rfc_index.side_effect = NetworkError("timeout")
+    result = cli_runner.invoke(cli, ["mirror", "sync", str(tmp_path)])
+    assert result.exit_code == 1
+    assert "Network error" in result.output
+
+
+def test_cli_rfc_mirror_sync_requires_directory(cli_runner: CliRunner) -> None:
+    """Test the CLI mirror sync command needs a directory."""
+    result = cli_runner.invoke(cli, ["mirror", "sync"])
+    assert result.exit_code == 2
+
+
+# ---------------------------------------------------------------------------
+# rfc serve
+# ---------------------------------------------------------------------------
+
+
+@patch("rfc_lookup.utilities.get_rfc_report")
+@patch("rfc_lookup.client.ServerClient.get_rfc_report")
+def test_cli_rfc_get_uses_server(
+    mock_server_get: Mock,
+    mock_get_rfc_report: Mock,
+    cli_runner: CliRunner,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the CLI get command asks a running server first."""
+    monkeypatch.setenv(SERVER_URL_ENV, "http://127.0.0.1:9")
+    mock_server_get.return_value = "RFC from server"
+    result = cli_runner.invoke(cli, ["get", "1234"])
+    assert result.exit_code == 0
+    assert "RFC from server" in result.output
+    mock_get_rfc_report.assert_not_called()
+
+
+@patch("rfc_lookup.utilities.get_rfc_report")
+@patch("rfc_lookup.client.ServerClient.get_rfc_report")
+def test_cli_rfc_get_server_unavailable(
+    mock_server_get: Mock,
+    mock_get_rfc_report: Mock,
+    cli_runner: CliRunner,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the CLI get command falls back when the server is down."""
+    monkeypatch.setenv(SERVER_URL_ENV, "http://127.0.0.1:9")
+    mock_server_get.side_effect = ServerUnavailableError("down")
+    mock_get_rfc_report.return_value = "RFC Report"
+    result = cli_runner.invoke(cli, ["get", "1234"])
+    assert result.exit_code == 0
+    assert "RFC Report" in result.output
+
+
+@patch("webbrowser.open")
+@patch("rfc_lookup.utilities.validate_report_id")
+@patch("rfc_lookup.utilities.get_response")
+def test_cli_rfc_open_uses_server(
+    mock_get_response: Mock,
+    mock_validate_report_id: Mock,
+    mock_browser_open: Mock,
+    cli_runner: CliRunner,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Test the CLI open command checks the RFC with a running server."""
+    mock_get_response.return_value = HttpResponse(
+        200, b"0001 One. A. B. June 1999.\n\n0002 Not Issued.\n"
+    )
+    server = RfcServer(("127.0.0.1", 0), index_cache=IndexCache(tmp_path))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv(SERVER_URL_ENV, server.url)
+    try:
+        result = cli_runner.invoke(cli, ["open", "1"])
+        assert result.exit_code == 0
+        mock_browser_open.assert_called_once()
+
+        # Listed in the index, but as "Not Issued"
+        result = cli_runner.invoke(cli, ["open", "2"])
+        assert result.exit_code == 1
+        assert "RFC 2 was never issued" in result.output
+
+        result = cli_runner.invoke(cli, ["open", "3"])
+        assert result.exit_code == 1
+        assert "Invalid RFC ID 3" in result.output
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+    mock_browser_open.assert_called_once()
+    mock_validate_report_id.assert_not_called()
+
+
+@patch("rfc_lookup.utilities.validate_report_id")
+@patch("rfc_lookup.client.ServerClient.validate_report_id")
+def test_cli_rfc_open_server_unavailable(
+    mock_server_validate: Mock,
+    mock_validate_report_id: Mock,
+    cli_runner: CliRunner,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the CLI open command checks the RFC locally without a server."""
+    monkeypatch.setenv(SERVER_URL_ENV, "http://127.0.0.1:9")
+    mock_server_validate.side_effect = ServerUnavailableError("down")
+    mock_validate_report_id.side_effect = InvalidRfcIdError("Invalid RFC ID")
+    result = cli_runner.invoke(cli, ["open", "99999"])
+    assert result.exit_code == 1
+    assert "Invalid RFC ID" in result.output
+    mock_validate_report_id.assert_called_once_with(99999)
+
+
+@patch("rfc_lookup.utilities.validate_report_id")
+@patch("rfc_lookup.client.ServerClient.get_rfc_report")
+def test_cli_rfc_open_text_uses_server(
+    mock_server_get: Mock,
+    mock_validate_report_id: Mock,
+    cli_runner: CliRunner,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the CLI open --text command gets the RFC from a running server."""
+    monkeypatch.setenv(SERVER_URL_ENV, "http://127.0.0.1:9")
+    mock_server_get.return_value = "RFC from server"
+    result = cli_runner.invoke(cli, ["open", "1234", "--text"])
+    assert result.exit_code == 0
+    assert "RFC from server" in result.output
+    mock_validate_report_id.assert_not_called()
+
+
+@patch("rfc_lookup.search.search_local")
+@patch("rfc_lookup.client.ServerClient.search")
+def test_cli_rfc_search_uses_server(
+    mock_server_search: Mock,
+    mock_search_local: Mock,
+    cli_runner: CliRunner,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the CLI search command asks a running server first."""
+    monkeypatch.setenv(SERVER_URL_ENV, "http://127.0.0.1:9")
+    mock_server_search.return_value = [{"id": 8446, "title": "TLS 1.3"}]
+    result = cli_runner.invoke(cli, ["search", "tls", "--stream"])
+    assert result.exit_code == 0
+    assert "8446: TLS 1.3" in result.output
+    assert "Search 'tls' with 1 results." in result.output
+    mock_server_search.assert_called_once_with("tls", True, SearchFilters())
+    mock_search_local.assert_not_called()
+
+
+@patch("rfc_lookup.server.RfcServer")
+def test_cli_rfc_serve(mock_server: Mock, cli_runner: CliRunner) -> None:
+    """Test the CLI serve command starts the server."""
+    mock_server.return_value.url = "http://127.0.0.1:8123"
+    result = cli_runner.invoke(cli, ["serve", "--port", "8123"])
+    assert result.exit_code == 0
+    assert "Serving on http://127.0.0.1:8123" in result.output
+    mock_server.assert_called_once_with(("127.0.0.1", 8123))
+    mock_server.return_value.run.assert_called_once()
+
+
+@patch("rfc_lookup.server.RfcServer")
+def test_cli_rfc_serve_address_in_use(
+    mock_server: Mock, cli_runner: CliRunner
+) -> None:
+    """Test the CLI serve command reports a port it cannot listen on."""
+    mock_server.side_effect = OSError("Address already in use")
+    result = cli_runner.invoke(cli, ["serve", "--port", "8123"])
+    assert result.exit_code == 1
+    assert "Unable to listen on 127.0.0.1:8123" in result.output
@@ -0,0 +1,81 @@
+"""Tests for decoding module."""
+
+import gzip
+import zlib
+
+import pytest
+
+from rfc_lookup import decoding
+from rfc_lookup.decoding import accept_encoding, decode_body, get_decoder
+from rfc_lookup.errors import NetworkError
+
+
+BODY = b"Request for Comments: 9110\n" * 100
+
+
+def test_accept_encoding() -> None:
+    """Test gzip and deflate are always advertised."""
+    assert accept_encoding().startswith("gzip, deflate")
+
+
+@pytest.mark.parametrize("encoding", [None, "", "identity"])
+def test_decode_identity(encoding: str) -> None:
+    """Test unencoded bodies pass through."""
+    assert decode_body(BODY, encoding) == BODY
+
+
+def test_decode_gzip() -> None:
+    """Test gzip bodies are decoded."""
+    assert decode_body(gzip.compress(BODY), "gzip") == BODY
+    assert decode_body(gzip.compress(BODY), " X-GZIP ") == BODY
+
+
+def test_decode_deflate() -> None:
+    """Test zlib-wrapped and raw deflate bodies are decoded."""
+    assert decode_body(zlib.compress(BODY), "deflate") == BODY
+
+    raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    data = raw.compress(BODY) + raw.flush()
+    assert decode_body(data, "deflate") == BODY
+
+    # The format is only detected once there is data
+    decoder = get_decoder("deflate")
+    assert decoder.decompress(b"") == b""
+    assert decoder.decompress(data) + decoder.flush() == BODY
+
+
+def test_decode_incremental() -> None:
+    """Test bodies can be decoded one piece at a time."""
+    data = gzip.compress(BODY)
+    decoder = get_decoder("gzip")
+    decoded = b"".join(
+        decoder.decompress(data[i : i + 7]) for i in range(0, len(data), 7)
+    )
+    assert decoded + decoder.flush() == BODY
+
+
+def test_decode_brotli() -> None:
+    """Test brotli bodies are decoded when brotli is installed."""
+    brotli = pytest.importorskip("brotli")
+    assert accept_encoding() == "gzip, deflate, br"
+    assert decode_body(brotli.compress(BODY), "br") == BODY
+
+
+def test_decode_without_brotli(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test brotli is neither advertised nor decoded without the package."""
+    monkeypatch.setattr(decoding, "brotli", None)
+    assert accept_encoding() == "gzip, deflate"
+    with pytest.raises(NetworkError):
+        get_decoder("br")
+
+
+def test_decode_unsupported() -> None:
+    """Test unsupported codings raise NetworkError."""
+    with pytest.raises(NetworkError):
+        get_decoder("compress")
+
+
+def test_decode_corrupt() -> None:
+    """Test corrupt bodies raise NetworkError."""
+    with pytest.raises(NetworkError):
+        decode_body(b"not gzip", "gzip")
@@ -0,0 +1,156 @@
+"""Tests for filters module."""
+
+import datetime
+from typing import Any, Dict, List
+
+import pytest
+
+from rfc_lookup.filters import SearchFilters, parse_search_date, result_month
+
+
+def result(
+    _id: int, title: str, date: str, status: str, *authors: str
+) -> Dict[str, Any]:
+    """Build a search result."""
+    return {
+        "id": _id,
+        "title": title,
+        "publication_date": date,
+        "status": status,
+        "authors": list(authors),
+    }
+
+
+RESULTS: List[Dict[str, Any]] = [
+    result(793, "TCP", "September 1981", "Internet Standard", "J. Postel"),
+    result(5246, "TLS 1.2", "August 2008", "Proposed Standard", "T. Dierks"),
+    result(6101, "SSL 3.0", "August 2011", "Historic", "A. Freier"),
+    result(8446, "TLS 1.3", "August 2018", "Proposed Standard", "E. Rescorla"),
+]
+
+
+def ids(results: List[Dict[str, Any]]) -> List[int]:
+    """Get the RFC numbers of results."""
+    return [r["id"] for r in results]
+
+
+def test_parse_search_date() -> None:
+    """Test years and months are parsed to the first day."""
+    assert parse_search_date("2020") == datetime.date(2020, 1, 1)
+    assert parse_search_date(" 2020-6 ") == datetime.date(2020, 6, 1)
+    assert parse_search_date("2020", end=True) == datetime.date(2020, 12, 1)
+    assert parse_search_date("2020-6", end=True) == datetime.date(2020, 6, 1)
+    for value in ["20", "2020-13", "June 2020"]:
+        with pytest.raises(ValueError):
+            parse_search_date(value)
+
+
+def test_result_month() -> None:
+    """Test the publication month is read from results."""
+    assert result_month(RESULTS[0]) == (1981, 9)
+    assert result_month({"publication_date": "1 April 2019"}) == (2019, 4)
+    assert result_month({"publication_date": "Someday 2019"}) is None
+    assert result_month({}) is None
+
+
+def test_search_filters_validation() -> None:
+    """Test unknown statuses, sort keys and limits are rejected."""
+    assert SearchFilters(status="Historic").status == "historic"
+    with pytest.raises(ValueError, match="status"):
+        SearchFilters(status="draft")
+    with pytest.raises(ValueError, match="sort"):
+        SearchFilters(sort="size")
+    with pytest.raises(ValueError, match="limit"):
+        SearchFilters(limit=0)
+
+
+def test_search_filters_params() -> None:
+    """Test filters are translated into RFC editor search fields."""
+    assert SearchFilters().params() == {
+        "pubstatus[]": "Any",
+        "std_trk": "Any",
+        "pub_date_type": "any",
+        "sortkey": "Number",
+        "sorting": "ASC",
+        "page": "All",
+    }
+    params = SearchFilters(
+        status="best current practice",
+        since=datetime.date(2020, 3, 1),
+        until=datetime.date(2021, 1, 1),
+        author="Smith",
+        sort="date",
+        descending=True,
+        limit=40,
+    ).params()
+    assert params == {
+        "pubstatus[]": "Best Current Practice",
+        "std_trk": "Any",
+        "pub_date_type": "range",
+        "from_month": "March",
+        "from_year": "2020",
+        "to_month": "January",
+        "to_year": "2021",
+        "author": "Smith",
+        "sortkey": "Date",
+        "sorting": "DESC",
+        "page": "50",
+    }
+    assert SearchFilters(limit=500).params()["page"] == "All"
+    params = SearchFilters(until=datetime.date(1990, 5, 1)).params()
+    assert (params["from_month"], params["from_year"]) == ("January", "1969")
+
+
+def test_search_filters_query() -> None:
+    """Test filters survive being sent to the server."""
+    filters = SearchFilters(
+        status="historic",
+        since=datetime.date(2001, 2, 1),
+        until=datetime.date(2002, 1, 1),
+        author="Postel",
+        sort="title",
+        descending=True,
+        limit=7,
+    )
+    assert SearchFilters.from_query(filters.query()) == filters
+    assert SearchFilters().query() == {}
+    assert SearchFilters.from_query({"q": "tls"}) == SearchFilters()
+    with pytest.raises(ValueError):
+        SearchFilters.from_query({"limit": "many"})
+
+
+@pytest.mark.parametrize(
+    "filters,expected",
+    [
+        (SearchFilters(), [793, 5246, 6101, 8446]),
+        (SearchFilters(status="proposed standard"), [5246, 8446]),
+        (SearchFilters(status="standards track"), [793, 5246, 8446]),
+        (SearchFilters(status="historic"), [6101]),
+        (SearchFilters(since=datetime.date(2008, 8, 1)), [5246, 6101, 8446]),
+        (SearchFilters(until=datetime.date(2008, 8, 1)), [793, 5246]),
+        (SearchFilters(author="rescorla"), [8446]),
+        (SearchFilters(sort="title"), [6101, 793, 5246, 8446]),
+        (SearchFilters(sort="date", descending=True), [8446, 6101, 5246, 793]),
+        (SearchFilters(descending=True, limit=2), [8446, 6101]),
+    ],
+)
+def test_search_filters_apply(
+    filters: SearchFilters, expected: List[int]
+) -> None:
+    """Test results are filtered, sorted and limited locally."""
+    assert ids(filters.apply(RESULTS)) == expected
+
+
+def test_search_filters_undated() -> None:
+    """Test results without a publication month fail any date filter."""
+    undated = result(1, "Host Software", "", "Unknown", "S. Crocker")
+    since = SearchFilters(since=datetime.date(1969, 1, 1))
+    assert ids(since.apply([undated])) == []
+    assert ids(SearchFilters().apply([undated])) == [1]
+
+
+def test_search_filters_truncate() -> None:
+    """Test truncation stops reading at the limit."""
+    stream = iter(RESULTS)
+    assert ids(list(SearchFilters(limit=1).truncate(stream))) == [793]
+    assert next(stream)["id"] == 5246
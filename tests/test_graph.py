@@ -0,0 +1,147 @@
+"""Tests for graph module."""
+
+import time
+from array import array
+from pathlib import Path
+from typing import Generator
+from unittest.mock import Mock, patch
+
+import pytest
+
+from rfc_lookup.cache import IndexCache, IndexState
+from rfc_lookup.errors import NetworkError
+from rfc_lookup.graph import Adjacency, RfcGraph, get_rfc_graph
+from rfc_lookup.index import parse_rfc_index
+from rfc_lookup.utilities import HttpResponse
+
+
+INDEX = """\
+2068 Hypertext Transfer Protocol -- HTTP/1.1. R. Fielding. January 1997.
+     (Format: TXT) (Obsoleted by RFC2616) (Status: PROPOSED STANDARD)
+
+2616 Hypertext Transfer Protocol -- HTTP/1.1. R. Fielding. June 1999.
+     (Format: TXT) (Obsoletes RFC2068) (Obsoleted by RFC7230, RFC7231)
+     (Updated by RFC2817) (Status: DRAFT STANDARD)
+
+2817 Upgrading to TLS Within HTTP/1.1. R. Khare. May 2000. (Format: TXT)
+     (Updates RFC2616) (Status: PROPOSED STANDARD)
+
+7230 HTTP/1.1: Message Syntax and Routing. R. Fielding. June 2014.
+     (Format: TXT) (Obsoletes RFC2616) (Obsoleted by RFC9110, RFC9112)
+     (Status: PROPOSED STANDARD)
+
+7231 HTTP/1.1: Semantics and Content. R. Fielding. June 2014. (Format:
+     TXT) (Obsoletes RFC2616) (Obsoleted by RFC9110) (Status: PROPOSED
+     STANDARD)
+
+9110 HTTP Semantics. R. Fielding. June 2022. (Format: TXT) (Obsoletes
+     RFC7230, RFC7231) (Status: INTERNET STANDARD)
+"""
+
+
+@pytest.fixture()
+def graph() -> RfcGraph:
+    """Build a graph from the sample RFC index."""
+    return RfcGraph.build(parse_rfc_index(INDEX))
+
+
+def test_adjacency() -> None:
+    """Test rows hold the sorted targets of each number."""
+    rows = Adjacency.from_pairs([(3, 9), (1, 2), (3, 4)], 10)
+    assert list(rows[3]) == [4, 9]
+    assert list(rows[1]) == [2]
+    assert list(rows[2]) == []
+    assert list(rows[10]) == []
+    assert list(rows[-1]) == []
+    assert isinstance(rows.offsets, array) and rows.offsets.typecode == "I"
+    assert isinstance(rows.targets, array) and rows.targets.typecode == "I"
+
+
+def test_graph_related(graph: RfcGraph) -> None:
+    """Test direct relations are known in both directions."""
+    assert list(graph.related(2616, "obsoleted_by")) == [7230, 7231]
+    assert list(graph.related(2616, "obsoletes")) == [2068]
+    assert list(graph.related(2616, "updated_by")) == [2817]
+    assert list(graph.related(2817, "updates")) == [2616]
+    # RFC 9112 is only known from the entry of RFC 7230
+    assert list(graph.related(9112, "obsoletes")) == [7230]
+    assert list(graph.related(1, "obsoletes")) == []
+
+
+def test_graph_walk(graph: RfcGraph) -> None:
+    """Test relations are followed transitively, nearest first."""
+    assert graph.walk(2068, "obsoleted_by") == [
+        (2616, 1),
+        (7230, 2),
+        (7231, 2),
+        (9110, 3),
+        (9112, 3),
+    ]
+    assert graph.walk(2068, "obsoleted_by", depth=2)[-1] == (7231, 2)
+    assert graph.walk(9110, "obsoletes", depth=1) == [(7230, 1), (7231, 1)]
+    assert graph.walk(2068, "updated_by") == []
+
+
+def test_graph_current(graph: RfcGraph) -> None:
+    """Test the current RFCs are the end of the obsoleted-by chains."""
+    assert graph.current(2616) == [9110, 9112]
+    assert graph.current(9110) == [9110]
+
+
+def test_graph_cycle() -> None:
+    """Test walks end on relations that loop back."""
+    graph = RfcGraph.build(
+        parse_rfc_index("1 A. B. C. June 1999. (Obsoletes RFC0002)\n\n")
+        + parse_rfc_index("2 D. E. F. June 1999. (Obsoletes RFC0001)\n\n")
+    )
+    assert graph.walk(1, "obsoletes") == [(2, 1)]
+    assert graph.current(1) == []
+
+
+@pytest.fixture()
+def mock_get_response() -> Generator[Mock, None, None]:
+    """Mock get_response function."""
+    with patch("rfc_lookup.utilities.get_response") as mock:
+        mock.return_value = HttpResponse(200, INDEX.encode("utf-8"))
+        yield mock
+
+
+def test_get_rfc_graph(mock_get_response: Mock, tmp_path: Path) -> None:
+    """Test the graph is built once per version of the index."""
+    cache = IndexCache(tmp_path, ttl=60)
+    graph = get_rfc_graph(cache)
+    assert graph.current(2068) == [9110, 9112]
+    assert get_rfc_graph(cache) is graph
+
+    cache.save(
+        IndexState(ids=[1], fetched_at=time.time()),
+        b"0001 A. B. C. June 1999. (Obsoleted by RFC0002)\n",
+    )
+    assert get_rfc_graph(cache).current(1) == [2]
+
+
+def test_get_rfc_graph_offline(mock_get_response: Mock, tmp_path: Path) -> None:
+    """Test the stored index is used when it cannot be refreshed."""
+    cache = IndexCache(tmp_path, ttl=60)
+    mock_get_response.side_effect = NetworkError("offline")
+    with pytest.raises(NetworkError):
+        get_rfc_graph(cache)
+
+    cache.save(IndexState(ids=[2068, 9110]), INDEX.encode("utf-8"))
+    graph = get_rfc_graph(cache)
+    assert graph.current(2068) == [9110, 9112]
+    assert graph.titles[9110] == "HTTP Semantics"
+    assert 9112 not in graph.titles
+
+
+def test_get_rfc_graph_missing_text(
+    mock_get_response: Mock, tmp_path: Path
+) -> None:
+    """Test the index is downloaded again if only its text is gone."""
+    cache = IndexCache(tmp_path, ttl=60)
+    cache.save(IndexState(ids=[1], fetched_at=time.time()), b"0001 A.\n")
+    cache.content_path.unlink()
+
+    graph = get_rfc_graph(cache)
+    assert graph.current(2068) == [9110, 9112]
+    mock_get_response.assert_called_once()
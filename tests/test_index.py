@@ -0,0 +1,204 @@
+"""Tests for index module."""
+
+import time
+from pathlib import Path
+from typing import Generator
+from unittest.mock import Mock, patch
+
+import pytest
+
+from rfc_lookup.cache import IndexCache, IndexState
+from rfc_lookup.index import (
+    get_rfc_index,
+    merge_records,
+    parse_entry,
+    parse_rfc_index,
+)
+from rfc_lookup.utilities import HttpResponse
+
+
+INDEX = """\
+                             RFC INDEX
+
+ RFC citation format:
+  1129 Internet Time Synchronization: The Network Time Protocol. D.L.
+       Mills. October 1989. (Format: PDF=1205164, TXT=49862)
+
+0002 Not Issued.
+
+0001 Host Software. S. Crocker. April 1969. (Format: TXT=21088 bytes)
+     (Status: UNKNOWN) (Stream: Legacy) (DOI: 10.17487/RFC0001)
+
+0791 Internet Protocol. J. Postel. September 1981. (Format: TXT=97779
+     bytes) (Obsoletes RFC0760) (Updated by RFC1349, RFC2474, RFC6864)
+     (Also STD0005) (Status: INTERNET STANDARD) (Stream: Legacy) (DOI:
+     10.17487/RFC0791)
+
+2850 Charter of the Internet Architecture Board (IAB). Internet
+     Architecture Board, B. Carpenter, Ed.. May 2000. (Format: TXT=15984
+     bytes) (Obsoletes RFC1601) (Also BCP0039) (Status: BEST CURRENT
+     PRACTICE) (Stream: IAB) (DOI: 10.17487/RFC2850)
+
+9110 HTTP Semantics. R. Fielding, Ed., M. Nottingham, Ed., J. Reschke,
+     Ed.. June 2022. (Format: HTML, TXT, PDF, XML) (Obsoletes RFC2818,
+     RFC7230) (Also STD0097) (Status: INTERNET STANDARD) (Stream: IETF)
+     (DOI: 10.17487/RFC9110)
+"""
+
+
+def test_parse_rfc_index() -> None:
+    """Test the index is split into records sorted by number."""
+    records = parse_rfc_index(INDEX)
+    assert [r.number for r in records] == [1, 2, 791, 2850, 9110]
+
+    record = records[2]
+    assert record.title == "Internet Protocol"
+    assert record.authors == ("J. Postel",)
+    assert record.date == "September 1981"
+    assert record.status == "INTERNET STANDARD"
+    assert record.stream == "Legacy"
+    assert record.formats == ("TXT",)
+    assert record.obsoletes == (760,)
+    assert record.obsoleted_by == ()
+    assert record.updates == ()
+    assert record.updated_by == (1349, 2474, 6864)
+    assert record.also == ("STD0005",)
+    assert record.doi == "10.17487/RFC0791"
+    assert record.issued
+
+
+def test_parse_rfc_index_not_issued() -> None:
+    """Test numbers that were never issued are kept."""
+    record = parse_rfc_index(INDEX)[1]
+    assert record.title == "Not Issued"
+    assert record.authors == ()
+    assert not record.issued
+
+
+def test_parse_entry_editors() -> None:
+    """Test editors and corporate authors are split from the title."""
+    records = {r.number: r for r in parse_rfc_index(INDEX)}
+    assert records[9110].title == "HTTP Semantics"
+    assert records[9110].authors == (
+        "R. Fielding, Ed.",
+        "M. Nottingham, Ed.",
+        "J. Reschke, Ed.",
+    )
+    assert records[2850].title == (
+        "Charter of the Internet Architecture Board (IAB)"
+    )
+    assert records[2850].authors == (
+        "Internet Architecture Board",
+        "B. Carpenter, Ed.",
+    )
+
+
+def test_parse_entry_title_only() -> None:
+    """Test entries with a day in the date or without authors."""
+    record = parse_entry(
+        1149,
+        "Standard for the transmission of IP datagrams on avian carriers. "
+        "D. Waitzman. 1 April 1990. (Format: TXT=3329 bytes)",
+    )
+    assert record.authors == ("D. Waitzman",)
+    assert record.date == "1 April 1990"
+
+    record = parse_entry(3, "Untitled")
+    assert record.title == "Untitled"
+    assert record.authors == ()
+    assert record.date == ""
+
+
+def test_parse_rfc_index_matches_parse_entry() -> None:
+    """Test whole-index parsing agrees with parsing each entry alone."""
+    content = INDEX + (
+        "\n6000 Wrapped   title. B.C. Jones, Ed.. 1 May 1999. (Format: HTML,\n"
+        "     TXT) (Updated by RFC0001, RFC0002) (Status: PROPOSED\n"
+        "     STANDARD) (Stream: IETF) \n"
+        "\n6001 Out of order. A. Author. July 2002. (Status: INFORMATIONAL)\n"
+        "     (Format: TXT)\n"
+        "\n6002 Undated. IETF.\n"
+        "\n6003 Unusual list. A. Author. July 2002. (Obsoletes RFC0001 and\n"
+        "     RFC0002)\n"
+    )
+    records = parse_rfc_index(content)
+    for block in content.split("\n\n"):
+        number, body = block.strip("\n").split(" ", 1)
+        if not number.isdigit():
+            continue
+        assert parse_entry(int(number), " ".join(body.split())) in records
+
+    record = {r.number: r for r in records}[6000]
+    assert record.title == "Wrapped title"
+    assert record.authors == ("B.C. Jones, Ed.",)
+    assert record.date == "1 May 1999"
+    assert record.updated_by == (1, 2)
+    assert record.status == "PROPOSED STANDARD"
+    assert {r.number: r for r in records}[6003].obsoletes == (1, 2)
+
+
+def test_merge_records() -> None:
+    """Test new RFCs are linked from the RFCs they obsolete or update."""
+    records = {r.number: r for r in parse_rfc_index(INDEX)}
+    new = parse_entry(
+        9999,
+        "Example. A. Author. May 2030. (Obsoletes RFC0791, RFC0005) "
+        "(Updates RFC0001)",
+    )
+    merge_records(records, [new])
+
+    assert records[9999] is new
+    assert records[791].obsoleted_by == (9999,)
+    assert records[1].updated_by == (9999,)
+    assert 5 not in records
+
+    merge_records(records, [new])
+    assert records[791].obsoleted_by == (9999,)
+
+
+def test_rfc_record_slots() -> None:
+    """Test records do not carry a per-instance dict."""
+    record = parse_rfc_index(INDEX)[0]
+    assert not hasattr(record, "__dict__")
+
+
+def test_parse_rfc_index_speed() -> None:
+    """Test a full-size index parses quickly."""
+    entry = INDEX.split("\n\n")[-1]
+    content = "\n\n".join(
+        entry.replace("9110", f"{n:04d}", 1) for n in range(1, 10001)
+    )
+    start = time.perf_counter()
+    assert len(parse_rfc_index(content)) == 10000
+    assert time.perf_counter() - start < 1
+
+
+@pytest.fixture()
+def mock_get_response() -> Generator[Mock, None, None]:
+    """Mock get_response function."""
+    with patch("rfc_lookup.utilities.get_response") as mock:
+        mock.return_value = HttpResponse(200, INDEX.encode("utf-8"))
+        yield mock
+
+
+def test_get_rfc_index(mock_get_response: Mock, tmp_path: Path) -> None:
+    """Test the index is fetched once and parsed from the cache."""
+    cache = IndexCache(tmp_path, ttl=60)
+    assert len(get_rfc_index(cache)) == 5
+    assert len(get_rfc_index(cache)) == 5
+    assert mock_get_response.call_count == 1
+
+
+def test_get_rfc_index_missing_content(
+    mock_get_response: Mock, tmp_path: Path
+) -> None:
+    """Test a cached state without its text forces a full download."""
+    cache = IndexCache(tmp_path, ttl=60)
+    cache.save(IndexState(ids=[1], etag='"abc"', fetched_at=time.time()))
+    assert len(get_rfc_index(cache)) == 5
+    assert mock_get_response.call_args.kwargs["headers"] == {}
+
+
+def test_get_rfc_index_default_cache(mock_get_response: Mock) -> None:
+    """Test the default index cache is used."""
+    assert len(get_rfc_index()) == 5
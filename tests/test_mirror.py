@@ -0,0 +1,220 @@
+"""Tests for mirror module."""
+
+import io
+import os
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, Iterator, List, Optional, Type
+from unittest.mock import Mock, patch
+
+import pytest
+
+from rfc_lookup.constants import MIRROR_DIR_ENV
+from rfc_lookup.errors import NetworkError
+from rfc_lookup.index import RfcRecord, parse_rfc_index
+from rfc_lookup.mirror import Mirror, get_default_mirror, record_fingerprint
+
+
+INDEX = """\
+0001 Host Software. S. Crocker. April 1969. (Format: TXT=21088 bytes)
+     (Status: UNKNOWN) (Stream: Legacy) (DOI: 10.17487/RFC0001)
+
+0002 Not Issued.
+
+0003 Documentation conventions. S.D. Crocker. April 1969. (Format:
+     TXT=2323 bytes) (Status: UNKNOWN) (Stream: Legacy) (DOI:
+     10.17487/RFC0003)
+
+0004 Network timetable. E.B. Shapiro. March 1969. (Format: HTML, PDF)
+     (Status: UNKNOWN) (Stream: Legacy) (DOI: 10.17487/RFC0004)
+"""
+
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+
+@pytest.fixture
+def records() -> List[RfcRecord]:
+    """Parse the sample index."""
+    return parse_rfc_index(INDEX)
+
+
+class FakeResponse:
+    """An open response that serves its body in pieces."""
+
+    def __init__(
+        self,
+        status: int,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Initialize the response, failing with error after the body."""
+        self.status = status
+        self.headers = headers or {}
+        self.body = io.BytesIO(body)
+        self.error = error
+        self.reads: List[Optional[int]] = []
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        """Read from the body."""
+        self.reads.append(amt)
+        data = self.body.read(amt)
+        if not data and self.error is not None:
+            raise self.error
+        return data
+
+    def __enter__(self) -> "FakeResponse":
+        """Enter the response context."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        """Close the response."""
+
+
+@pytest.fixture
+def mock_open_url() -> Iterator[Mock]:
+    """Answer every RFC request with its URL and a Last-Modified date."""
+
+    def open_url(url: str, headers: Dict[str, str]) -> FakeResponse:
+        return FakeResponse(
+            200, url.encode("utf-8"), {"last-modified": LAST_MODIFIED}
+        )
+
+    with patch("rfc_lookup.mirror.open_url") as mock:
+        mock.side_effect = open_url
+        yield mock
+
+
+def test_mirror_sync_fetches_issued(
+    mock_open_url: Mock, records: List[RfcRecord], tmp_path: Path
+) -> None:
+    """Test every issued plain-text RFC is downloaded with its mtime."""
+    mirror = Mirror(tmp_path / "mirror")
+    results = dict(mirror.sync(records, max_workers=2))
+
+    assert results == {1: True, 3: True}
+    path = mirror.document_path(1)
+    assert path.read_bytes() == b"https://www.rfc-editor.org/rfc/rfc1.txt"
+    assert os.stat(path).st_mtime == 1445412480
+    assert not mirror.document_path(2).exists()
+    # RFC 4 has no plain-text version to mirror
+    assert not mirror.document_path(4).exists()
+    assert set(mirror.load_manifest()) == {1, 3}
+    assert mirror.plan(records, revalidate=True) == [(1, True), (3, True)]
+
+
+def test_mirror_sync_resumes(
+    mock_open_url: Mock, records: List[RfcRecord], tmp_path: Path
+) -> None:
+    """Test a later sync skips documents that are up to date."""
+    mirror = Mirror(tmp_path)
+    mirror.document_path(1).write_bytes(b"RFC 1")
+    mirror.save_manifest({1: record_fingerprint(records[0])})
+
+    assert dict(mirror.sync(records)) == {3: True}
+    assert mirror.document_path(1).read_bytes() == b"RFC 1"
+    assert dict(mirror.sync(records)) == {}
+
+
+@patch("rfc_lookup.mirror.MIRROR_SAVE_INTERVAL", 1)
+def test_mirror_sync_saves_progress(
+    mock_open_url: Mock, records: List[RfcRecord], tmp_path: Path
+) -> None:
+    """Test the manifest is saved while the sync is still running."""
+    mirror = Mirror(tmp_path)
+    sync = mirror.sync(records, max_workers=1)
+    report_id, _ = next(sync)
+    assert set(mirror.load_manifest()) == {report_id}
+    list(sync)
+    assert set(mirror.load_manifest()) == {1, 3}
+
+
+def test_mirror_sync_revalidates_changed_entries(
+    mock_open_url: Mock, records: List[RfcRecord], tmp_path: Path
+) -> None:
+    """Test a changed index entry revalidates the mirrored document."""
+    mirror = Mirror(tmp_path)
+    mirror.document_path(1).write_bytes(b"RFC 1")
+    mirror.document_path(3).write_bytes(b"RFC 3")
+    os.utime(mirror.document_path(1), (1445412480, 1445412480))
+    mirror.save_manifest({1: "outdated", 3: record_fingerprint(records[2])})
+    mock_open_url.side_effect = None
+    mock_open_url.return_value = FakeResponse(304)
+
+    assert dict(mirror.sync(records)) == {1: False}
+    mock_open_url.assert_called_once_with(
+        "https://www.rfc-editor.org/rfc/rfc1.txt",
+        {"If-Modified-Since": LAST_MODIFIED},
+    )
+    assert mirror.load_manifest()[1] == record_fingerprint(records[0])
+
+    assert dict(mirror.sync(records, revalidate=True)) == {1: False, 3: False}
+
+
+def test_mirror_sync_failure(
+    mock_open_url: Mock, records: List[RfcRecord], tmp_path: Path
+) -> None:
+    """Test a failed download is reported and retried on the next sync."""
+    mirror = Mirror(tmp_path)
+    mock_open_url.side_effect = NetworkError("timeout")
+
+    results = dict(mirror.sync(records))
+    assert isinstance(results[1], NetworkError)
+    assert list(tmp_path.iterdir()) == [mirror.manifest_path]
+    assert mirror.load_manifest() == {}
+
+
+def test_mirror_fetch_streams(mock_open_url: Mock, tmp_path: Path) -> None:
+    """Test documents are written as they arrive and only once complete."""
+    mirror = Mirror(tmp_path)
+    response = FakeResponse(200, b"RFC 1 body")
+    mock_open_url.side_effect = None
+    mock_open_url.return_value = response
+    assert mirror.fetch(1, chunk_size=4)
+    assert mirror.document_path(1).read_bytes() == b"RFC 1 body"
+    assert response.reads == [4, 4, 4, 4]
+
+    mock_open_url.return_value = FakeResponse(
+        200, b"Cut", error=NetworkError("reset")
+    )
+    with pytest.raises(NetworkError):
+        mirror.fetch(1)
+    assert mirror.document_path(1).read_bytes() == b"RFC 1 body"
+    assert list(tmp_path.iterdir()) == [mirror.document_path(1)]
+
+
+def test_mirror_open(tmp_path: Path) -> None:
+    """Test mirrored documents are opened and read, missing ones are not."""
+    mirror = Mirror(tmp_path)
+    mirror.document_path(1).write_bytes(b"RFC 1")
+
+    f = mirror.open(1)
+    assert f is not None
+    with f:
+        assert f.read() == b"RFC 1"
+    assert mirror.open(2) is None
+    assert mirror.read(1) == "RFC 1"
+    assert mirror.read(2) is None
+
+
+def test_mirror_unreadable_manifest(tmp_path: Path) -> None:
+    """Test an unreadable manifest is treated as empty."""
+    mirror = Mirror(tmp_path)
+    mirror.manifest_path.write_text("[]", encoding="utf-8")
+    assert mirror.load_manifest() == {}
+
+
+def test_get_default_mirror(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the mirror is configured from the environment."""
+    assert get_default_mirror() is None
+    monkeypatch.setenv(MIRROR_DIR_ENV, str(tmp_path))
+    mirror = get_default_mirror()
+    assert mirror is not None
+    assert mirror.path == tmp_path
@@ -0,0 +1,209 @@
+"""Tests for pool module."""
+
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Generator, List
+from unittest.mock import patch
+
+import pytest
+
+from rfc_lookup import pool as pool_module
+from rfc_lookup.constants import CONNECT_TIMEOUT_ENV, READ_TIMEOUT_ENV
+from rfc_lookup.errors import NetworkError
+from rfc_lookup.pool import ConnectionPool, default_timeouts, get_default_pool
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Request handler answering every GET on a keep-alive connection."""
+
+    protocol_version = "HTTP/1.1"
+    connections: List[int] = []
+
+    def setup(self) -> None:
+        """Record each new connection."""
+        super().setup()
+        self.connections.append(self.client_address[1])
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Answer with the request path."""
+        if self.path == "/slow":
+            time.sleep(0.5)
+        body = self.path.encode("utf-8")
+        self.send_response(200)
+        if self.path == "/close":
+            self.send_header("Connection", "close")
+        if self.path.startswith("/gzip"):
+            body = gzip.compress(body * 1000)
+            self.send_header("Content-Encoding", "gzip")
+        if self.path == "/corrupt":
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path == "/drop":
+            # Close without telling the client, as an idle timeout would
+            self.close_connection = True
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Silence request logging."""
+
+
+@pytest.fixture
+def server() -> Generator[ThreadingHTTPServer, None, None]:
+    """Run a local keep-alive HTTP server."""
+    KeepAliveHandler.connections = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    """Get the base URL of the local server."""
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_pool_reuses_connections(server: ThreadingHTTPServer) -> None:
+    """Test sequential requests share one connection."""
+    pool = ConnectionPool()
+    for path in ("/a", "/b", "/c"):
+        with pool.request(base_url(server) + path, headers={}) as res:
+            assert res.status == 200
+            assert res.read() == path.encode("utf-8")
+
+    assert len(KeepAliveHandler.connections) == 1
+    assert pool.idle_count() == 1
+    key = ("http", "127.0.0.1", server.server_address[1])
+    assert pool.idle_count(key) == 1
+    pool.close()
+    assert pool.idle_count() == 0
+
+
+def test_pool_query_string(server: ThreadingHTTPServer) -> None:
+    """Test the query string is sent with the path."""
+    pool = ConnectionPool()
+    with pool.request(base_url(server) + "/q?a=1", headers={}) as res:
+        assert res.read() == b"/q?a=1"
+
+
+def test_pool_discards_partially_read(server: ThreadingHTTPServer) -> None:
+    """Test a connection with unread body data is not reused."""
+    pool = ConnectionPool()
+    with pool.request(base_url(server) + "/partial", headers={}) as res:
+        assert res.read(1) == b"/"
+    assert pool.idle_count() == 0
+    res.close()
+
+
+def test_pool_honors_connection_close(server: ThreadingHTTPServer) -> None:
+    """Test a connection the server closes is not reused."""
+    pool = ConnectionPool()
+    with pool.request(base_url(server) + "/close", headers={}) as res:
+        res.read()
+    assert pool.idle_count() == 0
+
+
+def test_pool_max_size(server: ThreadingHTTPServer) -> None:
+    """Test no more than max_size idle connections are kept per host."""
+    pool = ConnectionPool(max_size=1)
+    first = pool.request(base_url(server) + "/a", headers={})
+    second = pool.request(base_url(server) + "/b", headers={})
+    for res in (first, second):
+        res.read()
+        res.close()
+    assert pool.idle_count() == 1
+
+
+def test_pool_idle_timeout(server: ThreadingHTTPServer) -> None:
+    """Test expired idle connections are replaced."""
+    pool = ConnectionPool(idle_timeout=0)
+    for path in ("/a", "/b"):
+        with pool.request(base_url(server) + path, headers={}) as res:
+            res.read()
+    assert len(KeepAliveHandler.connections) == 2
+
+
+def test_pool_retries_stale_connection(server: ThreadingHTTPServer) -> None:
+    """Test a connection closed while idle is transparently replaced."""
+    pool = ConnectionPool()
+    with pool.request(base_url(server) + "/drop", headers={}) as res:
+        res.read()
+    assert pool.idle_count() == 1
+
+    with pool.request(base_url(server) + "/b", headers={}) as res:
+        assert res.read() == b"/b"
+    assert len(KeepAliveHandler.connections) == 2
+
+
+def test_pool_decodes_gzip(server: ThreadingHTTPServer) -> None:
+    """Test gzip bodies are decoded and the connection is still reused."""
+    pool = ConnectionPool()
+    with pool.request(base_url(server) + "/gzip", headers={}) as res:
+        assert res.read() == b"/gzip" * 1000
+
+    with pool.request(base_url(server) + "/gzip-stream", headers={}) as res:
+        chunks = iter(lambda: res.read(16), b"")
+        assert b"".join(chunks) == b"/gzip-stream" * 1000
+    assert len(KeepAliveHandler.connections) == 1
+    assert pool.idle_count() == 1
+
+
+def test_pool_decode_error(server: ThreadingHTTPServer) -> None:
+    """Test undecodable bodies raise NetworkError."""
+    pool = ConnectionPool()
+    with pool.request(base_url(server) + "/corrupt", headers={}) as res:
+        with pytest.raises(NetworkError):
+            res.read()
+
+
+def test_pool_connection_error() -> None:
+    """Test connection errors propagate."""
+    pool = ConnectionPool()
+    with pytest.raises(OSError):
+        pool.request("http://127.0.0.1:1/", headers={})
+
+
+def test_pool_read_timeout(server: ThreadingHTTPServer) -> None:
+    """Test a server that stalls before answering times out."""
+    pool = ConnectionPool(connect_timeout=5, read_timeout=0.1)
+    with pytest.raises(TimeoutError):
+        pool.request(base_url(server) + "/slow", headers={})
+
+    with pool.request(base_url(server) + "/a", headers={}) as res:
+        assert res.read() == b"/a"
+
+
+def test_default_timeouts(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the timeouts are read from the environment."""
+    monkeypatch.setenv(CONNECT_TIMEOUT_ENV, "2.5")
+    monkeypatch.setenv(READ_TIMEOUT_ENV, "0")
+    assert default_timeouts() == (2.5, None)
+
+    monkeypatch.setenv(CONNECT_TIMEOUT_ENV, "soon")
+    monkeypatch.delenv(READ_TIMEOUT_ENV)
+    assert default_timeouts() == (10.0, 30.0)
+
+
+def test_pool_invalid_scheme() -> None:
+    """Test unsupported schemes are rejected."""
+    with pytest.raises(ValueError):
+        ConnectionPool().request("ftp://127.0.0.1/", headers={})
+
+
+def test_pool_https_connection() -> None:
+    """Test https URLs use TLS connections."""
+    pool = ConnectionPool()
+    conn = pool._new_connection(("https", "example.org", 443))
+    assert conn.__class__.__name__ == "HTTPSConnection"
+
+
+def test_get_default_pool() -> None:
+    """Test the default pool is shared."""
+    with patch.object(pool_module, "_default_pool", None):
+        assert get_default_pool() is get_default_pool()
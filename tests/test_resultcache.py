@@ -0,0 +1,161 @@
+"""Tests for the search result cache."""
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from rfc_lookup.constants import SEARCH_CACHE_DB_ENV, SEARCH_CACHE_TTL_ENV
+from rfc_lookup.resultcache import (
+    ResultCache,
+    default_search_cache_ttl,
+    get_default_search_cache,
+)
+
+
+RESULTS: List[Dict[str, Any]] = [{"id": 1, "authors": ["John Doe"]}]
+
+
+class FakeClock:
+    """Clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Start the clock at a fixed time."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Get the current time."""
+        return self.now
+
+
+def test_result_cache_get_set() -> None:
+    """Test results are stored, copied and counted."""
+    cache = ResultCache()
+    assert cache.get("a") is None
+    cache.set("a", RESULTS)
+    result = cache.get("a")
+    assert result == RESULTS
+    assert result is not None
+    result[0]["authors"].append("Jane Doe")
+    assert cache.get("a") == RESULTS
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert len(cache) == 1
+
+
+def test_result_cache_expires() -> None:
+    """Test entries are dropped once their time to live has passed."""
+    clock = FakeClock()
+    cache = ResultCache(ttl=10, clock=clock)
+    cache.set("a", RESULTS)
+    clock.now += 9
+    assert cache.get("a") == RESULTS
+    clock.now += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_result_cache_evicts_least_recently_used() -> None:
+    """Test the cache holds at most max_entries entries."""
+    cache = ResultCache(max_entries=2)
+    cache.set("a", RESULTS)
+    cache.set("b", RESULTS)
+    cache.get("a")
+    cache.set("c", RESULTS)
+    assert cache.get("b") is None
+    assert cache.get("a") == RESULTS
+    assert cache.get("c") == RESULTS
+
+
+def test_result_cache_disabled() -> None:
+    """Test a zero time to live stores nothing."""
+    cache = ResultCache(ttl=0)
+    cache.set("a", RESULTS)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_result_cache_invalidate() -> None:
+    """Test single entries and the whole cache can be invalidated."""
+    cache = ResultCache()
+    cache.set("a", RESULTS)
+    cache.set("b", RESULTS)
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == RESULTS
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_result_cache_database(tmp_path: Path) -> None:
+    """Test entries outlive the cache when backed by a database."""
+    clock = FakeClock()
+    path = tmp_path / "search.db"
+    cache = ResultCache(ttl=10, path=path, clock=clock)
+    cache.set("a", RESULTS)
+    cache.set("b", RESULTS)
+    cache.close()
+
+    cache = ResultCache(ttl=10, path=path, clock=clock)
+    assert cache.get("a") == RESULTS
+    cache.invalidate("b")
+    assert cache.get("b") is None
+    clock.now += 10
+    assert cache.get("a") is None
+    cache.close()
+
+
+def test_result_cache_database_error(tmp_path: Path) -> None:
+    """Test an unusable database leaves the in-memory cache working."""
+    path = tmp_path / "search.db"
+    path.write_bytes(b"not a database" * 100)
+    cache = ResultCache(path=path)
+    cache.set("a", RESULTS)
+    assert cache.get("a") == RESULTS
+    cache.invalidate()
+    with pytest.raises(sqlite3.DatabaseError):
+        sqlite3.connect(str(path)).execute("SELECT * FROM results")
+    assert ResultCache(path=path).get("a") is None
+
+
+def test_result_cache_database_expired(tmp_path: Path) -> None:
+    """Test expired and unreadable entries in the database are dropped."""
+    clock = FakeClock()
+    path = tmp_path / "search.db"
+    cache = ResultCache(ttl=10, path=path, clock=clock)
+    cache.set("a", RESULTS)
+    clock.now += 10
+    cache.set("b", RESULTS)
+    db = sqlite3.connect(str(path))
+    assert db.execute("SELECT key FROM results").fetchall() == [("b",)]
+
+    with db:
+        db.execute("UPDATE results SET data = 'not json'")
+    assert ResultCache(ttl=10, path=path, clock=clock).get("b") is None
+
+    cache.invalidate()
+    assert db.execute("SELECT key FROM results").fetchall() == []
+    db.close()
+    cache.close()
+    cache.close()
+
+
+def test_default_search_cache_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the time to live is read from the environment."""
+    assert default_search_cache_ttl() == 300
+    monkeypatch.setenv(SEARCH_CACHE_TTL_ENV, "60")
+    assert default_search_cache_ttl() == 60
+    monkeypatch.setenv(SEARCH_CACHE_TTL_ENV, "-1")
+    assert default_search_cache_ttl() == 0
+    monkeypatch.setenv(SEARCH_CACHE_TTL_ENV, "soon")
+    assert default_search_cache_ttl() == 300
+
+
+def test_get_default_search_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the shared cache is configured from the environment once."""
+    monkeypatch.setenv(SEARCH_CACHE_DB_ENV, str(tmp_path / "search.db"))
+    cache = get_default_search_cache()
+    assert cache.path == tmp_path / "search.db"
+    assert get_default_search_cache() is cache
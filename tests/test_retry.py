@@ -0,0 +1,123 @@
+"""Tests for retry module."""
+
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from rfc_lookup import retry as retry_module
+from rfc_lookup.constants import RATE_LIMIT_ENV, RETRIES_ENV
+from rfc_lookup.retry import (
+    RetryPolicy,
+    TokenBucket,
+    default_rate_limit,
+    default_retry_policy,
+    get_default_rate_limiter,
+    parse_retry_after,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ("", None),
+        ("120", 120.0),
+        ("Wed, 21 Oct 2015 07:28:30 GMT", 30.0),
+        ("Wed, 21 Oct 2015 07:27:00 GMT", 0.0),
+        ("soon", None),
+    ],
+)
+def test_parse_retry_after(value: str, expected: float) -> None:
+    """Test Retry-After is parsed as seconds or as a date."""
+    # Wed, 21 Oct 2015 07:28:00 GMT
+    assert parse_retry_after(value, now=1445412480.0) == expected
+
+
+def test_parse_retry_after_now() -> None:
+    """Test dates are compared with the system time by default."""
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_retry_policy_backoff() -> None:
+    """Test delays are jittered below an exponential ceiling."""
+    policy = RetryPolicy(retries=4, backoff=1.0, max_backoff=5.0)
+    with patch("rfc_lookup.retry.random.uniform", side_effect=max) as uniform:
+        assert [policy.delay(n) for n in range(5)] == [1, 2, 4, 5, None]
+    assert uniform.call_count == 4
+
+
+def test_retry_policy_retry_after() -> None:
+    """Test the server's delay is used unless it is too long."""
+    policy = RetryPolicy(retries=2, max_backoff=10.0)
+    assert policy.delay(0, retry_after=3.0) == 3.0
+    assert policy.delay(0, retry_after=60.0) is None
+    assert policy.delay(2, retry_after=3.0) is None
+
+
+def test_default_retry_policy(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the number of retries is read from the environment."""
+    monkeypatch.setenv(RETRIES_ENV, "5")
+    assert default_retry_policy().retries == 5
+    monkeypatch.setenv(RETRIES_ENV, "many")
+    assert default_retry_policy() == RetryPolicy()
+    monkeypatch.delenv(RETRIES_ENV)
+    assert default_retry_policy() == RetryPolicy()
+
+
+class FakeClock:
+    """Clock that only moves when slept on."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        """Get the current time."""
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the clock."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_burst_then_rate() -> None:
+    """Test a burst passes at once and later requests follow the rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, burst=3, clock=clock, sleep=clock.sleep)
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == 0.5
+    assert bucket.acquire() == 0.5
+
+    clock.now += 10
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_token_bucket_unlimited() -> None:
+    """Test a rate of zero never waits."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0, burst=1, clock=clock, sleep=clock.sleep)
+    assert sum(bucket.acquire() for _ in range(100)) == 0
+    assert clock.sleeps == []
+
+
+def test_default_rate_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the rate limit is read from the environment."""
+    assert default_rate_limit() == 0
+    monkeypatch.setenv(RATE_LIMIT_ENV, "4.5")
+    assert default_rate_limit() == 4.5
+    monkeypatch.setenv(RATE_LIMIT_ENV, "fast")
+    assert default_rate_limit() == 0
+
+
+def test_get_default_rate_limiter(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the default rate limiter is shared."""
+    monkeypatch.setenv(RATE_LIMIT_ENV, "4")
+    with patch.object(retry_module, "_default_rate_limiter", None):
+        limiter = get_default_rate_limiter()
+        assert limiter is get_default_rate_limiter()
+        assert limiter.rate == 4
@@ -0,0 +1,266 @@
+"""Tests for search module."""
+
+import datetime
+import time
+from pathlib import Path
+from typing import Generator
+from unittest.mock import Mock, patch
+
+import pytest
+
+from rfc_lookup.cache import IndexCache, IndexState
+from rfc_lookup.errors import NetworkError
+from rfc_lookup.filters import SearchFilters
+from rfc_lookup.index import get_rfc_index, parse_rfc_index
+from rfc_lookup.search import (
+    SearchIndex,
+    decode_postings,
+    encode_postings,
+    get_search_index,
+    search_local,
+    tokenize,
+)
+from rfc_lookup.utilities import HttpResponse
+
+
+INDEX = """\
+0002 Not Issued.
+
+0791 Internet Protocol. J. Postel. September 1981. (Format: TXT=97779
+     bytes) (Obsoletes RFC0760) (Updated by RFC1349, RFC2474, RFC6864)
+     (Also STD0005) (Status: INTERNET STANDARD) (Stream: Legacy) (DOI:
+     10.17487/RFC0791)
+
+0793 Transmission Control Protocol. J. Postel. September 1981. (Format:
+     TXT=172710 bytes) (Obsoleted by RFC9293) (Also STD0007) (Status:
+     INTERNET STANDARD) (Stream: Legacy) (DOI: 10.17487/RFC0793)
+
+8446 The Transport Layer Security (TLS) Protocol Version 1.3. E.
+     Rescorla. August 2018. (Format: HTML, TXT, PDF, XML) (Obsoletes
+     RFC5077, RFC5246, RFC6961) (Updates RFC5705, RFC6066) (Status:
+     PROPOSED STANDARD) (Stream: IETF) (DOI: 10.17487/RFC8446)
+"""
+
+
+@pytest.fixture()
+def index() -> SearchIndex:
+    """Build a search index from the sample RFC index."""
+    return SearchIndex.build(parse_rfc_index(INDEX))
+
+
+def test_tokenize() -> None:
+    """Test text is split into lower-cased words."""
+    assert tokenize("The (TLS) Protocol 1.3") == [
+        "the",
+        "tls",
+        "protocol",
+        "1",
+        "3",
+    ]
+
+
+def test_postings_roundtrip() -> None:
+    """Test postings lists survive delta varint encoding."""
+    numbers = [1, 2, 127, 128, 300, 9999, 20000]
+    data = encode_postings(numbers)
+    assert len(data) < 2 * len(numbers)
+    assert decode_postings(data) == numbers
+    assert decode_postings(b"") == []
+
+
+def test_search(index: SearchIndex) -> None:
+    """Test queries match every word as a prefix of a title or keyword."""
+    assert [r.number for r in index.search("protocol")] == [791, 793, 8446]
+    assert [r.number for r in index.search("Transmission Proto")] == [793]
+    assert [r.number for r in index.search("internet")] == [791, 793]
+    assert [r.number for r in index.search("tls")] == [8446]
+    assert [r.number for r in index.search("postel")] == [791, 793]
+    assert [r.number for r in index.search("std7")] == [793]
+    assert [r.number for r in index.search("8446")] == [8446]
+    assert index.search("proposed standard")[0].title.startswith("The")
+    assert index.search("missing") == []
+    assert index.search("protocol missing") == []
+    assert index.search("") == []
+    assert index.search("issued") == []
+
+
+def test_search_index_serialization(index: SearchIndex) -> None:
+    """Test an index loads back from bytes unchanged."""
+    index.source = "1:2"
+    loaded = SearchIndex.from_bytes(index.to_bytes())
+    assert loaded.source == "1:2"
+    assert loaded.terms == index.terms
+    assert loaded.records == index.records
+    assert [r.number for r in loaded.search("postel")] == [791, 793]
+
+
+def test_search_index_invalid() -> None:
+    """Test data that is not a search index is rejected."""
+    with pytest.raises(ValueError):
+        SearchIndex.from_bytes(b"nope")
+    with pytest.raises(ValueError):
+        SearchIndex.from_bytes(b"RFCSRCH1\x00\x00\x00\x02{}")
+
+
+def test_search_index_extend() -> None:
+    """Test extending an index matches building it from every record."""
+    records = parse_rfc_index(INDEX)
+    full = SearchIndex.build(records)
+    extended = SearchIndex.build(records[:2]).extend(records[2:], "v2")
+
+    assert extended.source == "v2"
+    assert extended.terms == full.terms
+    assert extended.offsets == full.offsets
+    assert extended.postings == full.postings
+    assert extended.records == full.records
+
+    with pytest.raises(ValueError):
+        full.extend(records[:1])
+
+
+@pytest.fixture()
+def mock_get_response() -> Generator[Mock, None, None]:
+    """Mock get_response function."""
+    with patch("rfc_lookup.utilities.get_response") as mock:
+        mock.return_value = HttpResponse(200, INDEX.encode("utf-8"))
+        yield mock
+
+
+def test_get_search_index(mock_get_response: Mock, tmp_path: Path) -> None:
+    """Test the index is built once and reused until the text changes."""
+    cache = IndexCache(tmp_path, ttl=60)
+    index = get_search_index(cache)
+    assert index.source == cache.content_version()
+    assert cache.search_path.exists()
+
+    with patch("rfc_lookup.search.SearchIndex.build") as mock_build:
+        assert get_search_index(cache).terms == index.terms
+    mock_build.assert_not_called()
+
+    cache.save(IndexState(ids=[791], fetched_at=time.time()), b"0791 IP.\n")
+    assert [r.number for r in get_search_index(cache).search("ip")] == [791]
+
+
+def test_get_search_index_incremental(
+    mock_get_response: Mock, tmp_path: Path
+) -> None:
+    """Test new RFCs are added without rebuilding the search index."""
+    cache = IndexCache(tmp_path, ttl=0)
+    # The latest index lists the newest RFCs first
+    entries = INDEX.strip().split("\n\n")[::-1]
+    old = "\n\n".join(entries[1:]) + "\n"
+    mock_get_response.return_value = HttpResponse(200, old.encode("utf-8"))
+    get_search_index(cache)
+
+    latest = "\n\n".join(entries) + "\n"
+    mock_get_response.return_value = HttpResponse(200, latest.encode("utf-8"))
+    with patch("rfc_lookup.search.get_rfc_index") as mock_get_rfc_index:
+        index = get_search_index(cache)
+    mock_get_rfc_index.assert_not_called()
+
+    assert index.source == cache.content_version()
+    assert [r.number for r in index.search("tls")] == [8446]
+    assert index.postings == SearchIndex.build(parse_rfc_index(INDEX)).postings
+
+
+def test_get_search_index_rebuild(
+    mock_get_response: Mock, tmp_path: Path
+) -> None:
+    """Test the index is rebuilt when new RFCs cannot be added on their own."""
+    cache = IndexCache(tmp_path, ttl=0)
+    entries = INDEX.strip().split("\n\n")[::-1]
+    old = "\n\n".join(entries[1:]) + "\n"
+    mock_get_response.return_value = HttpResponse(200, old.encode("utf-8"))
+    source = get_search_index(cache).source
+
+    # The new RFC is already indexed
+    records = parse_rfc_index(INDEX)
+    cache.save_search(SearchIndex.build(records, source).to_bytes())
+    latest = "\n\n".join(entries) + "\n"
+    mock_get_response.return_value = HttpResponse(200, latest.encode("utf-8"))
+    with patch(
+        "rfc_lookup.search.get_rfc_index", wraps=get_rfc_index
+    ) as mock_get_rfc_index:
+        index = get_search_index(cache)
+    mock_get_rfc_index.assert_called_once()
+    assert index.source == cache.content_version()
+
+    # The index changed since the search index was built
+    cache.save_search(SearchIndex.build(records, "old").to_bytes())
+    with patch(
+        "rfc_lookup.search.get_rfc_index", wraps=get_rfc_index
+    ) as mock_get_rfc_index:
+        index = get_search_index(cache)
+    mock_get_rfc_index.assert_called_once()
+    assert [r.number for r in index.search("tls")] == [8446]
+
+
+def test_get_search_index_edited_entry(
+    mock_get_response: Mock, tmp_path: Path
+) -> None:
+    """Test a changed entry rebuilds the search index, with or without RFCs."""
+    cache = IndexCache(tmp_path, ttl=0)
+    entries = INDEX.strip().split("\n\n")[::-1]
+    old = "\n\n".join(entries[1:]) + "\n"
+    mock_get_response.return_value = HttpResponse(200, old.encode("utf-8"))
+    get_search_index(cache)
+
+    edited = old.replace("INTERNET STANDARD", "HISTORIC")
+    mock_get_response.return_value = HttpResponse(200, edited.encode("utf-8"))
+    [record] = get_search_index(cache).search("transmission")
+    assert record.status == "HISTORIC"
+
+    latest = "\n\n".join(entries[:1] + [edited]) + "\n"
+    latest = latest.replace("\n\n\n", "\n\n")
+    latest = latest.replace("Postel. September", "Postel. October")
+    mock_get_response.return_value = HttpResponse(200, latest.encode("utf-8"))
+    index = get_search_index(cache)
+    assert [r.number for r in index.search("tls")] == [8446]
+    [record] = index.search("transmission")
+    assert record.status == "HISTORIC"
+    assert record.date == "October 1981"
+
+
+def test_get_search_index_offline(
+    mock_get_response: Mock, tmp_path: Path
+) -> None:
+    """Test stored copies are searched when the network is unavailable."""
+    cache = IndexCache(tmp_path, ttl=0)
+    cache.save(IndexState(ids=[791]), INDEX.encode("utf-8"))
+    mock_get_response.side_effect = NetworkError("offline")
+    assert [r.number for r in get_search_index(cache).search("tls")] == [8446]
+
+    cache.content_path.unlink()
+    assert [r.number for r in get_search_index(cache).search("tls")] == [8446]
+
+    cache.search_path.write_bytes(b"corrupt")
+    with pytest.raises(NetworkError):
+        get_search_index(cache)
+
+
+def test_search_local(mock_get_response: Mock) -> None:
+    """Test local results use the RFC editor search result keys."""
+    results = search_local("std5")
+    assert results == [
+        {
+            "id": 791,
+            "link": "https://www.rfc-editor.org/info/rfc791",
+            "files": {"TXT": "https://www.rfc-editor.org/rfc/rfc791.txt"},
+            "title": "Internet Protocol",
+            "authors": ["J. Postel"],
+            "publication_date": "September 1981",
+            "more_info": "Obsoletes RFC 760, "
+            "Updated by RFC 1349, RFC 2474, RFC 6864",
+            "status": "Internet Standard",
+        }
+    ]
+
+
+def test_search_local_filters(mock_get_response: Mock) -> None:
+    """Test local results are filtered by publication metadata."""
+    filters = SearchFilters(since=datetime.date(2000, 1, 1))
+    assert [r["id"] for r in search_local("protocol", filters=filters)] == [
+        8446
+    ]
+    filters = SearchFilters(author="postel", descending=True, limit=1)
+    assert [r["id"] for r in search_local("protocol", filters=filters)] == [793]
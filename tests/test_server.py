@@ -0,0 +1,349 @@
+"""Tests for server module."""
+
+import datetime
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPResponse
+from pathlib import Path
+from typing import Iterator, List, Optional
+from unittest.mock import Mock, patch
+
+import pytest
+
+from rfc_lookup.cache import DiskCache, IndexCache
+from rfc_lookup.client import ServerClient, server_file_path
+from rfc_lookup.errors import (
+    InvalidRfcIdError,
+    NetworkError,
+    ServerUnavailableError,
+)
+from rfc_lookup.filters import SearchFilters
+from rfc_lookup.index import parse_rfc_index
+from rfc_lookup.search import SearchIndex
+from rfc_lookup.server import MemoryCache, RfcServer
+from rfc_lookup.utilities import HttpResponse
+
+
+INDEX = """\
+8446 The Transport Layer Security (TLS) Protocol Version 1.3. E.
+     Rescorla. August 2018. (Format: HTML, TXT, PDF, XML) (Status:
+     PROPOSED STANDARD) (Stream: IETF) (DOI: 10.17487/RFC8446)
+"""
+
+
+@pytest.fixture()
+def server(tmp_path: Path) -> Iterator[RfcServer]:
+    """Run a server on a free port in a background thread."""
+    server = RfcServer(
+        ("127.0.0.1", 0),
+        cache=DiskCache(tmp_path / "docs"),
+        index_cache=IndexCache(tmp_path / "index"),
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture()
+def client(server: RfcServer) -> ServerClient:
+    """Get a client for the running server."""
+    return ServerClient(server.url)
+
+
+def test_memory_cache_evicts_least_recently_used() -> None:
+    """Test the oldest documents are dropped once over the size limit."""
+    cache = MemoryCache(max_size=10)
+    cache.set(1, "aaaa")
+    cache.set(2, "bbbb")
+    assert cache.get(1) == "aaaa"
+    cache.set(3, "cccc")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "aaaa"
+    assert cache.get(3) == "cccc"
+    assert cache.size == 8
+
+
+def test_memory_cache_replaces_documents() -> None:
+    """Test storing a document again replaces it in the size count."""
+    cache = MemoryCache(max_size=10)
+    cache.set(1, "aaaa")
+    cache.set(1, "aaaaaa")
+    assert cache.get(1) == "aaaaaa"
+    assert cache.size == 6
+
+
+def test_memory_cache_skips_oversized_documents() -> None:
+    """Test a document larger than the limit is not kept."""
+    cache = MemoryCache(max_size=3)
+    cache.set(1, "aaaa")
+    assert cache.get(1) is None
+    assert cache.size == 0
+
+
+@patch("rfc_lookup.server.get_rfc_report")
+def test_server_rfc_kept_in_memory(
+    mock_get_rfc_report: Mock, client: ServerClient
+) -> None:
+    """Test an RFC is fetched once and then served from memory."""
+    mock_get_rfc_report.return_value = "RFC 8446 text"
+
+    assert client.get_rfc_report(8446) == "RFC 8446 text"
+    assert client.get_rfc_report(8446) == "RFC 8446 text"
+    mock_get_rfc_report.assert_called_once()
+
+
+@patch("rfc_lookup.server.get_rfc_report")
+def test_server_rfc_invalid_id(
+    mock_get_rfc_report: Mock, client: ServerClient
+) -> None:
+    """Test an invalid RFC ID is raised as such by the client."""
+    mock_get_rfc_report.side_effect = InvalidRfcIdError("Invalid RFC ID 0")
+
+    with pytest.raises(InvalidRfcIdError, match="Invalid RFC ID 0"):
+        client.get_rfc_report(0)
+
+
+@patch("rfc_lookup.server.get_rfc_report")
+def test_server_rfc_network_error(
+    mock_get_rfc_report: Mock, client: ServerClient
+) -> None:
+    """Test an upstream failure is raised as a network error."""
+    mock_get_rfc_report.side_effect = NetworkError("timeout")
+
+    with pytest.raises(NetworkError, match="timeout"):
+        client.get_rfc_report(8446)
+
+
+@patch("rfc_lookup.server.get_latest_report_ids")
+def test_server_index(
+    mock_get_latest_report_ids: Mock, client: ServerClient
+) -> None:
+    """Test the RFC IDs of the index are returned."""
+    mock_get_latest_report_ids.return_value = [1, 2, 8446]
+    assert client.get_latest_report_ids() == [1, 2, 8446]
+
+
+@patch("rfc_lookup.utilities.get_response")
+def test_server_validate(mock_get_response: Mock, client: ServerClient) -> None:
+    """Test RFCs are checked against the issued RFCs of the index."""
+    mock_get_response.return_value = HttpResponse(
+        200, b"0001 One. A. B. June 1999.\n\n0002 Not Issued.\n"
+    )
+    assert client.validate_report_id(1)
+    with pytest.raises(InvalidRfcIdError, match="RFC 2 was never issued"):
+        client.validate_report_id(2)
+    with pytest.raises(InvalidRfcIdError, match="Invalid RFC ID 3"):
+        client.validate_report_id(3)
+
+
+@patch("rfc_lookup.server.get_search_index")
+def test_server_search_local(
+    mock_get_search_index: Mock, client: ServerClient
+) -> None:
+    """Test the search index is loaded once and searched in memory."""
+    mock_get_search_index.return_value = SearchIndex.build(
+        parse_rfc_index(INDEX)
+    )
+
+    results = client.search("tls")
+    assert [r["id"] for r in results] == [8446]
+    assert client.search("nothing") == []
+    mock_get_search_index.assert_called_once()
+
+
+@patch("rfc_lookup.server.search_rfc_editor")
+def test_server_search_online(
+    mock_search_rfc_editor: Mock, client: ServerClient
+) -> None:
+    """Test online searches go to the RFC editor."""
+    mock_search_rfc_editor.return_value = [{"id": 8446, "title": "TLS 1.3"}]
+
+    assert client.search("tls", online=True) == [
+        {"id": 8446, "title": "TLS 1.3"}
+    ]
+    mock_search_rfc_editor.assert_called_once_with("tls", SearchFilters())
+
+
+@patch("rfc_lookup.server.search_rfc_editor")
+def test_server_search_filters(
+    mock_search_rfc_editor: Mock, client: ServerClient
+) -> None:
+    """Test search filters are passed through the server."""
+    mock_search_rfc_editor.return_value = []
+    filters = SearchFilters(
+        status="historic", since=datetime.date(2001, 2, 1), limit=3
+    )
+    client.search("tls", online=True, filters=filters)
+    mock_search_rfc_editor.assert_called_once_with("tls", filters)
+
+
+def test_server_search_invalid_filters(client: ServerClient) -> None:
+    """Test a search with invalid filters is rejected."""
+    with pytest.raises(ServerUnavailableError, match="Unknown status"):
+        client.request("/search", {"q": "tls", "status": "draft"})
+
+
+def test_server_search_missing_query(client: ServerClient) -> None:
+    """Test a search without a query is rejected."""
+    with pytest.raises(ServerUnavailableError, match="Missing query"):
+        client.request("/search")
+
+
+def test_server_unknown_path(client: ServerClient) -> None:
+    """Test unknown paths are rejected."""
+    with pytest.raises(ServerUnavailableError, match="Unknown path"):
+        client.request("/nowhere")
+
+
+@patch("rfc_lookup.server.get_search_index")
+def test_server_run_announces_url(
+    mock_get_search_index: Mock, tmp_path: Path
+) -> None:
+    """Test the server file exists while the server runs."""
+    server = RfcServer(
+        ("127.0.0.1", 0),
+        cache=DiskCache(tmp_path / "docs"),
+        index_cache=IndexCache(tmp_path / "index"),
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    # The file is written before serving starts, so any answer means it
+    # is there
+    with pytest.raises(ServerUnavailableError):
+        ServerClient(server.url).request("/nowhere")
+    data = json.loads(server_file_path().read_text(encoding="utf-8"))
+    assert data["url"] == server.url
+
+    server.shutdown()
+    thread.join()
+    assert not server_file_path().exists()
+
+
+@pytest.mark.parametrize("replacement", ['{"url": "http://other"}', "{", None])
+@patch("rfc_lookup.server.get_search_index")
+def test_server_run_interrupted(
+    mock_get_search_index: Mock, tmp_path: Path, replacement: Optional[str]
+) -> None:
+    """Test an interrupted server only removes its own server file."""
+    server = RfcServer(
+        ("127.0.0.1", 0),
+        cache=DiskCache(tmp_path / "docs"),
+        index_cache=IndexCache(tmp_path / "index"),
+    )
+    path = server_file_path()
+
+    def serve_forever() -> None:
+        if replacement is None:
+            path.unlink()
+        else:
+            path.write_text(replacement, encoding="utf-8")
+        raise KeyboardInterrupt
+
+    with patch.object(server, "serve_forever", side_effect=serve_forever):
+        server.run()
+    if replacement is None:
+        assert not path.exists()
+    else:
+        assert path.read_text(encoding="utf-8") == replacement
+
+
+@patch("rfc_lookup.server.get_search_index")
+def test_server_warm_tolerates_network_error(
+    mock_get_search_index: Mock, tmp_path: Path
+) -> None:
+    """Test the server starts even if the index cannot be fetched."""
+    mock_get_search_index.side_effect = NetworkError("offline")
+    server = RfcServer(
+        ("127.0.0.1", 0),
+        cache=DiskCache(tmp_path / "docs"),
+        index_cache=IndexCache(tmp_path / "index"),
+    )
+    try:
+        server.warm()
+    finally:
+        server.server_close()
+    mock_get_search_index.assert_called_once()
+
+
+def test_server_coalesces_concurrent_fetches(server: RfcServer) -> None:
+    """Test concurrent requests for the same RFC make one upstream fetch."""
+    started = threading.Event()
+    release = threading.Event()
+    calls: List[int] = []
+
+    def fetch(report_id: int, cache: DiskCache) -> str:
+        calls.append(report_id)
+        started.set()
+        release.wait(5)
+        return "RFC 8446 text"
+
+    with patch("rfc_lookup.server.get_rfc_report", side_effect=fetch):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(
+                ServerClient(server.url).get_rfc_report, 8446
+            )
+            started.wait(5)
+            others = [
+                executor.submit(ServerClient(server.url).get_rfc_report, 8446)
+                for _ in range(3)
+            ]
+            # Give the other requests time to reach the server
+            time.sleep(0.2)
+            release.set()
+            texts = [f.result() for f in [first, *others]]
+
+    assert texts == ["RFC 8446 text"] * 4
+    assert calls == [8446]
+
+
+def _get(server: RfcServer, path: str, **headers: str) -> HTTPResponse:
+    client = ServerClient(server.url)
+    conn = HTTPConnection(client.host, client.port)
+    conn.request("GET", path, headers=headers)
+    res = conn.getresponse()
+    res.read()
+    conn.close()
+    return res
+
+
+@patch("rfc_lookup.server.get_rfc_report")
+def test_server_rfc_cache_headers(
+    mock_get_rfc_report: Mock, server: RfcServer
+) -> None:
+    """Test RFCs are cacheable forever and revalidated with their ETag."""
+    mock_get_rfc_report.return_value = "RFC 8446 text"
+
+    res = _get(server, "/rfc/8446")
+    assert res.status == 200
+    assert "immutable" in res.getheader("Cache-Control", "")
+    etag = res.getheader("ETag", "")
+    assert etag
+
+    res = _get(server, "/rfc/8446", **{"If-None-Match": etag})
+    assert res.status == 304
+
+
+@patch("rfc_lookup.server.get_latest_report_ids")
+def test_server_index_cache_headers(
+    mock_get_latest_report_ids: Mock, server: RfcServer
+) -> None:
+    """Test index answers are cacheable for the index TTL."""
+    mock_get_latest_report_ids.return_value = [1, 2]
+
+    res = _get(server, "/index")
+    assert res.status == 200
+    ttl = int(server.index_cache.ttl)
+    assert res.getheader("Cache-Control") == f"max-age={ttl}"
+
+
+def test_server_errors_not_cached(server: RfcServer) -> None:
+    """Test error responses must not be cached."""
+    res = _get(server, "/nowhere")
+    assert res.status == 404
+    assert res.getheader("Cache-Control") == "no-store"
@@ -0,0 +1,82 @@
+"""Tests for singleflight module."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from rfc_lookup.singleflight import SingleFlight
+
+
+def test_single_flight_coalesces_concurrent_calls() -> None:
+    """Test concurrent callers with the same key share one call."""
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls: List[int] = []
+
+    def fetch() -> str:
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(flights.do, "key", fetch)
+        started.wait(5)
+        followers = [
+            executor.submit(flights.do, "key", fetch) for _ in range(3)
+        ]
+        # Give the followers time to start waiting on the leader
+        time.sleep(0.2)
+        release.set()
+        results = [f.result() for f in [leader, *followers]]
+
+    assert results == ["result"] * 4
+    assert len(calls) == 1
+
+
+def test_single_flight_shares_errors() -> None:
+    """Test the exception of the call is raised for every caller."""
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail() -> None:
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(flights.do, "key", fail)
+        started.wait(5)
+        followers = [executor.submit(flights.do, "key", fail) for _ in range(3)]
+        # Give the followers time to start waiting on the leader
+        time.sleep(0.2)
+        release.set()
+        for future in [leader, *followers]:
+            with pytest.raises(ValueError, match="boom"):
+                future.result()
+    assert flights._calls == {}
+
+
+def test_single_flight_runs_again_after_completion() -> None:
+    """Test calls made one after another are not coalesced."""
+    flights = SingleFlight()
+    calls: List[int] = []
+
+    def fetch() -> int:
+        calls.append(1)
+        return len(calls)
+
+    assert flights.do("key", fetch) == 1
+    assert flights.do("key", fetch) == 2
+
+
+def test_single_flight_keys_are_independent() -> None:
+    """Test different keys run their own calls."""
+    flights = SingleFlight()
+    assert flights.do("a", lambda: "a") == "a"
+    assert flights.do("b", lambda: "b") == "b"
@@ -0,0 +1,253 @@
+"""Tests for snapshot module."""
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from rfc_lookup.cache import IndexCache, IndexState
+from rfc_lookup.index import parse_rfc_index
+from rfc_lookup.snapshot import (
+    HEADER,
+    MAGIC,
+    IndexSnapshot,
+    build_index_snapshot,
+    build_snapshot,
+    get_index_snapshot,
+)
+from rfc_lookup.utilities import HttpResponse
+from rfc_lookup.validity import Validity
+
+
+INDEX = """\
+0002 Not Issued.
+
+0791 Internet Protocol. J. Postel. September 1981. (Format: TXT=97779
+     bytes) (Obsoletes RFC0760) (Updated by RFC1349, RFC2474, RFC6864)
+     (Also STD0005) (Status: INTERNET STANDARD) (Stream: Legacy) (DOI:
+     10.17487/RFC0791)
+
+0793 Transmission Control Protocol. J. Postel. September 1981. (Format:
+     TXT=172710 bytes) (Obsoleted by RFC9293) (Also STD0007) (Status:
+     INTERNET STANDARD) (Stream: Legacy) (DOI: 10.17487/RFC0793)
+
+8446 The Transport Layer Security (TLS) Protocol Version 1.3. E.
+     Rescorla. August 2018. (Format: HTML, TXT, PDF, XML) (Obsoletes
+     RFC5077, RFC5246, RFC6961) (Updates RFC5705, RFC6066) (Status:
+     PROPOSED STANDARD) (Stream: IETF) (DOI: 10.17487/RFC8446)
+"""
+
+SNAPSHOT = build_snapshot(parse_rfc_index(INDEX))
+# The snapshot of INDEX as compiled on a machine with the other byte order
+OTHER_ORDER = MAGIC + (b"b" if SNAPSHOT[len(MAGIC)] == ord("l") else b"l")
+OTHER_ORDER += SNAPSHOT[len(OTHER_ORDER) :]
+
+
+def make_cache(path: Path, content: str = INDEX) -> IndexCache:
+    """Build an index cache holding a fresh copy of an index."""
+    cache = IndexCache(path, ttl=3600)
+    cache.save(
+        IndexState(ids=[2, 791, 793, 8446], fetched_at=1e12),
+        content.encode("utf-8"),
+    )
+    return cache
+
+
+def test_snapshot_roundtrip() -> None:
+    """Test every field of every record survives compilation."""
+    records = parse_rfc_index(INDEX)
+    snapshot = IndexSnapshot(build_snapshot(records, source="v1"))
+
+    assert snapshot.source == "v1"
+    assert len(snapshot) == 4
+    assert list(snapshot.ids) == [2, 791, 793, 8446]
+    assert list(snapshot.records()) == records
+    assert snapshot.record(8446) == records[-1]
+
+
+def test_snapshot_lookups() -> None:
+    """Test existence checks and the latest ID."""
+    snapshot = IndexSnapshot(build_snapshot(parse_rfc_index(INDEX)))
+
+    assert snapshot.source is None
+    assert snapshot.latest_id == 8446
+    assert 791 in snapshot
+    assert 792 not in snapshot
+    assert 9999 not in snapshot
+    assert snapshot.record(792) is None
+
+
+def test_snapshot_issued() -> None:
+    """Test the snapshot maps the issued RFC numbers as a bitset."""
+    snapshot = IndexSnapshot(build_snapshot(parse_rfc_index(INDEX)))
+
+    assert snapshot.issued.validity(791) is Validity.EXISTS
+    assert snapshot.issued.validity(2) is Validity.NOT_ISSUED
+    assert snapshot.issued.validity(8447) is Validity.OUT_OF_RANGE
+
+
+def test_snapshot_empty() -> None:
+    """Test a snapshot of no records."""
+    snapshot = IndexSnapshot(build_snapshot([]))
+    assert len(snapshot) == 0
+    assert snapshot.latest_id == 0
+    assert 1 not in snapshot
+
+
+@pytest.mark.parametrize(
+    "data", [b"", b"RFCSRCH1", b"RFCSNAP1", b"RFCSNAP1l\0\0\0" + b"\xff" * 20]
+)
+def test_snapshot_invalid(data: bytes) -> None:
+    """Test invalid data is rejected."""
+    with pytest.raises(ValueError):
+        IndexSnapshot(data)
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (SNAPSHOT[: len(MAGIC) + 4], "Invalid index snapshot"),
+        (OTHER_ORDER, "different byte order"),
+        (SNAPSHOT[: len(MAGIC) + HEADER.size + 8], "Truncated"),
+        (SNAPSHOT[:-1], "Truncated"),
+    ],
+)
+def test_snapshot_corrupt(data: bytes, message: str) -> None:
+    """Test truncated snapshots and those from other machines are rejected."""
+    with pytest.raises(ValueError, match=message):
+        IndexSnapshot(data)
+
+
+def test_snapshot_open(tmp_path: Path) -> None:
+    """Test a snapshot file is memory-mapped."""
+    path = tmp_path / "index.snap"
+    path.write_bytes(build_snapshot(parse_rfc_index(INDEX)))
+
+    snapshot = IndexSnapshot.open(path)
+    assert snapshot.latest_id == 8446
+    assert snapshot.record(793) is not None
+
+
+def test_get_index_snapshot_not_built(tmp_path: Path) -> None:
+    """Test no snapshot is used until one was built."""
+    cache = make_cache(tmp_path)
+    assert get_index_snapshot(cache) is None
+    assert not cache.snapshot_path.exists()
+
+
+def test_get_index_snapshot_no_index(tmp_path: Path) -> None:
+    """Test no snapshot is used without a stored index."""
+    assert get_index_snapshot(IndexCache(tmp_path)) is None
+
+
+@patch("rfc_lookup.utilities.get_response")
+def test_build_index_snapshot(mock_get_response: Mock, tmp_path: Path) -> None:
+    """Test the latest index is compiled and stored."""
+    cache = IndexCache(tmp_path, ttl=3600)
+    mock_get_response.return_value = HttpResponse(200, INDEX.encode("utf-8"))
+
+    snapshot = build_index_snapshot(cache)
+    assert snapshot.latest_id == 8446
+    assert snapshot.source == cache.content_version()
+    assert cache.snapshot_path.exists()
+    assert get_index_snapshot(cache) is snapshot
+
+
+def test_get_index_snapshot_rebuilt_on_change(tmp_path: Path) -> None:
+    """Test a built snapshot follows changes to the stored index."""
+    cache = make_cache(tmp_path)
+    records = parse_rfc_index(INDEX)
+    cache.save_snapshot(build_snapshot(records, cache.content_version()))
+    snapshot = get_index_snapshot(cache)
+    assert snapshot is not None and snapshot.latest_id == 8446
+
+    make_cache(tmp_path, INDEX + "\n9000 Not Issued.\n")
+    snapshot = get_index_snapshot(cache)
+    assert snapshot is not None
+    assert snapshot.latest_id == 9000
+    assert snapshot.source == cache.content_version()
+    assert IndexSnapshot.open(cache.snapshot_path).latest_id == 9000
+
+
+def test_get_index_snapshot_extended(tmp_path: Path) -> None:
+    """Test only the RFCs added since the snapshot was built are parsed."""
+    cache = make_cache(tmp_path)
+    cache.save_snapshot(
+        build_snapshot(parse_rfc_index(INDEX), cache.content_version())
+    )
+    delta = "9293 Transmission Control Protocol (TCP). W. Eddy, Ed.. August\n"
+    delta += "     2022. (Obsoletes RFC0791)\n\n"
+    cache.save(
+        IndexState(
+            ids=[2, 791, 793, 8446, 9293],
+            delta=delta,
+            delta_source=cache.content_version(),
+        ),
+        (delta + INDEX).encode("utf-8"),
+    )
+
+    with patch(
+        "rfc_lookup.snapshot.parse_rfc_index", wraps=parse_rfc_index
+    ) as mock_parse:
+        snapshot = get_index_snapshot(cache)
+    mock_parse.assert_called_once_with(delta)
+
+    assert snapshot is not None
+    assert snapshot.source == cache.content_version()
+    assert snapshot.latest_id == 9293
+    record = snapshot.record(791)
+    assert record is not None and record.obsoleted_by == (9293,)
+
+
+def test_get_index_snapshot_not_extended(tmp_path: Path) -> None:
+    """Test RFCs added to another version of the index are not merged."""
+    cache = make_cache(tmp_path)
+    cache.save_snapshot(build_snapshot(parse_rfc_index(INDEX), "v0"))
+    delta = "9000 Not Issued.\n\n"
+    cache.save(
+        IndexState(
+            ids=[2, 791, 793, 8446, 9000],
+            delta=delta,
+            delta_source=cache.content_version(),
+        ),
+        (delta + INDEX).encode("utf-8"),
+    )
+
+    with patch(
+        "rfc_lookup.snapshot.parse_rfc_index", wraps=parse_rfc_index
+    ) as mock_parse:
+        snapshot = get_index_snapshot(cache)
+    mock_parse.assert_called_once_with(delta + INDEX)
+
+    assert snapshot is not None
+    assert snapshot.source == cache.content_version()
+    assert snapshot.latest_id == 9000
+
+
+def test_get_index_snapshot_rebuilds_unreadable(tmp_path: Path) -> None:
+    """Test a corrupt snapshot file is recompiled."""
+    cache = make_cache(tmp_path)
+    cache.save_snapshot(b"garbage")
+
+    snapshot = get_index_snapshot(cache)
+    assert snapshot is not None
+    assert snapshot.latest_id == 8446
+
+
+def test_get_index_snapshot_text_removed(tmp_path: Path) -> None:
+    """Test no snapshot is used if the index text is gone when recompiling."""
+    cache = make_cache(tmp_path)
+    cache.save_snapshot(b"garbage")
+
+    with patch.object(IndexCache, "load_content", return_value=None):
+        assert get_index_snapshot(cache) is None
+
+
+@patch("rfc_lookup.utilities.get_response")
+def test_build_index_snapshot_default_cache(mock_get_response: Mock) -> None:
+    """Test the default index cache is compiled by default."""
+    mock_get_response.return_value = HttpResponse(200, INDEX.encode("utf-8"))
+
+    snapshot = build_index_snapshot()
+    assert snapshot.latest_id == 8446
+    assert get_index_snapshot() is snapshot
@@ -0,0 +1,263 @@
+"""Tests for store module."""
+
+import datetime
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Generator, List
+from unittest.mock import Mock, patch
+
+import pytest
+
+from rfc_lookup.cache import IndexCache, IndexState
+from rfc_lookup.errors import NetworkError, StoreError
+from rfc_lookup.filters import SearchFilters
+from rfc_lookup.index import parse_rfc_index
+from rfc_lookup.search import SearchIndex, record_result
+from rfc_lookup.store import (
+    SCHEMA,
+    MetadataStore,
+    get_metadata_store,
+    search_store,
+)
+from rfc_lookup.utilities import HttpResponse
+
+from .test_search import INDEX
+
+
+NEW_ENTRY = """\
+9999 Internet Protocol, Again. A. Writer. May 2030. (Format: TXT)
+     (Obsoletes RFC0791) (Status: PROPOSED STANDARD) (Stream: IETF)
+"""
+
+
+@pytest.fixture()
+def store(tmp_path: Path) -> MetadataStore:
+    """Build a store from the sample RFC index."""
+    store = MetadataStore(tmp_path / "rfc.sqlite")
+    store.build(parse_rfc_index(INDEX), source="1")
+    return store
+
+
+@pytest.fixture()
+def mock_get_response() -> Generator[Mock, None, None]:
+    """Mock get_response function."""
+    with patch("rfc_lookup.utilities.get_response") as mock:
+        mock.return_value = HttpResponse(200, INDEX.encode("utf-8"))
+        yield mock
+
+
+def ids(store: MetadataStore, query: str, **filters: Any) -> List[int]:
+    """Search a store and get the RFC numbers found."""
+    results = store.search(query, SearchFilters(**filters))
+    return [r["id"] for r in results]
+
+
+def test_store_search_matches_search_index(store: MetadataStore) -> None:
+    """Test the store finds what the in-memory search index finds."""
+    index = SearchIndex.build(parse_rfc_index(INDEX))
+    for query in ["protocol", "Transmission Proto", "tls", "std7", "8446"]:
+        expected = [record_result(r) for r in index.search(query)]
+        assert store.search(query) == expected
+    assert store.search("not issued") == []
+    assert store.search("()") == []
+
+
+def test_store_search_filters(store: MetadataStore) -> None:
+    """Test filters, order and limits are applied by the query."""
+    assert ids(store, "protocol", status="internet standard") == [791, 793]
+    assert ids(store, "protocol", status="standards track") == [791, 793, 8446]
+    assert ids(store, "protocol", since=datetime.date(1981, 10, 1)) == [8446]
+    assert ids(store, "protocol", until=datetime.date(1981, 9, 1)) == [
+        791,
+        793,
+    ]
+    assert ids(store, "protocol", author="resc") == [8446]
+    assert ids(store, "protocol", author="...") == [791, 793, 8446]
+    assert ids(store, "protocol", sort="title") == [791, 8446, 793]
+    assert ids(store, "protocol", sort="date", descending=True) == [
+        8446,
+        793,
+        791,
+    ]
+    assert ids(store, "protocol", descending=True, limit=1) == [8446]
+
+
+def test_store_records_and_relations(store: MetadataStore) -> None:
+    """Test records and relations are read back in both directions."""
+    records = {r.number: r for r in parse_rfc_index(INDEX)}
+    assert store.get(8446) == records[8446]
+    assert store.get(1) is None
+    assert store.get_many([793, 791, 1]) == [
+        (791, records[791]),
+        (793, records[793]),
+    ]
+    assert store.related(8446, "obsoletes") == [5077, 5246, 6961]
+    assert store.related(5246, "obsoletes", reverse=True) == [8446]
+    assert store.related(6066, "updates", reverse=True) == [8446]
+    assert store.related(793, "updates") == []
+
+
+def test_store_concurrent_reads(store: MetadataStore) -> None:
+    """Test threads search the store at the same time."""
+    barrier = threading.Barrier(4)
+
+    def search(_: int) -> List[int]:
+        barrier.wait()
+        return ids(store, "protocol", author="postel")
+
+    with ThreadPoolExecutor(4) as executor:
+        assert list(executor.map(search, range(4))) == [[791, 793]] * 4
+
+
+def test_store_rebuild(store: MetadataStore) -> None:
+    """Test readers see a rebuilt store."""
+    assert ids(store, "protocol") == [791, 793, 8446]
+    store.build(parse_rfc_index(NEW_ENTRY), source="2")
+    assert store.source == "2"
+    assert ids(store, "protocol") == [9999]
+
+
+def test_store_unreadable(tmp_path: Path) -> None:
+    """Test unreadable stores raise StoreError and have no source."""
+    path = tmp_path / "rfc.sqlite"
+    path.write_bytes(b"not a database" * 100)
+    store = MetadataStore(path)
+    assert store.source is None
+    with pytest.raises(StoreError):
+        store.search("tls")
+    assert MetadataStore(tmp_path / "missing.sqlite").source is None
+
+
+def test_get_metadata_store(mock_get_response: Mock, tmp_path: Path) -> None:
+    """Test the store is built once and reused until the text changes."""
+    cache = IndexCache(tmp_path, ttl=60)
+    store = get_metadata_store(cache)
+    assert store.source == cache.content_version()
+    assert cache.store_path.exists()
+
+    with patch.object(MetadataStore, "build") as mock_build:
+        assert get_metadata_store(cache) is store
+    mock_build.assert_not_called()
+
+    cache.save(IndexState(ids=[791], fetched_at=time.time()), b"0791 IP.\n")
+    assert [r["id"] for r in search_store("ip", cache)] == [791]
+
+
+def test_get_metadata_store_incremental(
+    mock_get_response: Mock, tmp_path: Path
+) -> None:
+    """Test new RFCs are added without rebuilding the store."""
+    cache = IndexCache(tmp_path, ttl=0)
+    # The latest index lists the newest RFCs first
+    entries = INDEX.strip().split("\n\n")[::-1]
+    old = "\n\n".join(entries) + "\n"
+    mock_get_response.return_value = HttpResponse(200, old.encode("utf-8"))
+    get_metadata_store(cache)
+
+    latest = NEW_ENTRY + "\n" + old
+    mock_get_response.return_value = HttpResponse(200, latest.encode("utf-8"))
+    with patch.object(MetadataStore, "build") as mock_build:
+        store = get_metadata_store(cache)
+    mock_build.assert_not_called()
+
+    assert store.source == cache.content_version()
+    assert ids(store, "protocol") == [791, 793, 8446, 9999]
+    assert ids(store, "again") == [9999]
+    record = store.get(791)
+    assert record is not None and record.obsoleted_by == (9999,)
+    assert store.related(791, "obsoletes", reverse=True) == [9999]
+
+
+def test_get_metadata_store_rebuild(
+    mock_get_response: Mock, tmp_path: Path
+) -> None:
+    """Test the store is rebuilt when new RFCs cannot be added on their own."""
+    cache = IndexCache(tmp_path, ttl=0)
+    entries = INDEX.strip().split("\n\n")[::-1]
+    old = "\n\n".join(entries) + "\n"
+    mock_get_response.return_value = HttpResponse(200, old.encode("utf-8"))
+    store = get_metadata_store(cache)
+
+    # The new RFCs are already in the store
+    store.extend(parse_rfc_index(NEW_ENTRY), source=store.source)
+    latest = NEW_ENTRY + "\n" + old
+    mock_get_response.return_value = HttpResponse(200, latest.encode("utf-8"))
+    with patch.object(MetadataStore, "build", autospec=True) as mock_build:
+        get_metadata_store(cache)
+    mock_build.assert_called_once()
+
+    # The index changed twice since the store was built
+    store.build(parse_rfc_index(old), source="old")
+    with patch.object(MetadataStore, "build", autospec=True) as mock_build:
+        get_metadata_store(cache)
+    mock_build.assert_called_once()
+
+
+def test_get_metadata_store_offline(
+    mock_get_response: Mock, tmp_path: Path
+) -> None:
+    """Test stored copies are searched when the network is unavailable."""
+    cache = IndexCache(tmp_path, ttl=0)
+    cache.save(IndexState(ids=[791]), INDEX.encode("utf-8"))
+    mock_get_response.side_effect = NetworkError("offline")
+    assert [r["id"] for r in search_store("tls", cache)] == [8446]
+
+    cache.content_path.unlink()
+    assert [r["id"] for r in search_store("tls", cache)] == [8446]
+
+    cache.store_path.write_bytes(b"corrupt")
+    with pytest.raises(NetworkError):
+        get_metadata_store(cache)
+
+
+def test_store_schema_mismatch(store: MetadataStore) -> None:
+    """Test stores from another schema version have no source."""
+    conn = sqlite3.connect(str(store.path))
+    with conn:
+        conn.execute("UPDATE meta SET value = '0' WHERE key = 'schema'")
+    conn.close()
+    assert MetadataStore(store.path).source is None
+
+
+def test_store_missing(tmp_path: Path) -> None:
+    """Test reading a store that was never built raises StoreError."""
+    store = MetadataStore(tmp_path / "missing.sqlite")
+    with pytest.raises(StoreError, match="Unable to open"):
+        store.get(8446)
+
+
+def test_store_close(store: MetadataStore) -> None:
+    """Test the store reconnects after closing the thread's connection."""
+    assert ids(store, "tls") == [8446]
+    store.close()
+    store.close()
+    assert ids(store, "tls") == [8446]
+
+
+def test_store_build_without_fts5(tmp_path: Path) -> None:
+    """Test building raises StoreError when SQLite has no FTS5."""
+    path = tmp_path / "rfc.sqlite"
+    store = MetadataStore(path)
+    schema = SCHEMA.replace("USING fts5", "USING no_such_module")
+    with patch("rfc_lookup.store.SCHEMA", schema):
+        with pytest.raises(StoreError, match="Unable to build"):
+            store.build(parse_rfc_index(INDEX), source="1")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_store_extend_unwritable(tmp_path: Path) -> None:
+    """Test extending an unwritable store raises StoreError."""
+    path = tmp_path / "rfc.sqlite"
+    path.write_bytes(b"not a database" * 100)
+    store = MetadataStore(path)
+    records = parse_rfc_index("0001 Host Software. S. Crocker. April 1969.")
+    with pytest.raises(StoreError, match="Unable to update"):
+        store.extend(records, source="2")
+
+
+def test_get_metadata_store_default_cache(mock_get_response: Mock) -> None:
+    """Test the store of the default index cache is used by default."""
+    assert [r["id"] for r in search_store("tls")] == [8446]
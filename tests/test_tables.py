@@ -0,0 +1,93 @@
+"""Tests for tables module."""
+
+from typing import Iterator, List, Optional, Tuple
+
+import pytest
+from bs4 import BeautifulSoup, Tag
+
+from rfc_lookup.tables import TableCell, TableParser, iter_table_rows
+
+
+Row = List[Tuple[str, List[Tuple[Optional[str], str]]]]
+
+PAGES = [
+    # A typical result table with entities, bare and missing links
+    """<html><body><table><tr><td>layout</td></tr></table>
+<table class="gridtable"><tr><th>Number</th></tr>
+<tr><td><a href="/info/rfc1">RFC&nbsp;1</a></td>
+<td><a href="a.txt">TXT</a>, <a href>HTML</a> <a>PDF</a></td>
+<td>Tom &amp; Jerry<br/> Part&#160;2</td><td>\n  J. Doe  \n</td></tr>
+</table><table class="gridtable"><tr><td>second</td></tr></table>""",
+    # Unclosed rows and cells, stray end tags and hidden text
+    """<table class="other gridtable"><tr><td>one<td>two</span>
+<tr><td>three<script>var x = "<td>";</script><!-- c --></td>
+<td><style>p {}</style>four</td></table>""",
+    # Nested tables and a target table inside a layout table
+    """<table><tr><td><table class=gridtable><tr><td>a<table><tr><td>b
+</td></tr></table></td><td><a href="x">c</a></td></tr><tr><td>d</td></tr>
+</table></td></tr></table>""",
+    # A document that ends before the table does
+    """<table class="gridtable"><tr><td>open""",
+    # No matching table
+    """<table class="grid"><tr><td>x</td></tr></table>""",
+]
+
+
+def soup_rows(html: str) -> List[Row]:
+    """Extract the rows the way BeautifulSoup sees them."""
+    table = BeautifulSoup(html, "html.parser").find("table", class_="gridtable")
+    if not isinstance(table, Tag):
+        return []
+    return [
+        [
+            (
+                td.text,
+                [(a.get("href"), a.text) for a in td.find_all("a")],
+            )
+            for td in tr.find_all("td")
+        ]
+        for tr in table.find_all("tr")
+    ]
+
+
+def cell_values(cells: List[TableCell]) -> Row:
+    """Convert streamed cells into comparable values."""
+    return [
+        (cell.text, [(link.href, link.text) for link in cell.links])
+        for cell in cells
+    ]
+
+
+def chunked(text: str, size: int) -> Iterator[str]:
+    """Split text into pieces of the given size."""
+    for i in range(0, len(text), size):
+        yield text[i : i + size]
+
+
+@pytest.mark.parametrize("html", PAGES)
+@pytest.mark.parametrize("size", [1, 7, 4096])
+def test_iter_table_rows_matches_soup(html: str, size: int) -> None:
+    """Test streamed rows match BeautifulSoup for any chunk size."""
+    rows = iter_table_rows(chunked(html, size), "gridtable")
+    assert [cell_values(cells) for cells in rows] == soup_rows(html)
+
+
+def test_table_parser_yields_rows_early() -> None:
+    """Test rows are available as soon as they are closed."""
+    parser = TableParser("gridtable")
+    parser.feed('<table class="gridtable"><tr><td>a</td></tr><tr><td>b')
+    assert [cell_values(cells) for cells in parser.pop_rows()] == [[("a", [])]]
+    assert parser.pop_rows() == []
+    parser.feed("</td></tr></table><p>ignored")
+    assert parser.finished
+    assert len(parser.pop_rows()) == 1
+
+
+def test_iter_table_rows_stops_after_table() -> None:
+    """Test the rest of the page is not read once the table has ended."""
+
+    def pages() -> Iterator[str]:
+        yield '<table class="gridtable"><tr><td>a</td></tr></table>'
+        raise AssertionError("read past the table")
+
+    assert len(list(iter_table_rows(pages(), "gridtable"))) == 1
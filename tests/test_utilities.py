@@ -1,22 +1,50 @@
 """Tests for utilities module."""
 
+import http.client
+import io
 import logging
+import threading
+import time
 import urllib.parse
-from typing import Generator
-from unittest.mock import Mock, patch
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Generator, Optional
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from bs4 import BeautifulSoup, Tag
 
-from rfc_lookup.constants import DEFAULT_HEADERS
+import rfc_lookup.utilities
+from rfc_lookup.cache import DiskCache, IndexCache, IndexState
+from rfc_lookup.constants import DEFAULT_HEADERS, MIRROR_DIR_ENV, RETRIES_ENV
+from rfc_lookup.decoding import accept_encoding
 from rfc_lookup.errors import InvalidRfcIdError, NetworkError
+from rfc_lookup.filters import SearchFilters
+from rfc_lookup.index import parse_rfc_index
+from rfc_lookup.snapshot import build_snapshot
 from rfc_lookup.utilities import (
+    HttpResponse,
     clean_chars,
+    download_rfc_report,
     extract_authors,
     get_latest_report_ids,
+    get_report_id_bitset,
     get_request,
+    get_response,
     get_rfc_report,
+    get_rfc_reports,
+    index_report_id_bitset,
+    iter_rfc_report,
+    iter_search_results,
+    iter_search_rfc_editor,
+    parse_not_issued_ids,
+    parse_report_ids,
+    parse_search_results,
+    rfc_file_url,
+    save_rfc_reports,
+    search_cache_key,
     search_rfc_editor,
+    split_new_entries,
 )
 
 
@@ -39,48 +67,155 @@ def test_extract_authors() -> None:
     ]
 
 
-@pytest.fixture
-def mock_request() -> Generator[Mock, None, None]:
-    """Mock Request object."""
-    with patch("rfc_lookup.utilities.urllib.request.Request") as mock:
-        yield mock
+REQUEST_HEADERS = {**DEFAULT_HEADERS, "Accept-Encoding": accept_encoding()}
+
+
+def make_pooled_response(
+    body: bytes = b"",
+    status: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> Mock:
+    """Build a fake pooled response."""
+    res = MagicMock()
+    res.status = status
+    res.reason = "Reason"
+    res.headers = headers or {}
+    res.read.side_effect = [body]
+    res.__enter__.return_value = res
+    return res
 
 
 @pytest.fixture
-def mock_urlopen() -> Generator[Mock, None, None]:
-    """Mock urlopen context manager."""
-    with patch("rfc_lookup.utilities.urllib.request.urlopen") as mock:
-        yield mock
+def mock_pool() -> Generator[Mock, None, None]:
+    """Mock the shared connection pool."""
+    with patch("rfc_lookup.utilities.get_default_pool") as mock:
+        yield mock.return_value
 
 
-def test_get_request(mock_request: Mock, mock_urlopen: Mock) -> None:
+def test_get_request(mock_pool: Mock) -> None:
     """Test get_request."""
     mock_url = "http://127.0.0.1:80/"
     mock_result = b"Hello, World!"
-    mock_read = Mock()
-    mock_read.read.side_effect = [mock_result]
-    mock_urlopen.return_value = mock_read
+    mock_pool.request.return_value = make_pooled_response(mock_result)
     result = get_request(mock_url)
-    mock_request.assert_called_once_with(mock_url, headers=DEFAULT_HEADERS)
+    mock_pool.request.assert_called_once_with(mock_url, headers=REQUEST_HEADERS)
     assert result == mock_result
 
 
-def test_get_request_with_params(
-    mock_request: Mock, mock_urlopen: Mock
-) -> None:
+def test_get_request_with_params(mock_pool: Mock) -> None:
     """Test get_request with query parameters."""
     mock_url = "http://127.0.0.1:80/"
     mock_params = {"a": "1", "b": "2"}
     mock_full_url = f"{mock_url}?{urllib.parse.urlencode(mock_params)}"
     mock_result = b"Hello, World!"
-    mock_read = Mock()
-    mock_read.read.side_effect = [mock_result]
-    mock_urlopen.return_value = mock_read
+    mock_pool.request.return_value = make_pooled_response(mock_result)
     result = get_request(mock_url, params=mock_params)
-    mock_request.assert_called_once_with(mock_full_url, headers=DEFAULT_HEADERS)
+    mock_pool.request.assert_called_once_with(
+        mock_full_url, headers=REQUEST_HEADERS
+    )
     assert result == mock_result
 
 
+def test_get_response_headers(mock_pool: Mock) -> None:
+    """Test get_response merges request headers and returns response ones."""
+    mock_url = "http://127.0.0.1:80/"
+    mock_pool.request.return_value = make_pooled_response(
+        b"body", headers={"etag": '"abc"'}
+    )
+    result = get_response(mock_url, headers={"If-None-Match": '"xyz"'})
+    mock_pool.request.assert_called_once_with(
+        mock_url, headers={**REQUEST_HEADERS, "If-None-Match": '"xyz"'}
+    )
+    assert result == HttpResponse(200, b"body", {"etag": '"abc"'})
+
+
+def test_get_response_not_modified(mock_pool: Mock) -> None:
+    """Test get_response returns 304 responses instead of raising."""
+    mock_pool.request.return_value = make_pooled_response(status=304)
+    result = get_response("http://127.0.0.1:80/")
+    assert result.status == 304
+    assert result.body == b""
+
+
+def test_get_response_redirect(mock_pool: Mock) -> None:
+    """Test get_response follows redirects."""
+    mock_pool.request.side_effect = [
+        make_pooled_response(status=301, headers={"location": "/new"}),
+        make_pooled_response(b"moved"),
+    ]
+    assert get_request("http://127.0.0.1:80/old") == b"moved"
+    assert mock_pool.request.call_args.args[0] == "http://127.0.0.1:80/new"
+
+
+def test_get_response_too_many_redirects(mock_pool: Mock) -> None:
+    """Test get_response gives up on redirect loops."""
+    mock_pool.request.side_effect = lambda url, headers: make_pooled_response(
+        status=302, headers={"location": "/loop"}
+    )
+    with pytest.raises(NetworkError, match="too many redirects"):
+        get_request("http://127.0.0.1:80/")
+
+
+def test_get_response_http_error(mock_pool: Mock) -> None:
+    """Test get_response raises NetworkError on HTTP errors."""
+    res = make_pooled_response(status=500)
+    mock_pool.request.return_value = res
+    with pytest.raises(NetworkError, match="HTTP Error 500"):
+        get_response("http://127.0.0.1:80/")
+    res.close.assert_called_once_with()
+
+
+def test_get_response_read_error(mock_pool: Mock) -> None:
+    """Test get_response raises NetworkError when the body is cut short."""
+    res = make_pooled_response()
+    res.read.side_effect = http.client.IncompleteRead(b"")
+    mock_pool.request.return_value = res
+    with pytest.raises(NetworkError):
+        get_response("http://127.0.0.1:80/")
+
+
+@pytest.fixture
+def retries(monkeypatch: pytest.MonkeyPatch) -> Generator[Mock, None, None]:
+    """Allow two retries without waiting for them."""
+    monkeypatch.setenv(RETRIES_ENV, "2")
+    with patch("rfc_lookup.utilities.time.sleep") as mock_sleep:
+        yield mock_sleep
+
+
+def test_get_response_retries_unavailable(
+    mock_pool: Mock, retries: Mock
+) -> None:
+    """Test 503 answers are retried after the delay the server asks for."""
+    mock_pool.request.side_effect = [
+        make_pooled_response(status=503, headers={"retry-after": "2"}),
+        make_pooled_response(b"ok"),
+    ]
+    assert get_request("http://127.0.0.1:80/") == b"ok"
+    retries.assert_called_once_with(2.0)
+
+
+def test_get_response_retries_connection_errors(
+    mock_pool: Mock, retries: Mock
+) -> None:
+    """Test connection errors are retried until the retries run out."""
+    mock_pool.request.side_effect = ConnectionResetError("reset")
+    with pytest.raises(NetworkError, match="reset"):
+        get_request("http://127.0.0.1:80/")
+    assert mock_pool.request.call_count == 3
+    assert retries.call_count == 2
+
+
+def test_get_response_client_error_not_retried(
+    mock_pool: Mock, retries: Mock
+) -> None:
+    """Test HTTP errors other than 429 and 5xx fail at once."""
+    mock_pool.request.return_value = make_pooled_response(status=404)
+    with pytest.raises(NetworkError, match="HTTP Error 404"):
+        get_request("http://127.0.0.1:80/")
+    mock_pool.request.assert_called_once()
+    retries.assert_not_called()
+
+
 def test_get_request_invalid_url() -> None:
     """Test get_request with an empty URL."""
     with pytest.raises(ValueError):
@@ -93,17 +228,50 @@ def test_get_request_invalid_scheme() -> None:
         get_request("ssh:127.0.0.1")
 
 
-def test_get_request_network_error(
-    mock_request: Mock, mock_urlopen: Mock
-) -> None:
-    """Test get_request raises NetworkError on URLError."""
-    import urllib.error
-
-    mock_urlopen.side_effect = urllib.error.URLError("connection refused")
+def test_get_request_network_error(mock_pool: Mock) -> None:
+    """Test get_request raises NetworkError on connection errors."""
+    mock_pool.request.side_effect = ConnectionRefusedError("connection refused")
     with pytest.raises(NetworkError):
         get_request("http://127.0.0.1:80/")
 
 
+def test_get_response_coalesces_concurrent_requests(mock_pool: Mock) -> None:
+    """Test concurrent requests for the same URL share one request."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def request(url: str, headers: Dict[str, str]) -> Mock:
+        started.set()
+        release.wait(5)
+        return make_pooled_response(b"shared")
+
+    mock_pool.request.side_effect = request
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        first = executor.submit(get_request, "http://127.0.0.1:80/")
+        started.wait(5)
+        others = [
+            executor.submit(get_request, "http://127.0.0.1:80/")
+            for _ in range(3)
+        ]
+        # Give the other requests time to join the one in flight
+        time.sleep(0.2)
+        release.set()
+        bodies = [f.result() for f in [first, *others]]
+
+    assert bodies == [b"shared"] * 4
+    mock_pool.request.assert_called_once()
+
+
+def test_get_response_not_coalesced_after_completion(mock_pool: Mock) -> None:
+    """Test requests made one after another are all sent."""
+    mock_pool.request.side_effect = [
+        make_pooled_response(b"first"),
+        make_pooled_response(b"second"),
+    ]
+    assert get_request("http://127.0.0.1:80/") == b"first"
+    assert get_request("http://127.0.0.1:80/") == b"second"
+
+
 @pytest.fixture
 def mock_get_request() -> Generator[Mock, None, None]:
     """Mock get_request function."""
@@ -144,6 +312,93 @@ def test_search_rfc_editor(mock_get_request: Mock) -> None:
     assert result == mock_result
 
 
+def test_search_rfc_editor_cached(mock_get_request: Mock) -> None:
+    """Test repeated searches are answered from the result cache."""
+    mock_get_request.return_value = mock_valid_rfc_search
+    result = search_rfc_editor("Hello,  World!")
+    result[0]["title"] = "Changed"
+    assert search_rfc_editor("hello, world!")[0]["title"] == "Title Here"
+    assert list(iter_search_rfc_editor("HELLO, WORLD!"))[0]["id"] == 1
+    mock_get_request.assert_called_once()
+
+
+def test_search_rfc_editor_filters(mock_get_request: Mock) -> None:
+    """Test filters are sent upstream and the limit cuts the results."""
+    html = mock_valid_rfc_search.decode("utf-8")
+    row_start = html.index("<tr>", html.index("</tr>"))
+    row = html[row_start : html.index("</tr>", row_start) + 5]
+    mock_get_request.return_value = html.replace(
+        row, row + row.replace("RFC 1", "RFC 2")
+    ).encode("utf-8")
+    filters = SearchFilters(status="Internet Standard", limit=1)
+
+    with patch(
+        "rfc_lookup.utilities._search_result",
+        wraps=rfc_lookup.utilities._search_result,
+    ) as mock_search_result:
+        result = search_rfc_editor("Hello", filters)
+    assert [r["id"] for r in result] == [1]
+    # Rows past the limit are never parsed
+    mock_search_result.assert_called_once()
+    params = mock_get_request.call_args.args[1]
+    assert params["title"] == "Hello"
+    assert params["pubstatus[]"] == "Standards Track"
+    assert params["std_trk"] == "Internet Standard"
+    assert params["page"] == "25"
+    assert search_rfc_editor("Hello") != result
+
+
+def test_search_cache_key() -> None:
+    """Test search keys ignore case and surrounding whitespace."""
+    assert search_cache_key(" Hello\tWorld ") == search_cache_key("hello world")
+    assert search_cache_key("hello") != search_cache_key("world")
+
+
+def test_iter_search_results() -> None:
+    """Test results stream out of a page read in small pieces."""
+    html = mock_valid_rfc_search.decode("utf-8")
+    chunks = (html[i : i + 5] for i in range(0, len(html), 5))
+    assert list(iter_search_results(chunks)) == parse_search_results(html)
+    assert parse_search_results(html)[0]["id"] == 1
+
+
+def test_iter_search_rfc_editor(mock_pool: Mock) -> None:
+    """Test results are yielded while the result page is still downloading."""
+    html = mock_valid_rfc_search.replace(b"RFC 1", "RFC\u00a01".encode())
+    # Split inside the two-byte no-break space
+    split = html.index(b"\xa0")
+    res = make_streaming_response(html[:split], html[split:], b"<p>more")
+    mock_pool.request.return_value = res
+
+    results = iter_search_rfc_editor("Hello", chunk_size=16)
+    mock_pool.request.assert_not_called()
+    assert [r["id"] for r in results] == [1]
+    url = mock_pool.request.call_args.args[0]
+    assert urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)["title"] == [
+        "Hello"
+    ]
+    res.read.assert_called_with(16)
+    # Reading stops once the table has ended
+    assert res.read.call_count == 2
+
+
+def test_iter_search_rfc_editor_error(mock_pool: Mock) -> None:
+    """Test read errors while streaming raise NetworkError."""
+    res = make_streaming_response()
+    res.read.side_effect = ConnectionResetError("reset")
+    mock_pool.request.return_value = res
+    with pytest.raises(NetworkError):
+        list(iter_search_rfc_editor("Hello"))
+
+
+def test_iter_search_rfc_editor_no_table(mock_pool: Mock) -> None:
+    """Test a page without a result table is read to the end."""
+    res = make_streaming_response(b"<p>No results", b"</p>")
+    mock_pool.request.return_value = res
+    assert list(iter_search_rfc_editor("Hello")) == []
+    assert res.read.call_count == 3
+
+
 def test_search_rfc_editor_empty(mock_get_request: Mock) -> None:
     """Test requests for empty rfc editor."""
     mock_get_request.return_value = b"Hello, World"
@@ -200,13 +455,164 @@ abcd Lorem ipsum dolor sit amet, consectetur adipiscing elit.
 """
 
 
-def test_get_latest_report_ids(mock_get_request: Mock) -> None:
+@pytest.fixture
+def mock_get_response() -> Generator[Mock, None, None]:
+    """Mock get_response function."""
+    with patch("rfc_lookup.utilities.get_response") as mock:
+        yield mock
+
+
+def test_get_latest_report_ids(mock_get_response: Mock) -> None:
     """Test for fetching valid request ID's."""
-    mock_get_request.return_value = mock_latest_reports
+    mock_get_response.return_value = HttpResponse(200, mock_latest_reports)
     result = get_latest_report_ids()
     assert result == [1234]
 
 
+def test_parse_report_ids() -> None:
+    """Test parsing RFC IDs from the index text."""
+    assert parse_report_ids("2 Two\n1 One\nabc Nope\n") == [1, 2]
+
+
+def test_parse_not_issued_ids() -> None:
+    """Test parsing the never issued RFC numbers from the index text."""
+    content = "0002 Not Issued.\n\n0003 Three.\n\n0001 Not Issued.\n"
+    assert parse_not_issued_ids(content) == [1, 2]
+
+
+def test_get_report_id_bitset(mock_get_response: Mock, tmp_path: Path) -> None:
+    """Test never issued RFCs are recorded and rejected."""
+    cache = IndexCache(tmp_path, ttl=60)
+    mock_get_response.return_value = HttpResponse(
+        200, b"0001 One.\n\n0002 Not Issued.\n\n0003 Three.\n"
+    )
+    bitset = get_report_id_bitset(cache)
+
+    state = cache.load()
+    assert state is not None and state.not_issued == [2]
+    assert 1 in bitset
+    assert 3 in bitset
+    with pytest.raises(InvalidRfcIdError, match="never issued"):
+        bitset.check(2)
+
+
+def test_index_report_id_bitset_memoized(tmp_path: Path) -> None:
+    """Test the bitset is built once per version of the stored index."""
+    cache = IndexCache(tmp_path, ttl=60)
+    content = b"0001 One.\n\n0002 Not Issued.\n\n0003 Three.\n"
+    cache.save(IndexState(ids=[1, 2, 3], not_issued=[2]), content)
+    bitset = index_report_id_bitset(cache, [1, 2, 3])
+    with patch.object(IndexCache, "load") as mock_load:
+        assert index_report_id_bitset(cache, [1, 2, 3]) is bitset
+        mock_load.assert_not_called()
+
+    cache.save(IndexState(ids=[1, 2, 3, 4]), content + b"\n0004 Four.\n")
+    rebuilt = index_report_id_bitset(cache, [1, 2, 3, 4])
+    assert rebuilt is not bitset
+    assert 2 in rebuilt and 4 in rebuilt
+
+
+LATEST_INDEX = "0003 Three.\n\n0002 Not Issued.\n\n0001 One.\n"
+
+
+def test_split_new_entries() -> None:
+    """Test the entries above the latest known RFC are split off."""
+    assert split_new_entries(LATEST_INDEX, 1) == (
+        "0003 Three.\n\n0002 Not Issued.\n\n"
+    )
+    assert split_new_entries(LATEST_INDEX, 3) == ""
+    # Without a known entry, or out of order, nothing can be merged
+    assert split_new_entries(LATEST_INDEX, 0) is None
+    assert split_new_entries("0001 One.\n\n0002 Two.\n", 1) is None
+    unordered = "0002 Two.\n\n0003 Three.\n\n0001 One.\n"
+    assert split_new_entries(unordered, 1) is None
+    # Known entries must be unchanged from the stored text
+    known = "RFC INDEX\n\n0001 One.\n"
+    assert split_new_entries(LATEST_INDEX, 1, known) == (
+        "0003 Three.\n\n0002 Not Issued.\n\n"
+    )
+    assert split_new_entries(LATEST_INDEX, 1, "0001 Uno.\n") is None
+    assert split_new_entries(LATEST_INDEX, 3, LATEST_INDEX[:-2]) is None
+
+
+def test_get_latest_report_ids_incremental(
+    mock_get_response: Mock, tmp_path: Path
+) -> None:
+    """Test a refresh only parses the entries of the new RFCs."""
+    cache = IndexCache(tmp_path, ttl=0)
+    cache.save(IndexState(ids=[1]), b"0001 One.\n")
+    version = cache.content_version()
+    mock_get_response.return_value = HttpResponse(
+        200, LATEST_INDEX.encode("utf-8")
+    )
+
+    with patch(
+        "rfc_lookup.utilities.parse_report_ids", wraps=parse_report_ids
+    ) as mock_parse:
+        assert get_latest_report_ids(cache) == [1, 2, 3]
+    mock_parse.assert_called_once_with("0003 Three.\n\n0002 Not Issued.\n\n")
+
+    state = cache.load()
+    assert state is not None
+    assert state.not_issued == [2]
+    assert state.delta_source == version
+    assert cache.load_content() == LATEST_INDEX
+
+
+def test_get_latest_report_ids_fresh_cache(
+    mock_get_response: Mock, tmp_path: Path
+) -> None:
+    """Test a fresh cached index is used without any request."""
+    cache = IndexCache(tmp_path, ttl=60)
+    mock_get_response.return_value = HttpResponse(200, mock_latest_reports)
+    assert get_latest_report_ids(cache) == [1234]
+    assert cache.content_path.read_bytes() == mock_latest_reports
+
+    mock_get_response.reset_mock()
+    assert get_latest_report_ids(cache) == [1234]
+    mock_get_response.assert_not_called()
+
+
+def test_get_latest_report_ids_revalidate(
+    mock_get_response: Mock, tmp_path: Path
+) -> None:
+    """Test a stale cached index is revalidated with conditional headers."""
+    cache = IndexCache(tmp_path, ttl=0)
+    cache.save(
+        IndexState(
+            ids=[1, 2],
+            etag='"abc"',
+            last_modified="Mon, 01 Jan 2024 00:00:00 GMT",
+        )
+    )
+    mock_get_response.return_value = HttpResponse(304)
+    with patch("rfc_lookup.utilities.parse_report_ids") as mock_parse:
+        assert get_latest_report_ids(cache) == [1, 2]
+    mock_parse.assert_not_called()
+    assert mock_get_response.call_args.kwargs["headers"] == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    state = cache.load()
+    assert state is not None and state.fetched_at > 0
+
+
+def test_get_latest_report_ids_changed(
+    mock_get_response: Mock, tmp_path: Path
+) -> None:
+    """Test a changed index is downloaded and re-parsed."""
+    cache = IndexCache(tmp_path, ttl=0)
+    cache.save(IndexState(ids=[1, 2], etag='"abc"'))
+    mock_get_response.return_value = HttpResponse(
+        200, mock_latest_reports, {"etag": '"def"'}
+    )
+    assert get_latest_report_ids(cache) == [1234]
+    state = cache.load()
+    assert state is not None
+    assert state.ids == [1234]
+    assert state.etag == '"def"'
+
+
 @pytest.fixture()
 def mock_get_latest_report_ids() -> Generator[Mock, None, None]:
     """Mock get_latest_report_ids function."""
@@ -215,7 +621,7 @@ def mock_get_latest_report_ids() -> Generator[Mock, None, None]:
 
 
 def test_get_rfc_report(
-    mock_get_request: Mock, mock_get_latest_report_ids: Mock
+    mock_get_request: Mock, mock_get_latest_report_ids: Mock, tmp_path: Path
 ) -> None:
     """Test fetching rfc report."""
     mock_get_latest_report_ids.return_value = [2]
@@ -223,6 +629,63 @@ def test_get_rfc_report(
     result = get_rfc_report(1)
     assert result == "Hello, World!"
 
+    cache = DiskCache(tmp_path, max_size=1024)
+    assert get_rfc_report(2, cache) == "Hello, World!"
+    assert cache.get("https://www.rfc-editor.org/rfc/rfc2.txt") is not None
+
+
+def test_get_rfc_report_cached(
+    mock_get_request: Mock, mock_get_latest_report_ids: Mock
+) -> None:
+    """Test a cached rfc report is served without network requests."""
+    mock_get_latest_report_ids.return_value = [2]
+    mock_get_request.return_value = b"Hello, World!"
+    assert get_rfc_report(1) == "Hello, World!"
+
+    mock_get_request.reset_mock()
+    mock_get_latest_report_ids.reset_mock()
+    assert get_rfc_report(1) == "Hello, World!"
+    mock_get_request.assert_not_called()
+    mock_get_latest_report_ids.assert_not_called()
+
+
+def test_get_rfc_report_checked_against_snapshot(
+    mock_get_request: Mock, mock_get_latest_report_ids: Mock
+) -> None:
+    """Test IDs within a built snapshot are accepted without the index."""
+    cache = IndexCache()
+    cache.save(IndexState(ids=[1234]), mock_latest_reports)
+    cache.save_snapshot(
+        build_snapshot(
+            parse_rfc_index(mock_latest_reports.decode("utf-8")),
+            cache.content_version(),
+        )
+    )
+    mock_get_request.return_value = b"Hello, World!"
+
+    assert get_rfc_report(1000) == "Hello, World!"
+    mock_get_latest_report_ids.assert_not_called()
+
+    mock_get_latest_report_ids.return_value = [1234]
+    with pytest.raises(InvalidRfcIdError):
+        get_rfc_report(1235)
+    mock_get_latest_report_ids.assert_called_once_with(None)
+
+
+def test_get_rfc_report_from_mirror(
+    mock_get_request: Mock,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a configured mirror is read before the cache or the network."""
+    (tmp_path / "rfc1234.txt").write_bytes(b"Mirrored RFC")
+    monkeypatch.setenv(MIRROR_DIR_ENV, str(tmp_path))
+
+    assert get_rfc_report(1234) == "Mirrored RFC"
+    assert b"".join(iter_rfc_report(1234, chunk_size=4)) == b"Mirrored RFC"
+    assert dict(get_rfc_reports([1234])) == {1234: "Mirrored RFC"}
+    mock_get_request.assert_not_called()
+
 
 def test_get_rfc_report_exception(mock_get_latest_report_ids: Mock) -> None:
     """Test get rfc report exception."""
@@ -235,3 +698,165 @@ def test_get_rfc_report_exception(mock_get_latest_report_ids: Mock) -> None:
     # Test with overflow report ID
     with pytest.raises(InvalidRfcIdError):
         get_rfc_report(9999)
+
+
+def test_get_rfc_reports(
+    mock_get_request: Mock, mock_get_latest_report_ids: Mock
+) -> None:
+    """Test fetching several rfc reports with a single index fetch."""
+    mock_get_latest_report_ids.return_value = [1, 2, 3]
+    mock_get_request.side_effect = lambda url: url.encode("utf-8")
+    get_rfc_report(1)
+    mock_get_latest_report_ids.reset_mock()
+    mock_get_request.reset_mock()
+
+    results = dict(get_rfc_reports([1, 2, 3, 4], max_workers=2))
+    mock_get_latest_report_ids.assert_called_once_with(None)
+    assert mock_get_request.call_count == 2
+    assert results[1] == "https://www.rfc-editor.org/rfc/rfc1.txt"
+    assert results[3] == "https://www.rfc-editor.org/rfc/rfc3.txt"
+    assert isinstance(results[4], InvalidRfcIdError)
+
+
+def test_get_rfc_reports_network_error(
+    mock_get_request: Mock, mock_get_latest_report_ids: Mock, tmp_path: Path
+) -> None:
+    """Test download failures are yielded per RFC."""
+    mock_get_latest_report_ids.return_value = [2]
+    mock_get_request.side_effect = NetworkError("timeout")
+    results = dict(get_rfc_reports([1, 2], cache=DiskCache(tmp_path)))
+    assert isinstance(results[1], NetworkError)
+    assert isinstance(results[2], NetworkError)
+
+
+def make_streaming_response(*chunks: bytes) -> Mock:
+    """Build a fake pooled response returning the body in chunks."""
+    res = make_pooled_response()
+    res.read.side_effect = [*chunks, b""]
+    return res
+
+
+def test_iter_rfc_report(
+    mock_pool: Mock, mock_get_latest_report_ids: Mock, tmp_path: Path
+) -> None:
+    """Test streaming an rfc report and caching it once complete."""
+    cache = DiskCache(tmp_path, max_size=1024)
+    mock_get_latest_report_ids.return_value = [2]
+    mock_pool.request.return_value = make_streaming_response(b"He", b"llo")
+
+    assert list(iter_rfc_report(1, chunk_size=2, cache=cache)) == [
+        b"He",
+        b"llo",
+    ]
+    mock_pool.request.return_value.read.assert_called_with(2)
+    assert cache.get("https://www.rfc-editor.org/rfc/rfc1.txt") == b"Hello"
+
+    # The second read is served from the cache in chunks
+    mock_pool.reset_mock()
+    mock_get_latest_report_ids.reset_mock()
+    assert list(iter_rfc_report(1, chunk_size=4, cache=cache)) == [
+        b"Hell",
+        b"o",
+    ]
+    mock_pool.request.assert_not_called()
+    mock_get_latest_report_ids.assert_not_called()
+
+
+def test_rfc_file_url() -> None:
+    """Test document URLs are built for every known format."""
+    assert rfc_file_url(8446) == "https://www.rfc-editor.org/rfc/rfc8446.txt"
+    assert rfc_file_url(8446, "xml").endswith("/rfc8446.xml")
+    with pytest.raises(ValueError, match="Unknown RFC format"):
+        rfc_file_url(8446, "docx")
+
+
+def test_iter_rfc_report_format(
+    mock_pool: Mock,
+    mock_get_latest_report_ids: Mock,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test other formats are streamed and cached apart from the text."""
+    mirror_dir = tmp_path / "mirror"
+    mirror_dir.mkdir()
+    (mirror_dir / "rfc1.txt").write_bytes(b"Text")
+    monkeypatch.setenv(MIRROR_DIR_ENV, str(mirror_dir))
+    cache = DiskCache(tmp_path / "cache", max_size=1024)
+    mock_get_latest_report_ids.return_value = [2]
+    pdf = b"%PDF\x00\xff"
+    mock_pool.request.return_value = make_streaming_response(pdf)
+
+    assert b"".join(iter_rfc_report(1, cache=cache, fmt="pdf")) == pdf
+    url = mock_pool.request.call_args.args[0]
+    assert url == "https://www.rfc-editor.org/rfc/rfc1.pdf"
+    assert cache.get(url) == pdf
+    assert b"".join(iter_rfc_report(1, cache=cache)) == b"Text"
+
+    results = dict(save_rfc_reports([1], str(tmp_path), cache=cache, fmt="pdf"))
+    assert (tmp_path / "rfc1.pdf").read_bytes() == pdf
+    assert results[1] == str(tmp_path / "rfc1.pdf")
+    mock_pool.request.assert_called_once()
+
+
+def test_iter_rfc_report_invalid(mock_get_latest_report_ids: Mock) -> None:
+    """Test streaming validates the rfc ID before returning."""
+    mock_get_latest_report_ids.return_value = [2]
+    with pytest.raises(InvalidRfcIdError):
+        iter_rfc_report(3)
+
+
+def test_iter_rfc_report_interrupted(
+    mock_pool: Mock, mock_get_latest_report_ids: Mock, tmp_path: Path
+) -> None:
+    """Test a download cut short is not cached."""
+    cache = DiskCache(tmp_path, max_size=1024)
+    mock_get_latest_report_ids.return_value = [2]
+    res = make_streaming_response(b"He")
+    res.read.side_effect = [b"He", http.client.IncompleteRead(b"")]
+    mock_pool.request.return_value = res
+
+    with pytest.raises(NetworkError):
+        list(iter_rfc_report(1, cache=cache))
+    assert cache.get("https://www.rfc-editor.org/rfc/rfc1.txt") is None
+
+
+def test_download_rfc_report(
+    mock_pool: Mock, mock_get_latest_report_ids: Mock
+) -> None:
+    """Test downloading an rfc report to a file object."""
+    mock_get_latest_report_ids.return_value = [2]
+    mock_pool.request.return_value = make_streaming_response(b"He", b"llo")
+    buffer = io.BytesIO()
+    assert download_rfc_report(1, buffer) == 5
+    assert buffer.getvalue() == b"Hello"
+
+
+def test_save_rfc_reports(
+    mock_pool: Mock, mock_get_latest_report_ids: Mock, tmp_path: Path
+) -> None:
+    """Test saving several rfc reports to a directory."""
+    mock_get_latest_report_ids.return_value = [2]
+    mock_pool.request.side_effect = lambda url, headers: (
+        make_streaming_response(url.encode("utf-8"))
+    )
+
+    results = dict(save_rfc_reports([1, 2, 3], str(tmp_path)))
+    assert results[1] == str(tmp_path / "rfc1.txt")
+    assert (tmp_path / "rfc2.txt").read_bytes() == (
+        b"https://www.rfc-editor.org/rfc/rfc2.txt"
+    )
+    assert isinstance(results[3], InvalidRfcIdError)
+
+
+def test_save_rfc_reports_failure(
+    mock_pool: Mock, mock_get_latest_report_ids: Mock, tmp_path: Path
+) -> None:
+    """Test failed downloads leave no partial files behind."""
+    mock_get_latest_report_ids.return_value = [2]
+    mock_pool.request.side_effect = ConnectionResetError("reset")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    results = dict(save_rfc_reports([1], str(output_dir)))
+    assert isinstance(results[1], NetworkError)
+    assert list(output_dir.iterdir()) == []
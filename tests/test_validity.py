@@ -0,0 +1,40 @@
+"""Tests for validity module."""
+
+import pytest
+
+from rfc_lookup.errors import InvalidRfcIdError
+from rfc_lookup.validity import ReportIdBitset, Validity
+
+
+def test_report_id_bitset_validity() -> None:
+    """Test numbers are told apart as issued, not issued or out of range."""
+    bitset = ReportIdBitset.from_ids([1, 3, 8], latest_id=9)
+
+    assert bitset.validity(1) is Validity.EXISTS
+    assert bitset.validity(8) is Validity.EXISTS
+    assert bitset.validity(2) is Validity.NOT_ISSUED
+    assert bitset.validity(9) is Validity.NOT_ISSUED
+    assert bitset.validity(0) is Validity.OUT_OF_RANGE
+    assert bitset.validity(-1) is Validity.OUT_OF_RANGE
+    assert bitset.validity(10) is Validity.OUT_OF_RANGE
+    assert 3 in bitset
+    assert 2 not in bitset
+    assert "3" not in bitset
+
+
+def test_report_id_bitset_latest_defaults_to_highest() -> None:
+    """Test the range ends at the highest issued number by default."""
+    bitset = ReportIdBitset.from_ids([5, 2])
+    assert bitset.latest_id == 5
+    assert ReportIdBitset.from_ids([]).validity(1) is Validity.OUT_OF_RANGE
+
+
+def test_report_id_bitset_check() -> None:
+    """Test check raises for numbers that cannot be retrieved."""
+    bitset = ReportIdBitset.from_ids([1, 3])
+    bitset.check(3)
+
+    with pytest.raises(InvalidRfcIdError, match="never issued"):
+        bitset.check(2)
+    with pytest.raises(InvalidRfcIdError, match="between 0 and 3"):
+        bitset.check(4)